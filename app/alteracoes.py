@@ -0,0 +1,50 @@
+from typing import Callable, List, Set
+from sqlalchemy import event
+from sqlalchemy.sql.dml import UpdateBase
+
+
+# ============================================================
+# RASTREAMENTO DE TABELAS ALTERADAS POR TRANSAÇÃO
+# ============================================================
+# Todo INSERT/UPDATE/DELETE (flush do ORM, operações em lote, associações)
+# passa por Connection.execute; as tabelas tocadas são acumuladas na conexão
+# e entregues aos ouvintes quando a conexão volta ao pool depois do COMMIT
+# (o evento "commit" da engine dispara antes do COMMIT chegar ao banco).
+_ouvintes: List[Callable[[Set[str]], None]] = []
+
+
+def ao_confirmar(callback: Callable[[Set[str]], None]):
+    """Registra uma função chamada com o conjunto de tabelas alteradas após cada commit"""
+    _ouvintes.append(callback)
+    return callback
+
+
+def _apos_execute(conn, clauseelement, multiparams, params, execution_options, result):
+    if isinstance(clauseelement, UpdateBase):
+        conn.info.setdefault("tabelas_alteradas", set()).add(clauseelement.table.name)
+
+
+def _no_commit(conn):
+    tabelas = conn.info.pop("tabelas_alteradas", None)
+    if tabelas:
+        conn.info.setdefault("tabelas_confirmadas", set()).update(tabelas)
+
+
+def _no_rollback(conn):
+    conn.info.pop("tabelas_alteradas", None)
+
+
+def _no_checkin(dbapi_connection, connection_record):
+    tabelas = connection_record.info.pop("tabelas_confirmadas", None)
+    if not tabelas:
+        return
+    for callback in _ouvintes:
+        callback(tabelas)
+
+
+def rastrear_alteracoes(engine):
+    """Liga o rastreamento em uma engine (para AsyncEngine, passe engine.sync_engine)"""
+    event.listen(engine, "after_execute", _apos_execute)
+    event.listen(engine, "commit", _no_commit)
+    event.listen(engine, "rollback", _no_rollback)
+    event.listen(engine, "checkin", _no_checkin)
@@ -0,0 +1,180 @@
+from typing import Iterable, List
+from fastapi import APIRouter, HTTPException, Depends, Body
+from sqlalchemy import delete, exists, insert, select
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.models import (
+    PersonagensModel,
+    MagiasModel,
+    HabilidadesModel,
+    EquipamentosModel,
+    personagem_magias,
+    personagem_habilidades,
+    personagem_equipamentos,
+)
+from app.schemas import AssociacaoDiffSchema
+from app.serializacao import resposta_json
+
+
+# ============================================================
+# TABELAS DE ASSOCIAÇÃO DO PERSONAGEM
+# ============================================================
+class Associacao:
+    """Descreve uma coleção N:N do personagem (tabela, coluna do item e modelo do item)"""
+
+    def __init__(self, recurso: str, tabela, coluna_item: str, model, rotulo: str, feminino: bool):
+        self.recurso = recurso
+        self.tabela = tabela
+        self.coluna_personagem = tabela.c.Personagem_id
+        self.coluna_item = tabela.c[coluna_item]
+        self.model = model
+        # Tabelas lidas por GET /personagens/{id}/{recurso} (dependências do cache)
+        self.tabelas_leitura = frozenset({PersonagensModel.__tablename__, tabela.name, model.__tablename__})
+        self.rotulo = rotulo
+        self.artigo, self.este, self.nao_encontrado = (
+            ("a", "esta", "encontrada") if feminino else ("o", "este", "encontrado")
+        )
+
+
+ASSOCIACOES = {
+    "magias": Associacao("magias", personagem_magias, "Magia_id", MagiasModel, "Magia", feminino=True),
+    "habilidades": Associacao("habilidades", personagem_habilidades, "Habilidade_id", HabilidadesModel, "Habilidade", feminino=True),
+    "equipamentos": Associacao("equipamentos", personagem_equipamentos, "Equipamento_id", EquipamentosModel, "Equipamento", feminino=False),
+}
+
+
+# ============================================================
+# CONSULTAS (servem para Session e AsyncSession)
+# ============================================================
+def stmt_personagem_existe(personagem_id: int):
+    return select(exists().where(PersonagensModel.Id == personagem_id))
+
+
+def stmt_item_existe(assoc: Associacao, item_id: int):
+    return select(exists().where(assoc.model.Id == item_id))
+
+
+def stmt_possui(assoc: Associacao, personagem_id: int, item_id: int):
+    """EXISTS pela chave primária (Personagem_id, Item_id) da associação: usa o índice do PK"""
+    return select(exists().where(
+        assoc.coluna_personagem == personagem_id,
+        assoc.coluna_item == item_id,
+    ))
+
+
+def stmt_ids_existentes(assoc: Associacao, ids: Iterable[int]):
+    """Uma única query IN para validar vários Ids de itens"""
+    return select(assoc.model.Id).where(assoc.model.Id.in_(list(ids)))
+
+
+def stmt_inserir(assoc: Associacao, dialeto: str, personagem_id: int, ids: Iterable[int]):
+    """INSERT ... ON CONFLICT DO NOTHING com todas as linhas da associação"""
+    linhas = [
+        {assoc.coluna_personagem.name: personagem_id, assoc.coluna_item.name: item_id}
+        for item_id in ids
+    ]
+    if dialeto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as insert_dialeto
+    elif dialeto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as insert_dialeto
+    else:
+        # Sem ON CONFLICT: o chamador deve enviar apenas Ids ainda não associados
+        return insert(assoc.tabela).values(linhas)
+    return insert_dialeto(assoc.tabela).values(linhas).on_conflict_do_nothing()
+
+
+def stmt_remover(assoc: Associacao, personagem_id: int, ids: Iterable[int]):
+    return delete(assoc.tabela).where(
+        assoc.coluna_personagem == personagem_id,
+        assoc.coluna_item.in_(list(ids)),
+    )
+
+
+def stmt_manter_apenas(assoc: Associacao, personagem_id: int, ids: Iterable[int]):
+    """Remove as associações do personagem que não estão em ids"""
+    return delete(assoc.tabela).where(
+        assoc.coluna_personagem == personagem_id,
+        assoc.coluna_item.not_in(list(ids)),
+    )
+
+
+def stmt_itens_personagem(assoc: Associacao, personagem_id: int):
+    return (
+        select(assoc.model)
+        .join(assoc.tabela, assoc.coluna_item == assoc.model.Id)
+        .where(assoc.coluna_personagem == personagem_id)
+        .order_by(assoc.model.Id)
+    )
+
+
+def ids_faltando(ids: List[int], existentes) -> List[int]:
+    existentes = set(existentes)
+    return sorted({i for i in ids if i not in existentes})
+
+
+# ============================================================
+# OPERAÇÕES SÍNCRONAS
+# ============================================================
+def adicionar_varios(db: Session, assoc: Associacao, personagem_id: int, ids: List[int]):
+    """Associa vários itens com um único INSERT (duplicados são ignorados)"""
+    if not ids:
+        return
+    dialeto = db.get_bind().dialect.name
+    if dialeto not in ("sqlite", "postgresql"):
+        ja_possui = set(db.scalars(
+            select(assoc.coluna_item).where(
+                assoc.coluna_personagem == personagem_id,
+                assoc.coluna_item.in_(ids),
+            )
+        ))
+        ids = [i for i in ids if i not in ja_possui]
+        if not ids:
+            return
+    db.execute(stmt_inserir(assoc, dialeto, personagem_id, dict.fromkeys(ids)))
+
+
+def _garantir_personagem(db: Session, personagem_id: int):
+    if not db.scalar(stmt_personagem_existe(personagem_id)):
+        raise HTTPException(status_code=404, detail="Personagem não encontrado")
+
+
+def _validar_ids(db: Session, assoc: Associacao, ids: List[int]):
+    faltando = ids_faltando(ids, db.scalars(stmt_ids_existentes(assoc, ids)) if ids else [])
+    if faltando:
+        raise HTTPException(
+            status_code=404,
+            detail=f"{assoc.recurso.capitalize()} não {assoc.nao_encontrado}s: {faltando}",
+        )
+
+
+# ============================================================
+# ROTAS BASEADAS EM CONJUNTO (PUT / PATCH)
+# ============================================================
+def registrar_rotas_conjunto(router: APIRouter, assoc: Associacao, schema):
+    """PUT substitui a coleção inteira; PATCH aplica adicionar/remover.
+
+    Os Ids são validados com uma única query IN e gravados com um único
+    INSERT ... ON CONFLICT DO NOTHING, sem carregar a coleção do personagem.
+    """
+    caminho = f"/personagens/{{personagem_id}}/{assoc.recurso}"
+
+    @router.put(caminho, response_model=List[schema], name=f"definir_{assoc.recurso}_personagem")
+    def definir(personagem_id: int, ids: List[int] = Body(...), db: Session = Depends(get_db)):
+        _garantir_personagem(db, personagem_id)
+        ids = list(dict.fromkeys(ids))
+        _validar_ids(db, assoc, ids)
+        db.execute(stmt_manter_apenas(assoc, personagem_id, ids))
+        adicionar_varios(db, assoc, personagem_id, ids)
+        db.commit()
+        return resposta_json(schema, db.scalars(stmt_itens_personagem(assoc, personagem_id)).all())
+
+    @router.patch(caminho, response_model=List[schema], name=f"alterar_{assoc.recurso}_personagem")
+    def alterar(personagem_id: int, diff: AssociacaoDiffSchema = Body(...), db: Session = Depends(get_db)):
+        _garantir_personagem(db, personagem_id)
+        adicionar = list(dict.fromkeys(diff.adicionar))
+        _validar_ids(db, assoc, adicionar)
+        if diff.remover:
+            db.execute(stmt_remover(assoc, personagem_id, diff.remover))
+        adicionar_varios(db, assoc, personagem_id, adicionar)
+        db.commit()
+        return resposta_json(schema, db.scalars(stmt_itens_personagem(assoc, personagem_id)).all())
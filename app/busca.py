@@ -0,0 +1,143 @@
+import re
+from typing import List
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+
+# ============================================================
+# ÍNDICE DE BUSCA TEXTUAL (SQLITE FTS5)
+# ============================================================
+# Colunas indexadas, na ordem de peso usada no ranking bm25
+COLUNAS_BUSCA = ("Nome", "Descricao", "Historia", "Efeito", "Passiva")
+PESO_NOME = 10.0
+PESO_TEXTO = 1.0
+
+# Tabelas que já têm índice FTS criado neste processo
+_tabelas_indexadas = set()
+
+
+def _colunas(model) -> List[str]:
+    return [c for c in COLUNAS_BUSCA if c in model.__table__.c]
+
+
+def _nome_fts(model) -> str:
+    return f"{model.__tablename__}_fts"
+
+
+def criar_indices_busca(engine, models):
+    """Cria (se não existirem) as tabelas FTS5 e os triggers de sincronização.
+
+    O índice usa a própria tabela como conteúdo externo (content=...), então
+    só guarda os tokens. Em bancos que não são SQLite não faz nada e a busca
+    cai no ILIKE.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    with engine.begin() as conn:
+        for model in models:
+            tabela = model.__tablename__
+            fts = _nome_fts(model)
+            colunas = _colunas(model)
+            lista = ", ".join(f'"{c}"' for c in colunas)
+            novos = ", ".join(f'new."{c}"' for c in colunas)
+            antigos = ", ".join(f'old."{c}"' for c in colunas)
+
+            existe = conn.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+            ).first()
+
+            conn.exec_driver_sql(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS "{fts}" USING fts5('
+                f"{lista}, content='{tabela}', content_rowid='Id', "
+                f"tokenize='unicode61 remove_diacritics 2')"
+            )
+            conn.exec_driver_sql(
+                f'CREATE TRIGGER IF NOT EXISTS "{fts}_ai" AFTER INSERT ON "{tabela}" BEGIN '
+                f'INSERT INTO "{fts}"(rowid, {lista}) VALUES (new."Id", {novos}); END'
+            )
+            conn.exec_driver_sql(
+                f'CREATE TRIGGER IF NOT EXISTS "{fts}_ad" AFTER DELETE ON "{tabela}" BEGIN '
+                f'INSERT INTO "{fts}"("{fts}", rowid, {lista}) VALUES (\'delete\', old."Id", {antigos}); END'
+            )
+            conn.exec_driver_sql(
+                f'CREATE TRIGGER IF NOT EXISTS "{fts}_au" AFTER UPDATE ON "{tabela}" BEGIN '
+                f'INSERT INTO "{fts}"("{fts}", rowid, {lista}) VALUES (\'delete\', old."Id", {antigos}); '
+                f'INSERT INTO "{fts}"(rowid, {lista}) VALUES (new."Id", {novos}); END'
+            )
+            # Tabela FTS recém-criada: indexa as linhas que já existiam
+            if not existe:
+                conn.exec_driver_sql(f'INSERT INTO "{fts}"("{fts}") VALUES (\'rebuild\')')
+
+            _tabelas_indexadas.add(tabela)
+
+
+def detectar_indices_busca(engine, models):
+    """Marca as tabelas cujo índice FTS já existe (criado por preparar_banco), sem DDL"""
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.connect() as conn:
+        existentes = set(conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'table'").scalars())
+    _tabelas_indexadas.update(m.__tablename__ for m in models if _nome_fts(m) in existentes)
+
+
+def _consulta_fts(termo: str) -> str:
+    """Converte o texto digitado em uma consulta FTS5 de prefixos (AND implícito)"""
+    tokens = re.findall(r"\w+", termo)
+    return " ".join(f'"{t}"*' for t in tokens)
+
+
+def _consulta_ids(model, termo: str, limit: int):
+    """Monta o SELECT rowid ... MATCH ordenado por bm25 (ou None se o termo não tem palavras)"""
+    consulta = _consulta_fts(termo)
+    if not consulta:
+        return None
+    fts = _nome_fts(model)
+    pesos = ", ".join(str(PESO_NOME if c == "Nome" else PESO_TEXTO) for c in _colunas(model))
+    return text(
+        f'SELECT rowid FROM "{fts}" WHERE "{fts}" MATCH :consulta '
+        f'ORDER BY bm25("{fts}", {pesos}) LIMIT :limit'
+    ).bindparams(consulta=consulta, limit=limit)
+
+
+def _filtro_fallback(model, termo: str):
+    return model.Nome.ilike(f"%{termo}%")
+
+
+def _ordenar(itens, ids) -> list:
+    por_id = {item.Id: item for item in itens}
+    return [por_id[i] for i in ids if i in por_id]
+
+
+def buscar(db: Session, model, termo: str, limit: int, opcoes=()) -> list:
+    """Busca por texto, ordenando pela relevância (bm25) quando há índice FTS"""
+    query = db.query(model).options(*opcoes)
+
+    if model.__tablename__ not in _tabelas_indexadas:
+        # Fallback para bancos sem FTS5
+        return query.filter(_filtro_fallback(model, termo)).order_by(model.Id).limit(limit).all()
+
+    consulta = _consulta_ids(model, termo, limit)
+    if consulta is None:
+        return []
+    ids = db.execute(consulta).scalars().all()
+    if not ids:
+        return []
+    return _ordenar(query.filter(model.Id.in_(ids)).all(), ids)
+
+
+async def buscar_async(db, model, termo: str, limit: int, opcoes=()) -> list:
+    """Versão de buscar para AsyncSession"""
+    stmt = select(model).options(*opcoes)
+
+    if model.__tablename__ not in _tabelas_indexadas:
+        stmt = stmt.where(_filtro_fallback(model, termo)).order_by(model.Id).limit(limit)
+        return (await db.scalars(stmt)).all()
+
+    consulta = _consulta_ids(model, termo, limit)
+    if consulta is None:
+        return []
+    ids = (await db.execute(consulta)).scalars().all()
+    if not ids:
+        return []
+    return _ordenar((await db.scalars(stmt.where(model.Id.in_(ids)))).all(), ids)
@@ -0,0 +1,187 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Optional, Tuple
+from fastapi import Request, Response
+from app.alteracoes import ao_confirmar
+from app.compressao import cabecalhos_comprimidos, codificacao_aceita, comprimir
+from app.config import settings
+from app.versoes import nao_modificado
+
+
+# ============================================================
+# CACHE LRU DE RESPOSTAS JÁ SERIALIZADAS
+# ============================================================
+class _Entrada:
+    __slots__ = ("corpo", "cabecalhos", "tabelas", "versao", "expira_em", "comprimidos")
+
+    def __init__(
+        self, corpo: bytes, cabecalhos: Dict[str, str], tabelas: FrozenSet[str], versao: Optional[str], expira_em: float,
+    ):
+        self.corpo = corpo
+        self.cabecalhos = cabecalhos
+        self.tabelas = tabelas
+        # ETag das tabelas com que a entrada foi gerada (no detalhe, difere do ETag do item)
+        self.versao = versao
+        self.expira_em = expira_em
+        # Codificação -> corpo comprimido, gerado na primeira requisição que pede aquela codificação
+        self.comprimidos: Dict[str, bytes] = {}
+
+    def tamanho(self) -> int:
+        return len(self.corpo) + sum(len(corpo) for corpo in self.comprimidos.values())
+
+
+class CacheRespostas:
+    """Guarda os bytes JSON por (rota, query string), com limite de tamanho e TTL.
+
+    Cada entrada lembra as tabelas lidas para gerá-la; um commit que altera
+    qualquer uma delas remove a entrada. O cache é por processo: entre
+    workers diferentes o TTL limita quanto tempo uma resposta pode ficar velha.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._itens: "OrderedDict[Tuple[str, str], _Entrada]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidacoes = 0
+
+    def _remover(self, chave):
+        entrada = self._itens.pop(chave)
+        self._bytes -= entrada.tamanho()
+
+    def _reduzir(self):
+        # Remove as menos usadas até caber no limite
+        while self._bytes > self.max_bytes:
+            self._remover(next(iter(self._itens)))
+            self.evictions += 1
+
+    def obter(self, chave, etag: Optional[str] = None) -> Optional[_Entrada]:
+        with self._lock:
+            entrada = self._itens.get(chave)
+            if entrada is None or entrada.expira_em < time.monotonic() or (
+                etag is not None and entrada.versao != etag
+            ):
+                if entrada is not None:
+                    self._remover(chave)
+                self.misses += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.hits += 1
+            return entrada
+
+    def guardar(
+        self, chave, corpo: bytes, cabecalhos: Dict[str, str], tabelas: FrozenSet[str], versao: Optional[str] = None,
+    ) -> Optional[_Entrada]:
+        if len(corpo) > self.max_bytes:
+            return None
+        versao = versao or cabecalhos.get("ETag")
+        entrada = _Entrada(corpo, cabecalhos, tabelas, versao, time.monotonic() + self.ttl)
+        with self._lock:
+            if chave in self._itens:
+                self._remover(chave)
+            self._itens[chave] = entrada
+            self._bytes += len(corpo)
+            self._reduzir()
+        return entrada
+
+    def comprimido(self, chave, entrada: _Entrada, codificacao: str) -> bytes:
+        """Corpo da entrada na codificação pedida, comprimido uma vez (no nível do cache) e guardado junto"""
+        corpo = entrada.comprimidos.get(codificacao)
+        if corpo is not None:
+            return corpo
+        corpo = comprimir(entrada.corpo, codificacao, cache=True)
+        with self._lock:
+            # A entrada pode ter sido invalidada enquanto comprimia
+            if codificacao not in entrada.comprimidos and self._itens.get(chave) is entrada:
+                entrada.comprimidos[codificacao] = corpo
+                self._bytes += len(corpo)
+                self._reduzir()
+        return corpo
+
+    def invalidar(self, tabelas):
+        """Remove as entradas que dependem de alguma das tabelas alteradas"""
+        with self._lock:
+            afetadas = [chave for chave, entrada in self._itens.items() if not entrada.tabelas.isdisjoint(tabelas)]
+            for chave in afetadas:
+                self._remover(chave)
+            self.invalidacoes += len(afetadas)
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self._bytes = 0
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "habilitado": settings.cache_habilitado,
+                "itens": len(self._itens),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "taxa_acerto": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "invalidacoes": self.invalidacoes,
+            }
+
+
+cache_respostas = CacheRespostas(settings.cache_max_bytes, settings.cache_ttl)
+ao_confirmar(cache_respostas.invalidar)
+
+
+# ============================================================
+# FUNÇÕES USADAS PELAS ROTAS
+# ============================================================
+def chave_cache(request: Request) -> Tuple[str, str]:
+    """Rota + query string normalizada (ordem dos parâmetros não importa)"""
+    return request.url.path, "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+
+
+def resposta_em_cache(request: Request, etag: Optional[str] = None) -> Optional[Response]:
+    """Retorna a resposta guardada para esta requisição, se houver.
+
+    Com etag, só aproveita a entrada gerada para as mesmas versões das
+    tabelas (cobre commits feitos por outros workers antes do TTL expirar).
+    """
+    if not settings.cache_habilitado:
+        return None
+    chave = chave_cache(request)
+    entrada = cache_respostas.obter(chave, etag)
+    if entrada is None:
+        return None
+    if "ETag" in entrada.cabecalhos and (resposta := nao_modificado(request, entrada.cabecalhos["ETag"])):
+        return resposta
+    return _resposta(request, chave, entrada, "HIT")
+
+
+def _resposta(request: Request, chave, entrada: _Entrada, situacao: str) -> Response:
+    # Já comprimida aqui: o middleware de compressão deixa passar respostas com Content-Encoding
+    corpo, cabecalhos = entrada.corpo, {**entrada.cabecalhos, "X-Cache": situacao}
+    if codificacao := codificacao_aceita(request.headers, len(corpo)):
+        corpo = cache_respostas.comprimido(chave, entrada, codificacao)
+        cabecalhos.update(cabecalhos_comprimidos(codificacao, cabecalhos.get("ETag")))
+    return Response(content=corpo, media_type="application/json", headers=cabecalhos)
+
+
+def guardar_resposta(
+    request: Request, corpo: bytes, tabelas: FrozenSet[str], cabecalhos: Optional[Dict[str, str]] = None,
+    versao: Optional[str] = None,
+) -> Response:
+    """Guarda os bytes no cache e devolve a Response correspondente.
+
+    versao é o ETag das tabelas que valida a entrada; sem ele vale o ETag dos cabeçalhos.
+    """
+    cabecalhos = cabecalhos or {}
+    if settings.cache_habilitado:
+        chave = chave_cache(request)
+        if entrada := cache_respostas.guardar(chave, corpo, cabecalhos, tabelas, versao):
+            return _resposta(request, chave, entrada, "MISS")
+    return Response(content=corpo, media_type="application/json", headers={**cabecalhos, "X-Cache": "MISS"})
@@ -0,0 +1,75 @@
+from functools import lru_cache
+from typing import Optional, Union, get_args, get_origin
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import selectinload, joinedload
+
+
+# ============================================================
+# PLANEJADOR DE EAGER LOADING A PARTIR DO SCHEMA DE RESPOSTA
+# ============================================================
+def _schema_aninhado(anotacao) -> Optional[type]:
+    """Extrai o schema Pydantic de anotações como Optional[List[Schema]]"""
+    if isinstance(anotacao, type) and issubclass(anotacao, BaseModel):
+        return anotacao
+    if get_origin(anotacao) in (Union, list, tuple, set):
+        for arg in get_args(anotacao):
+            encontrado = _schema_aninhado(arg)
+            if encontrado is not None:
+                return encontrado
+    return None
+
+
+def _opcoes(model, schema, caminho=None) -> list:
+    opcoes = []
+    relacoes = inspect(model).relationships
+    for nome, campo in schema.model_fields.items():
+        if nome not in relacoes:
+            continue
+        relacao = relacoes[nome]
+        atributo = getattr(model, nome)
+        # Coleções usam SELECT ... IN (uma query por relação);
+        # many-to-one entra no mesmo SELECT via LEFT OUTER JOIN
+        if relacao.uselist:
+            opcao = selectinload(atributo) if caminho is None else caminho.selectinload(atributo)
+        else:
+            opcao = joinedload(atributo) if caminho is None else caminho.joinedload(atributo)
+        opcoes.append(opcao)
+
+        sub_schema = _schema_aninhado(campo.annotation)
+        if sub_schema is not None:
+            opcoes.extend(_opcoes(relacao.mapper.class_, sub_schema, opcao))
+    return opcoes
+
+
+@lru_cache(maxsize=None)
+def opcoes_carregamento(model, schema) -> tuple:
+    """Opções de loader que carregam tudo que o schema serializa.
+
+    Assim a serialização não dispara lazy loads e cada endpoint executa
+    um número fixo de queries, independente da quantidade de linhas.
+    """
+    return tuple(_opcoes(model, schema))
+
+
+def _tabelas(model, schema) -> set:
+    tabelas = {model.__tablename__}
+    relacoes = inspect(model).relationships
+    for nome, campo in schema.model_fields.items():
+        if nome not in relacoes:
+            continue
+        relacao = relacoes[nome]
+        if relacao.secondary is not None:
+            tabelas.add(relacao.secondary.name)
+        sub_schema = _schema_aninhado(campo.annotation)
+        if sub_schema is not None:
+            tabelas |= _tabelas(relacao.mapper.class_, sub_schema)
+        else:
+            tabelas.add(relacao.mapper.class_.__tablename__)
+    return tabelas
+
+
+@lru_cache(maxsize=None)
+def tabelas_dependentes(model, schema) -> frozenset:
+    """Nomes de todas as tabelas lidas para montar a resposta do schema"""
+    return frozenset(_tabelas(model, schema))
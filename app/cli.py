@@ -0,0 +1,149 @@
+"""Comandos de manutenção do banco, executados uma vez fora do servidor.
+
+Uso (na raiz do projeto):
+    python -m app.cli init-db          # migrações, índices de busca e contadores de versão
+    python -m app.cli init-db --seed   # o mesmo + dados iniciais
+    python -m app.cli seed             # só os dados iniciais (banco já preparado)
+    python -m app.cli export personagens --formato csv --saida personagens.csv
+    python -m app.cli export todos --formato parquet --saida campanha/
+    python -m app.cli import todos campanha/ --modo novos
+    python -m app.cli import personagens novos.csv --modo novos --referencias-existentes racas,classes
+    python -m app.cli fichas reconstruir [--todas]   # monta as fichas pendentes (ou todas)
+    python -m app.cli fichas conferir [--corrigir]  # compara as fichas gravadas com as tabelas
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from app.database import SessionLocal
+from app.inicializacao import popular_dados, preparar_banco
+
+
+def _seed():
+    with SessionLocal() as db:
+        if popular_dados(db):
+            print("✅ Dados iniciais inseridos")
+        else:
+            print("ℹ️ Banco já tem dados; seed ignorado")
+
+
+def _exportar(recurso: str, formato: str, saida: str):
+    from app.transferencia import TABELAS, exportar
+
+    recursos = list(TABELAS) if recurso == "todos" else [recurso]
+    destino = Path(saida)
+    if recurso == "todos":
+        destino.mkdir(parents=True, exist_ok=True)
+    for atual in recursos:
+        caminho = destino / f"{atual}.{formato}" if recurso == "todos" else destino
+        inicio = time.perf_counter()
+        with open(caminho, "wb") as arquivo:
+            for pedaco in exportar(atual, formato):
+                arquivo.write(pedaco)
+        print(f"✅ {atual} -> {caminho} ({caminho.stat().st_size / 1e6:.1f} MB, {time.perf_counter() - inicio:.1f}s)")
+
+
+def _importar(recurso: str, origem: str, formato: str, modo: str, referencias_existentes: str) -> int:
+    from app.transferencia import TABELAS, Importador, formato_do_nome
+
+    if recurso == "todos":
+        # Em ordem de dependência, com o mesmo Importador (mapa de Ids compartilhado)
+        arquivos = [
+            (atual, caminho)
+            for atual in TABELAS
+            for caminho in sorted(Path(origem).glob(f"{atual}.*"))[:1]
+        ]
+    else:
+        arquivos = [(recurso, Path(origem))]
+    importador = Importador(
+        modo=modo,
+        referencias_existentes=[nome.strip() for nome in (referencias_existentes or "").split(",") if nome.strip()],
+    )
+    erros = 0
+    for atual, caminho in arquivos:
+        inicio = time.perf_counter()
+        with open(caminho, "rb") as arquivo:
+            resumo = importador.importar_arquivo(atual, arquivo, formato or formato_do_nome(caminho.name) or "ndjson")
+        duracao = time.perf_counter() - inicio
+        print(
+            f"{'✅' if not resumo['total_erros'] else '⚠️'} {atual}: {resumo['gravadas']}/{resumo['linhas']} linhas "
+            f"({duracao:.1f}s, {resumo['gravadas'] / max(duracao, 1e-9):,.0f} linhas/s)"
+        )
+        for erro in resumo["erros"][:10]:
+            print(f"   linha {erro['linha']}: {erro['detail']}")
+        erros += resumo["total_erros"]
+    return 1 if erros else 0
+
+
+def _fichas(acao: str, todas: bool, corrigir: bool) -> int:
+    from app.fichas import conferir_fichas, reconstruir_fichas
+    from app.main import FichaSchema
+
+    inicio = time.perf_counter()
+    if acao == "reconstruir":
+        gravadas = reconstruir_fichas(FichaSchema, todas=todas)
+        print(f"✅ {gravadas} fichas gravadas ({time.perf_counter() - inicio:.1f}s)")
+        return 0
+    resultado = conferir_fichas(FichaSchema, corrigir=corrigir)
+    print(
+        f"{resultado['verificadas']} fichas conferidas, {resultado['pendentes']} pendentes "
+        f"({time.perf_counter() - inicio:.1f}s)"
+    )
+    problemas = 0
+    for chave, descricao in (
+        ("divergentes", "diferentes das tabelas"),
+        ("sem_ficha", "personagens sem linha em Fichas"),
+        ("orfas", "fichas de personagens inexistentes"),
+    ):
+        if resultado[chave]:
+            problemas += len(resultado[chave])
+            print(f"❌ {len(resultado[chave])} {descricao}: {resultado[chave][:20]}")
+    if problemas and corrigir:
+        print("🔧 Corrigido: divergentes invalidadas (remontadas na próxima leitura), linhas criadas/removidas")
+    elif not problemas:
+        print("✅ Fichas consistentes")
+    return 1 if problemas and not corrigir else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Manutenção do banco da RPG API")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    init_db = comandos.add_parser("init-db", help="Aplica migrações e cria índices de busca e contadores de versão")
+    init_db.add_argument("--seed", action="store_true", help="Também insere os dados iniciais")
+    comandos.add_parser("seed", help="Insere os dados iniciais se o banco estiver vazio")
+    exportacao = comandos.add_parser("export", help="Exporta um recurso (ou todos) em NDJSON, CSV ou Parquet")
+    exportacao.add_argument("recurso", help="Ex.: personagens, personagem_magias ou todos")
+    exportacao.add_argument("--formato", choices=("ndjson", "csv", "parquet"), default="ndjson")
+    exportacao.add_argument("--saida", required=True, help="Arquivo (ou pasta, com todos)")
+    importacao = comandos.add_parser("import", help="Importa um arquivo (ou uma pasta exportada com todos)")
+    importacao.add_argument("recurso", help="Ex.: personagens, personagem_magias ou todos")
+    importacao.add_argument("origem", help="Arquivo (ou pasta, com todos)")
+    importacao.add_argument("--formato", choices=("ndjson", "csv", "parquet"), help="Padrão: pela extensão")
+    importacao.add_argument("--modo", choices=("manter", "novos"), default="manter")
+    importacao.add_argument(
+        "--referencias-existentes", help="modo novos: recursos cujas FKs já trazem Ids do banco, ex.: racas,classes",
+    )
+    fichas = comandos.add_parser("fichas", help="Fichas materializadas de /personagens/{id}/sheet")
+    fichas.add_argument("acao", choices=("reconstruir", "conferir"))
+    fichas.add_argument("--todas", action="store_true", help="reconstruir: remonta todas, não só as pendentes")
+    fichas.add_argument("--corrigir", action="store_true", help="conferir: invalida as divergentes e acerta as linhas")
+    args = parser.parse_args(argv)
+
+    if args.comando == "init-db":
+        preparar_banco()
+        print("✅ Banco atualizado")
+        if args.seed:
+            _seed()
+    elif args.comando == "seed":
+        _seed()
+    elif args.comando == "export":
+        _exportar(args.recurso, args.formato, args.saida)
+    elif args.comando == "import":
+        return _importar(args.recurso, args.origem, args.formato, args.modo, args.referencias_existentes)
+    elif args.comando == "fichas":
+        return _fichas(args.acao, args.todas, args.corrigir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, Sequence, Tuple
+import numpy as np
+from sqlalchemy import select, union
+from app.fichas import fichas, usa_fichas
+from app.models import (
+    PersonagensModel,
+    EquipamentosModel,
+    HabilidadesModel,
+    MagiasModel,
+    personagem_equipamentos,
+    personagem_habilidades,
+    personagem_magias,
+)
+
+
+# ============================================================
+# STATUS DERIVADOS DE COMBATE
+# ============================================================
+# Regras (um personagem ou milhares de uma vez passam pelo mesmo cálculo em lote):
+# - modificador(x) = (x - 10) // 2
+# - "equipamentos" = o item principal (Equipamento_id) + a coleção, sem contar
+#   duas vezes o mesmo item
+# - ca = CA + soma de Defesa dos equipamentos
+# - ataque = modificador(Forca) + soma de Ataque + soma de Bonus dos equipamentos
+# - iniciativa = modificador(Destreza)
+# - vida_maxima = Vida + modificador(Constituicao) * Level (mínimo 1)
+# - carga = soma de Peso; carga_maxima = Forca * 15
+# - dano de cada habilidade = Dano * escala, com
+#   escala = 1 + 0.05 * (max(Forca, Inteligencia) - 10), nunca abaixo de 0.5
+# - magias_lancaveis = magias com CustoMana <= Mana
+TABELAS_DERIVADOS = frozenset({
+    PersonagensModel.__tablename__,
+    personagem_equipamentos.name,
+    EquipamentosModel.__tablename__,
+    personagem_habilidades.name,
+    HabilidadesModel.__tablename__,
+    personagem_magias.name,
+    MagiasModel.__tablename__,
+})
+
+# Valores usados quando a coluna está NULL (os defaults dos models)
+ATRIBUTOS = (
+    ("Level", 1), ("Vida", 100), ("Forca", 10), ("Destreza", 10),
+    ("Constituicao", 10), ("Inteligencia", 10), ("Mana", 100), ("CA", 10),
+)
+CARGA_POR_FORCA = 15
+ESCALA_POR_PONTO = 0.05
+ESCALA_MINIMA = 0.5
+
+
+def _modificador(valores: np.ndarray) -> np.ndarray:
+    return np.floor_divide(valores - 10, 2)
+
+
+def _inteiros(valores: Iterable, quantidade: int, padrao: int = 0) -> np.ndarray:
+    return np.fromiter((padrao if v is None else v for v in valores), dtype=np.int64, count=quantidade)
+
+
+def _somar(donos: np.ndarray, pesos: np.ndarray, n: int) -> np.ndarray:
+    return np.bincount(donos, weights=pesos, minlength=n).astype(np.int64)
+
+
+def _calcular(ids: Sequence[int], base: Dict[str, np.ndarray], equipamentos, habilidades, magias) -> List[dict]:
+    """Núcleo vetorizado.
+
+    `base` tem um array por atributo (posição i = ids[i]); equipamentos,
+    habilidades e magias são listas de linhas (posição do dono, colunas...).
+    """
+    n = len(ids)
+
+    e_donos = _inteiros((linha[0] for linha in equipamentos), len(equipamentos))
+    defesa, ataque, bonus, peso = (
+        _somar(e_donos, _inteiros((linha[i] for linha in equipamentos), len(equipamentos)), n)
+        for i in range(1, 5)
+    )
+
+    forca = base["Forca"]
+    ca = base["CA"] + defesa
+    ataque_total = _modificador(forca) + ataque + bonus
+    iniciativa = _modificador(base["Destreza"])
+    vida_maxima = np.maximum(base["Vida"] + _modificador(base["Constituicao"]) * base["Level"], 1)
+    carga_maxima = forca * CARGA_POR_FORCA
+
+    escala = np.maximum(1 + ESCALA_POR_PONTO * (np.maximum(forca, base["Inteligencia"]) - 10), ESCALA_MINIMA)
+    h_donos = _inteiros((linha[0] for linha in habilidades), len(habilidades))
+    h_dano = np.rint(_inteiros((linha[3] for linha in habilidades), len(habilidades)) * escala[h_donos]).astype(np.int64)
+    dano_total = _somar(h_donos, h_dano, n)
+
+    m_donos = _inteiros((linha[0] for linha in magias), len(magias))
+    m_custo = _inteiros((linha[1] for linha in magias), len(magias))
+    custo_mana = _somar(m_donos, m_custo, n)
+    lancaveis = _somar(m_donos, (m_custo <= base["Mana"][m_donos]).astype(np.int64), n)
+
+    danos: List[list] = [[] for _ in range(n)]
+    for (dono, hab_id, nome, _), dano in zip(habilidades, h_dano.tolist()):
+        danos[dono].append({"Id": hab_id, "Nome": nome, "dano": dano})
+
+    colunas = {
+        "ca": ca, "ataque": ataque_total, "iniciativa": iniciativa, "vida_maxima": vida_maxima,
+        "carga": peso, "carga_maxima": carga_maxima, "dano_habilidades_total": dano_total,
+        "custo_mana_total": custo_mana, "magias_lancaveis": lancaveis,
+    }
+    listas = {nome: valores.tolist() for nome, valores in colunas.items()}
+    return [
+        {
+            "Id": personagem_id,
+            **{nome: valores[i] for nome, valores in listas.items()},
+            "sobrecarregado": listas["carga"][i] > listas["carga_maxima"][i],
+            "habilidades": danos[i],
+        }
+        for i, personagem_id in enumerate(ids)
+    ]
+
+
+# ============================================================
+# CÁLCULO EM LOTE (CONSULTAS CORE + NUMPY)
+# ============================================================
+# Quatro SELECTs de colunas para o lote inteiro (sem montar objetos ORM);
+# as somas por personagem saem de np.bincount sobre a posição do dono.
+def calcular_lote(db, ids: Sequence[int]) -> Dict[int, dict]:
+    """Status derivados dos personagens existentes entre `ids`"""
+    p = PersonagensModel
+    linhas = db.execute(
+        select(p.Id, *(getattr(p, nome) for nome, _ in ATRIBUTOS)).where(p.Id.in_(ids)).order_by(p.Id)
+    ).all()
+    if not linhas:
+        return {}
+    encontrados = [linha[0] for linha in linhas]
+    posicao = {personagem_id: i for i, personagem_id in enumerate(encontrados)}
+    base = {
+        nome: _inteiros((linha[i + 1] for linha in linhas), len(linhas), padrao)
+        for i, (nome, padrao) in enumerate(ATRIBUTOS)
+    }
+
+    e, pe = EquipamentosModel, personagem_equipamentos
+    # UNION (sem ALL) elimina o item principal repetido na coleção
+    pares = union(
+        select(pe.c.Personagem_id, pe.c.Equipamento_id).where(pe.c.Personagem_id.in_(encontrados)),
+        select(p.Id, p.Equipamento_id).where(p.Id.in_(encontrados), p.Equipamento_id.isnot(None)),
+    ).subquery()
+    equipamentos = db.execute(
+        select(pares.c.Personagem_id, e.Defesa, e.Ataque, e.Bonus, e.Peso)
+        .join(e, e.Id == pares.c.Equipamento_id)
+    ).all()
+    h, ph = HabilidadesModel, personagem_habilidades
+    habilidades = db.execute(
+        select(ph.c.Personagem_id, h.Id, h.Nome, h.Dano)
+        .join(h, h.Id == ph.c.Habilidade_id)
+        .where(ph.c.Personagem_id.in_(encontrados))
+        .order_by(ph.c.Personagem_id, h.Id)
+    ).all()
+    m, pm = MagiasModel, personagem_magias
+    magias = db.execute(
+        select(pm.c.Personagem_id, m.CustoMana)
+        .join(m, m.Id == pm.c.Magia_id)
+        .where(pm.c.Personagem_id.in_(encontrados))
+    ).all()
+
+    resultado = _calcular(
+        encontrados, base,
+        [(posicao[linha[0]], *linha[1:]) for linha in equipamentos],
+        [(posicao[linha[0]], *linha[1:]) for linha in habilidades],
+        [(posicao[linha[0]], linha[1]) for linha in magias],
+    )
+    return dict(zip(encontrados, resultado))
+
+
+# ============================================================
+# MEMOIZAÇÃO POR PERSONAGEM
+# ============================================================
+# No SQLite a chave de cada personagem é a Geracao da ficha (Fichas,
+# migrações 0006/0007): os triggers a incrementam só quando muda o próprio
+# personagem, suas associações ou um item que ele usa, então escritas em
+# outros personagens não derrubam o resultado. Nos outros bancos a chave é
+# o ETag de TABELAS_DERIVADOS (qualquer escrita invalida tudo).
+class MemoDerivados:
+    def __init__(self, max_itens: int):
+        self.max_itens = max_itens
+        self._itens: "OrderedDict[int, Tuple[Hashable, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chaves: Dict[int, Hashable]) -> Dict[int, dict]:
+        encontrados = {}
+        with self._lock:
+            for personagem_id, chave in chaves.items():
+                item = self._itens.get(personagem_id)
+                if item is not None and item[0] == chave:
+                    self._itens.move_to_end(personagem_id)
+                    encontrados[personagem_id] = item[1]
+        return encontrados
+
+    def guardar(self, resultados: Dict[int, dict], chaves: Dict[int, Hashable]):
+        with self._lock:
+            for personagem_id, derivados in resultados.items():
+                if personagem_id not in chaves:
+                    continue
+                self._itens[personagem_id] = (chaves[personagem_id], derivados)
+                self._itens.move_to_end(personagem_id)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+
+
+memo_derivados = MemoDerivados(max_itens=50_000)
+
+
+def _chaves(db, ids: Sequence[int], versao: str) -> Dict[int, Hashable]:
+    """Chave do memo por personagem; sem linha em Fichas o resultado não é memoizado"""
+    if not usa_fichas(db):
+        return {personagem_id: versao for personagem_id in ids}
+    return dict(db.execute(
+        select(fichas.c.Personagem_id, fichas.c.Geracao).where(fichas.c.Personagem_id.in_(ids))
+    ).all())
+
+
+def derivados(db, ids: Sequence[int], versao: str) -> Dict[int, dict]:
+    """Resultados memoizados; só os ids ausentes (ou desatualizados) são calculados.
+
+    As chaves são lidas antes do cálculo: uma escrita no meio deixa o
+    resultado guardado sob a geração antiga, e a próxima leitura recalcula.
+    """
+    chaves = _chaves(db, ids, versao)
+    resultados = memo_derivados.obter(chaves)
+    faltando = [personagem_id for personagem_id in ids if personagem_id not in resultados]
+    if faltando:
+        novos = calcular_lote(db, faltando)
+        memo_derivados.guardar(novos, chaves)
+        resultados.update(novos)
+    return resultados
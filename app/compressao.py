@@ -0,0 +1,228 @@
+import zlib
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from app.config import settings
+from app.versoes import etag_codificado
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard é opcional
+    zstandard = None
+
+
+# ============================================================
+# CODIFICAÇÕES DISPONÍVEIS
+# ============================================================
+# Níveis escolhidos com `python -m benchmarks.compressao`: os das respostas
+# comprimidas a cada requisição priorizam CPU; os do cache de catálogos
+# (comprimidos uma vez por entrada) priorizam tamanho.
+class _Fluxo:
+    """Compressão incremental de uma resposta em streaming; cada parte sai com flush"""
+
+    def __init__(self, parte: Callable[[bytes], bytes], fim: Callable[[], bytes]):
+        self.parte = parte
+        self.fim = fim
+
+
+def _gzip(dados: bytes, nivel: int) -> bytes:
+    compressor = zlib.compressobj(nivel, zlib.DEFLATED, 31)  # 31 = cabeçalho gzip
+    return compressor.compress(dados) + compressor.flush()
+
+
+def _gzip_fluxo(nivel: int) -> _Fluxo:
+    compressor = zlib.compressobj(nivel, zlib.DEFLATED, 31)
+    return _Fluxo(lambda dados: compressor.compress(dados) + compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush)
+
+
+def _brotli(dados: bytes, nivel: int) -> bytes:
+    return brotli.compress(dados, quality=nivel)
+
+
+def _brotli_fluxo(nivel: int) -> _Fluxo:
+    compressor = brotli.Compressor(quality=nivel)
+    return _Fluxo(lambda dados: compressor.process(dados) + compressor.flush(), compressor.finish)
+
+
+def _zstd(dados: bytes, nivel: int) -> bytes:
+    return zstandard.ZstdCompressor(level=nivel).compress(dados)
+
+
+def _zstd_fluxo(nivel: int) -> _Fluxo:
+    compressor = zstandard.ZstdCompressor(level=nivel).compressobj()
+    return _Fluxo(
+        lambda dados: compressor.compress(dados) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+        compressor.flush,
+    )
+
+
+# nome no Accept-Encoding -> (comprimir, fluxo, nível por requisição, nível do cache)
+CODIFICACOES: Dict[str, Tuple[Callable, Callable, int, int]] = {"gzip": (_gzip, _gzip_fluxo, 6, 9)}
+if brotli is not None:
+    CODIFICACOES["br"] = (_brotli, _brotli_fluxo, 4, 9)
+if zstandard is not None:
+    CODIFICACOES["zstd"] = (_zstd, _zstd_fluxo, 3, 12)
+
+# Só tipos textuais; Parquet e imagens já vêm comprimidos. text/event-stream
+# fica de fora para o SSE não esperar o compressor juntar bytes.
+TIPOS_COMPRIMIVEIS = frozenset({
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/plain",
+    "text/html",
+})
+
+# Corpos acima disso são comprimidos fora do event loop
+LIMITE_THREAD = 256 * 1024
+
+
+def comprimir(dados: bytes, codificacao: str, cache: bool = False) -> bytes:
+    funcao, _, nivel, nivel_cache = CODIFICACOES[codificacao]
+    return funcao(dados, nivel_cache if cache else nivel)
+
+
+@lru_cache(maxsize=256)
+def escolher_codificacao(accept_encoding: str) -> Optional[str]:
+    """Codificação com maior q no Accept-Encoding; empate decidido por RPG_COMPRESSAO_PREFERENCIA"""
+    aceitas: Dict[str, float] = {}
+    for parte in accept_encoding.lower().split(","):
+        nome, _, parametros = parte.partition(";")
+        q = 1.0
+        for parametro in parametros.split(";"):
+            chave, _, valor = parametro.strip().partition("=")
+            if chave == "q":
+                try:
+                    q = float(valor)
+                except ValueError:
+                    q = 0.0
+        aceitas[nome.strip()] = q
+    melhor, melhor_q = None, 0.0
+    for nome in settings.compressao_preferencia.split(","):
+        nome = nome.strip()
+        q = aceitas.get(nome, aceitas.get("*", 0.0))
+        if nome in CODIFICACOES and q > melhor_q:
+            melhor, melhor_q = nome, q
+    return melhor
+
+
+def codificacao_aceita(headers: Headers, tamanho: int) -> Optional[str]:
+    """Codificação a usar para um corpo deste tamanho (None = enviar sem comprimir)"""
+    if not settings.compressao_habilitada or tamanho < settings.compressao_minimo:
+        return None
+    accept_encoding = headers.get("accept-encoding")
+    return escolher_codificacao(accept_encoding) if accept_encoding else None
+
+
+def _adicionar_vary(headers: MutableHeaders):
+    vary = headers.get("vary")
+    if vary is None:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+def _marcar_codificacao(headers: MutableHeaders, codificacao: str):
+    headers["Content-Encoding"] = codificacao
+    if "etag" in headers:
+        headers["ETag"] = etag_codificado(headers["etag"], codificacao)
+
+
+def cabecalhos_comprimidos(codificacao: str, etag: Optional[str] = None) -> Dict[str, str]:
+    """Cabeçalhos de uma resposta já comprimida (ex.: vinda do cache), com o ETag da codificação"""
+    cabecalhos = {"Content-Encoding": codificacao, "Vary": "Accept-Encoding"}
+    if etag is not None:
+        cabecalhos["ETag"] = etag_codificado(etag, codificacao)
+    return cabecalhos
+
+
+# ============================================================
+# MIDDLEWARE
+# ============================================================
+# ASGI puro (como o de métricas): respostas inteiras são comprimidas de uma
+# vez acima de RPG_COMPRESSAO_MINIMO; em streaming (NDJSON, exportações),
+# cada pedaço sai comprimido e com flush, sem esperar o fim. Corpo
+# comprimido ganha a codificação no ETag ("x-gzip"): é um validador forte
+# de outra sequência de bytes. app.versoes aceita as duas formas no
+# If-None-Match e o If-Match só lê a Versao, então ambos seguem valendo.
+class MiddlewareCompressao:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        codificacao = escolher_codificacao(accept_encoding) if accept_encoding else None
+        inicio = None
+        fluxo: Optional[_Fluxo] = None
+        repassar = False
+
+        async def enviar(mensagem):
+            nonlocal inicio, fluxo, repassar
+            if repassar:
+                await send(mensagem)
+                return
+            if mensagem["type"] == "http.response.start":
+                headers = MutableHeaders(scope=mensagem)
+                if mensagem["status"] == 304:
+                    # O 200 correspondente varia com o Accept-Encoding: o 304 precisa dizer o mesmo
+                    _adicionar_vary(headers)
+                tipo = headers.get("content-type", "").split(";")[0].strip()
+                if "content-encoding" in headers or tipo not in TIPOS_COMPRIMIVEIS or mensagem["status"] in (204, 304):
+                    repassar = True
+                    await send(mensagem)
+                    return
+                _adicionar_vary(headers)
+                if codificacao is None:
+                    repassar = True
+                    await send(mensagem)
+                    return
+                inicio = mensagem
+                return
+
+            corpo = mensagem.get("body", b"")
+            mais = mensagem.get("more_body", False)
+            if fluxo is not None:
+                dados = fluxo.parte(corpo) if corpo else b""
+                if not mais:
+                    dados += fluxo.fim()
+                if dados or not mais:
+                    await send({"type": "http.response.body", "body": dados, "more_body": mais})
+                return
+
+            headers = MutableHeaders(scope=inicio)
+            if not mais:
+                # Resposta inteira: só comprime se passar do mínimo e ficar menor
+                comprimido = None
+                if len(corpo) >= settings.compressao_minimo:
+                    if len(corpo) > LIMITE_THREAD:
+                        comprimido = await run_in_threadpool(comprimir, corpo, codificacao)
+                    else:
+                        comprimido = comprimir(corpo, codificacao)
+                if comprimido is not None and len(comprimido) < len(corpo):
+                    _marcar_codificacao(headers, codificacao)
+                    headers["Content-Length"] = str(len(comprimido))
+                    corpo = comprimido
+                repassar = True
+                await send(inicio)
+                await send({"type": "http.response.body", "body": corpo, "more_body": False})
+                return
+
+            # Streaming: tamanho final desconhecido, comprime tudo
+            _marcar_codificacao(headers, codificacao)
+            if "content-length" in headers:
+                del headers["content-length"]
+            fluxo = CODIFICACOES[codificacao][1](CODIFICACOES[codificacao][2])
+            await send(inicio)
+            await send({"type": "http.response.body", "body": fluxo.parte(corpo), "more_body": True})
+
+        await self.app(scope, receive, enviar)
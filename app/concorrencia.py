@@ -0,0 +1,118 @@
+from typing import List, Optional
+from fastapi import HTTPException, Request
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.config import settings
+
+
+# ============================================================
+# CONTROLE OTIMISTA DE CONCORRÊNCIA (If-Match)
+# ============================================================
+# Cada linha tem Versao (models.Versionado). PUT/PATCH aceitam If-Match com:
+# - a Versao lida, ex.: If-Match: "3" (conferida no próprio UPDATE, sem SELECT);
+# - o ETag devolvido pelo GET do item ("<Versao>-<hash>", app.versoes.etag_item, ou "<Versao>-<hash>-gzip"
+#   se veio comprimido), do qual só a Versao conta;
+# - "*" (só exige que o item exista).
+# DELETE aceita o mesmo If-Match. Sem If-Match a escrita é incondicional, a menos que RPG_EXIGIR_IF_MATCH=true (428).
+COLUNAS_CONTROLE = {"Id", "Versao"}
+
+
+def _tags_if_match(request: Request) -> Optional[List[str]]:
+    valor = request.headers.get("if-match")
+    if valor is None:
+        if settings.exigir_if_match:
+            raise HTTPException(status_code=428, detail="Envie If-Match com a Versao ou o ETag do item")
+        return None
+    return [tag.strip() for tag in valor.split(",") if tag.strip()]
+
+
+def _versoes(tags: List[str]) -> List[int]:
+    """Versões de tags "3" ou "3-<hash>"; tags fracas (W/) e irreconhecíveis não casam com nada"""
+    versoes = []
+    for tag in tags:
+        versao = tag.strip('"').split("-", 1)[0]
+        if versao.isdigit():
+            versoes.append(int(versao))
+    return versoes
+
+
+def _falha(existe: bool, prefix: str) -> HTTPException:
+    if not existe:
+        return HTTPException(status_code=404, detail=f"{prefix} não encontrado")
+    return HTTPException(status_code=412, detail=f"{prefix} foi alterado por outra requisição; leia de novo e reenvie")
+
+
+def stmt_update_versionado(model, item_id: int, valores: dict, versoes: Optional[List[int]]):
+    """UPDATE ... SET ..., Versao = Versao + 1 WHERE Id = ? [AND Versao IN (...)] RETURNING *"""
+    stmt = update(model).where(model.Id == item_id).values(**valores, Versao=model.Versao + 1)
+    if versoes is not None:
+        stmt = stmt.where(model.Versao.in_(versoes))
+    return stmt.returning(model).execution_options(synchronize_session=False, populate_existing=True)
+
+
+def stmt_delete_versionado(model, item_id: int, versoes: Optional[List[int]]):
+    """DELETE ... WHERE Id = ? [AND Versao IN (...)] RETURNING Id"""
+    stmt = delete(model).where(model.Id == item_id)
+    if versoes is not None:
+        stmt = stmt.where(model.Versao.in_(versoes))
+    return stmt.returning(model.Id).execution_options(synchronize_session=False)
+
+
+def versoes_aceitas(request: Request) -> Optional[List[int]]:
+    """Versões que o UPDATE/DELETE pode encontrar (None = qualquer uma).
+
+    Sem nenhuma versão reconhecível a lista fica vazia: o WHERE não casa e a
+    escrita responde 412 (ou 404 se o registro não existe), sem SELECT extra.
+    """
+    tags = _tags_if_match(request)
+    if tags is None or "*" in tags:
+        return None
+    return _versoes(tags)
+
+
+def _sem_alteracao(item, versoes: Optional[List[int]], prefix: str):
+    """Nada a gravar (ex.: PATCH {}): só confere existência e If-Match; Versao e ETag ficam iguais"""
+    if item is None or (versoes is not None and item.Versao not in versoes):
+        raise _falha(item is not None, prefix)
+    return item
+
+
+def atualizar_versionado(db: Session, model, item_id: int, valores: dict, versoes: Optional[List[int]], prefix: str):
+    """UPDATE ... RETURNING em uma ida ao banco; só quando nenhuma linha muda consulta se é 404 ou 412"""
+    if not valores:
+        return _sem_alteracao(db.scalars(select(model).where(model.Id == item_id)).first(), versoes, prefix)
+    item = db.scalars(stmt_update_versionado(model, item_id, valores, versoes)).first()
+    if item is None:
+        existe = db.scalar(select(model.Id).where(model.Id == item_id)) is not None
+        db.rollback()
+        raise _falha(existe, prefix)
+    return item
+
+
+async def atualizar_versionado_async(db: AsyncSession, model, item_id: int, valores: dict, versoes: Optional[List[int]], prefix: str):
+    """Versão de atualizar_versionado para AsyncSession"""
+    if not valores:
+        return _sem_alteracao((await db.scalars(select(model).where(model.Id == item_id))).first(), versoes, prefix)
+    item = (await db.scalars(stmt_update_versionado(model, item_id, valores, versoes))).first()
+    if item is None:
+        existe = await db.scalar(select(model.Id).where(model.Id == item_id)) is not None
+        await db.rollback()
+        raise _falha(existe, prefix)
+    return item
+
+
+def excluir_versionado(db: Session, model, item_id: int, versoes: Optional[List[int]], prefix: str):
+    """DELETE ... RETURNING; as linhas dependentes já devem ter sido limpas na mesma transação"""
+    if db.scalar(stmt_delete_versionado(model, item_id, versoes)) is None:
+        existe = db.scalar(select(model.Id).where(model.Id == item_id)) is not None
+        db.rollback()
+        raise _falha(existe, prefix)
+
+
+async def excluir_versionado_async(db: AsyncSession, model, item_id: int, versoes: Optional[List[int]], prefix: str):
+    """Versão de excluir_versionado para AsyncSession"""
+    if await db.scalar(stmt_delete_versionado(model, item_id, versoes)) is None:
+        existe = await db.scalar(select(model.Id).where(model.Id == item_id)) is not None
+        await db.rollback()
+        raise _falha(existe, prefix)
@@ -0,0 +1,62 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Configurações da API, lidas de variáveis de ambiente com prefixo RPG_ (ou do .env)"""
+    database_url: str = "sqlite:///./sistema_rpg.db"
+    # Usa engine/sessões assíncronas (aiosqlite, asyncpg) nas rotas CRUD e de associação
+    modo_async: bool = False
+    # Aplica migrações e seed no startup. Com vários workers, desligue e rode
+    # `python -m app.cli init-db` uma vez antes de subir o servidor
+    inicializar_banco: bool = True
+
+    # Pool de conexões
+    pool_size: int = 5
+    pool_max_overflow: int = 10
+    pool_pre_ping: bool = True
+    pool_recycle: int = 1800  # segundos
+
+    # PRAGMAs aplicados em cada conexão SQLite
+    sqlite_journal_mode: str = "WAL"  # leitores não bloqueiam escrita
+    sqlite_synchronous: str = "NORMAL"  # seguro com WAL, um fsync por checkpoint
+    sqlite_mmap_size: int = 256 * 1024 * 1024  # bytes
+    sqlite_cache_size: int = -64000  # negativo = KiB (64 MB)
+    sqlite_busy_timeout: int = 5000  # ms esperando o lock antes de "database is locked"
+
+    # Cache em memória das respostas dos catálogos (magias, habilidades, raças, classes, equipamentos)
+    cache_habilitado: bool = True
+    cache_max_bytes: int = 32 * 1024 * 1024
+    cache_ttl: float = 60.0  # segundos; limita respostas velhas entre workers diferentes
+
+    # Compressão das respostas (gzip; br e zstd com os pacotes brotli/zstandard instalados)
+    compressao_habilitada: bool = True
+    compressao_minimo: int = 1024  # bytes; corpos menores saem sem comprimir
+    compressao_preferencia: str = "zstd,br,gzip"  # desempate quando o cliente aceita várias com o mesmo q
+
+    # Controle otimista de concorrência: com true, PUT sem If-Match responde 428
+    exigir_if_match: bool = False
+
+    # Feed de alterações (/events)
+    eventos_intervalo: float = 1.0  # segundos entre leituras do registro (pega escritas de outros workers)
+    eventos_janela: float = 0.05  # segundos juntando uma rajada de alterações num lote só
+    eventos_heartbeat: float = 15.0  # segundos sem alterações até um comentário de keep-alive no SSE
+    eventos_max_pendentes: int = 1000  # alterações pendentes por cliente antes de virar reset
+
+    # Métricas por rota em /metrics (latência, consultas SQL, N+1)
+    metricas_habilitadas: bool = True
+    metricas_server_timing: bool = False  # Server-Timing em toda resposta (senão só com X-Server-Timing: 1)
+    metricas_limite_n_mais_um: int = 10  # mesma consulta repetida mais que isso numa requisição gera aviso
+
+    # Servidor (run.py); workers = 0 usa a quantidade de núcleos da CPU em --producao
+    servidor_host: str = "127.0.0.1"
+    servidor_porta: int = 8000
+    servidor_workers: int = 0
+    servidor_backlog: int = 2048  # conexões pendentes na fila do socket
+    servidor_keep_alive: int = 5  # segundos de conexão ociosa mantida aberta
+    servidor_timeout_desligamento: int = 30  # segundos esperando requisições em andamento no SIGTERM
+    servidor_access_log: bool = False
+
+    model_config = SettingsConfigDict(env_prefix="RPG_", env_file=".env", extra="ignore")
+
+
+settings = Settings()
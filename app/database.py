@@ -1,12 +1,54 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import declarative_base, sessionmaker
+from app.alteracoes import rastrear_alteracoes
+from app.config import settings
+from app.metricas import medir_consultas
 
-DATABASE_URL = "sqlite:///./sistema_rpg.db"
+DATABASE_URL = settings.database_url
 
-engine = create_engine(
-    DATABASE_URL, 
-    connect_args={"check_same_thread": False}
-)
+
+# ============================================================
+# FÁBRICA DE ENGINE
+# ============================================================
+def _aplicar_pragmas_sqlite(dbapi_connection, connection_record):
+    """Ajustes de desempenho/concorrência executados em cada conexão SQLite nova"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout)}")
+    finally:
+        cursor.close()
+
+
+def _opcoes_engine(url: str) -> dict:
+    opcoes = {
+        "pool_pre_ping": settings.pool_pre_ping,
+        "pool_recycle": settings.pool_recycle,
+    }
+    if url.startswith("sqlite"):
+        opcoes["connect_args"] = {"check_same_thread": False}
+        # Banco em memória usa um pool de conexão única, sem tamanho configurável
+        if ":memory:" in url or url.rstrip("/").endswith("sqlite:"):
+            return opcoes
+    opcoes["pool_size"] = settings.pool_size
+    opcoes["max_overflow"] = settings.pool_max_overflow
+    return opcoes
+
+
+def criar_engine(url: str = DATABASE_URL):
+    """Cria a engine a partir das configurações (pool + PRAGMAs do SQLite)"""
+    engine = create_engine(url, **_opcoes_engine(url))
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _aplicar_pragmas_sqlite)
+    rastrear_alteracoes(engine)
+    medir_consultas(engine)
+    return engine
+
+
+engine = criar_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -20,3 +62,42 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ============================================================
+# MODO ASSÍNCRONO
+# ============================================================
+def url_async(url: str) -> str:
+    """Troca o driver da URL pelo equivalente assíncrono (aiosqlite / asyncpg)"""
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    if url.startswith("postgresql://") or url.startswith("postgres://"):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    return url
+
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.modo_async:
+    # Import tardio: só exige os drivers assíncronos quando o modo está ligado
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    url = url_async(DATABASE_URL)
+    opcoes = _opcoes_engine(url)
+    if "pool_size" in opcoes:
+        # aiosqlite usa NullPool por padrão; força o pool configurável
+        opcoes["poolclass"] = AsyncAdaptedQueuePool
+    async_engine = create_async_engine(url, **opcoes)
+    if async_engine.dialect.name == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", _aplicar_pragmas_sqlite)
+    rastrear_alteracoes(async_engine.sync_engine)
+    medir_consultas(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    """Dependency para obter sessão assíncrona do banco de dados"""
+    async with AsyncSessionLocal() as db:
+        yield db
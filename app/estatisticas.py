@@ -0,0 +1,174 @@
+from typing import Optional
+from sqlalchemy import Column, Integer, MetaData, String, Table, desc, func, select, union
+from app.associacoes import Associacao
+from app.models import PersonagensModel, EquipamentosModel, personagem_equipamentos
+
+
+# ============================================================
+# TABELAS DE RESUMO (MANTIDAS POR TRIGGERS, MIGRAÇÃO 0003)
+# ============================================================
+# Metadata próprio: as tabelas só existem no SQLite e não entram no
+# create_all/autogenerate dos models. Nos outros bancos as mesmas
+# estatísticas saem de GROUP BY sobre as tabelas originais.
+metadata_resumos = MetaData()
+
+resumo_personagens = Table(
+    "Resumo_Personagens",
+    metadata_resumos,
+    Column("Dimensao", String(20), primary_key=True),
+    Column("Valor", String, primary_key=True),
+    Column("Quantidade", Integer),
+    Column("Soma_Level", Integer),
+    Column("Soma_Forca", Integer),
+    Column("Soma_Mana", Integer),
+)
+
+resumo_associacoes = Table(
+    "Resumo_Associacoes",
+    metadata_resumos,
+    Column("Tabela", String(50), primary_key=True),
+    Column("Item_id", Integer, primary_key=True),
+    Column("Quantidade", Integer),
+)
+
+resumo_peso = Table(
+    "Resumo_Peso",
+    metadata_resumos,
+    Column("Personagem_id", Integer, primary_key=True),
+    Column("Peso_Total", Integer),
+    Column("Itens", Integer),
+)
+
+# Dimensões de /stats/personagens/por-{dimensao}
+DIMENSOES = {
+    "classe": PersonagensModel.Classe_Nome,
+    "raca": PersonagensModel.Raca_Nome,
+}
+
+# Tabelas lidas por cada estatística (ETag/cache); os resumos mudam
+# exatamente quando elas mudam
+TABELAS_PERSONAGENS = frozenset({PersonagensModel.__tablename__})
+TABELAS_PESO = frozenset({
+    PersonagensModel.__tablename__,
+    personagem_equipamentos.name,
+    EquipamentosModel.__tablename__,
+})
+
+
+def usa_resumos(db) -> bool:
+    return db.get_bind().dialect.name == "sqlite"
+
+
+def _media(soma, quantidade):
+    return func.round(soma * 1.0 / quantidade, 2)
+
+
+# ============================================================
+# CONSULTAS
+# ============================================================
+def stmt_distribuicao(dimensao: str, resumos: bool):
+    """Quantidade de personagens por valor da dimensão (classe ou raça)"""
+    if resumos:
+        r = resumo_personagens.c
+        return (
+            select(func.nullif(r.Valor, "").label("valor"), r.Quantidade.label("quantidade"))
+            .where(r.Dimensao == dimensao, r.Quantidade > 0)
+            .order_by(r.Quantidade.desc(), r.Valor)
+        )
+    coluna = DIMENSOES[dimensao]
+    quantidade = func.count().label("quantidade")
+    return (
+        select(coluna.label("valor"), quantidade)
+        .group_by(coluna)
+        .order_by(desc(quantidade), coluna)
+    )
+
+
+def stmt_medias_classe(resumos: bool):
+    """Quantidade e médias de Level/Forca/Mana por Classe_Nome"""
+    if resumos:
+        r = resumo_personagens.c
+        return (
+            select(
+                func.nullif(r.Valor, "").label("classe"),
+                r.Quantidade.label("quantidade"),
+                _media(r.Soma_Level, r.Quantidade).label("media_level"),
+                _media(r.Soma_Forca, r.Quantidade).label("media_forca"),
+                _media(r.Soma_Mana, r.Quantidade).label("media_mana"),
+            )
+            .where(r.Dimensao == "classe", r.Quantidade > 0)
+            .order_by(r.Valor)
+        )
+    p = PersonagensModel
+    quantidade = func.count()
+    return (
+        select(
+            p.Classe_Nome.label("classe"),
+            quantidade.label("quantidade"),
+            _media(func.sum(func.coalesce(p.Level, 0)), quantidade).label("media_level"),
+            _media(func.sum(func.coalesce(p.Forca, 0)), quantidade).label("media_forca"),
+            _media(func.sum(func.coalesce(p.Mana, 0)), quantidade).label("media_mana"),
+        )
+        .group_by(p.Classe_Nome)
+        .order_by(p.Classe_Nome)
+    )
+
+
+def stmt_populares(assoc: Associacao, limit: int, resumos: bool):
+    """Itens da associação com mais personagens"""
+    item = assoc.model
+    if resumos:
+        r = resumo_associacoes.c
+        return (
+            select(item.Id, item.Nome, r.Quantidade.label("quantidade"))
+            .join(item, item.Id == r.Item_id)
+            .where(r.Tabela == assoc.tabela.name, r.Quantidade > 0)
+            .order_by(r.Quantidade.desc(), item.Id)
+            .limit(limit)
+        )
+    quantidade = func.count().label("quantidade")
+    return (
+        select(item.Id, item.Nome, quantidade)
+        .join(assoc.tabela, assoc.coluna_item == item.Id)
+        .group_by(item.Id, item.Nome)
+        .order_by(desc(quantidade), item.Id)
+        .limit(limit)
+    )
+
+
+def stmt_peso(limit: int, after: Optional[int], resumos: bool):
+    """Peso total dos equipamentos (item principal + coleção) de cada personagem (paginado por Id)"""
+    p = PersonagensModel
+    if resumos:
+        r = resumo_peso.c
+        stmt = (
+            select(
+                p.Id, p.Nome,
+                func.coalesce(r.Peso_Total, 0).label("peso_total"),
+                func.coalesce(r.Itens, 0).label("itens"),
+            )
+            .outerjoin(resumo_peso, r.Personagem_id == p.Id)
+        )
+    else:
+        e = EquipamentosModel
+        pe = personagem_equipamentos
+        # Item principal + coleção, como a carga de app.combate; o UNION (sem ALL)
+        # não conta duas vezes o item principal que também está na coleção
+        pares = union(
+            select(pe.c.Personagem_id, pe.c.Equipamento_id),
+            select(p.Id, p.Equipamento_id).where(p.Equipamento_id.isnot(None)),
+        ).subquery()
+        stmt = (
+            select(
+                p.Id, p.Nome,
+                func.coalesce(func.sum(func.coalesce(e.Peso, 0)), 0).label("peso_total"),
+                func.count(pares.c.Equipamento_id).label("itens"),
+            )
+            .outerjoin(pares, pares.c.Personagem_id == p.Id)
+            .outerjoin(e, e.Id == pares.c.Equipamento_id)
+            .group_by(p.Id, p.Nome)
+        )
+    if after is not None:
+        stmt = stmt.where(p.Id > after)
+    return stmt.order_by(p.Id).limit(limit + 1)
+
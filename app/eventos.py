@@ -0,0 +1,302 @@
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import Column, Integer, MetaData, String, Table, func, select
+from app.alteracoes import ao_confirmar
+from app.config import settings
+from app.database import engine
+
+logger = logging.getLogger("app.eventos")
+
+
+# ============================================================
+# REGISTRO DE EVENTOS (MANTIDO POR TRIGGERS, MIGRAÇÃO 0005)
+# ============================================================
+# Metadata próprio, como os resumos de /stats: a tabela só existe no SQLite.
+# Os triggers pegam toda escrita (ORM, UPDATE ... RETURNING, lotes, outros
+# workers), coisa que os eventos de mapper do ORM não veriam.
+metadata_eventos = MetaData()
+
+registro_eventos = Table(
+    "Eventos",
+    metadata_eventos,
+    Column("Seq", Integer, primary_key=True),
+    Column("Tabela", String(50)),
+    Column("Linha", Integer),
+    Column("Item", Integer),
+    Column("Operacao", String(10)),
+)
+
+# Tabela -> recurso do feed; nas associações o id é o personagem e o item é a magia/habilidade/equipamento
+RECURSOS = {
+    "Racas": "racas",
+    "Magias": "magias",
+    "Habilidades": "habilidades",
+    "Classe": "classes",
+    "Personagens": "personagens",
+    "Atributos": "atributos",
+    "Equipamentos": "equipamentos",
+    "Personagem_Magias": "personagens.magias",
+    "Personagem_Habilidades": "personagens.habilidades",
+    "Personagem_Equipamentos": "personagens.equipamentos",
+}
+TODOS_RECURSOS = frozenset(RECURSOS.values())
+
+# Linhas lidas do registro por consulta
+LIMITE_LEITURA = 5000
+
+
+def ler_recursos(nomes: Optional[Iterable[str]]) -> Set[str]:
+    """Expande a lista pedida ("personagens" inclui "personagens.magias" etc.); vazia = todos"""
+    nomes = [nome.strip() for nome in nomes or () if nome.strip()]
+    if not nomes:
+        return set(TODOS_RECURSOS)
+    recursos = set()
+    for nome in nomes:
+        encontrados = {r for r in TODOS_RECURSOS if r == nome or r.startswith(nome + ".")}
+        if not encontrados:
+            raise ValueError(f"Recurso desconhecido: {nome}. Opções: {', '.join(sorted(TODOS_RECURSOS))}")
+        recursos |= encontrados
+    return recursos
+
+
+_Chave = Tuple[str, Optional[int], Optional[int]]
+
+
+def _mesclar(pendentes: Dict[_Chave, str], chave: _Chave, operacao: str, anterior: bool = False):
+    """Junta duas alterações do mesmo registro: delete vence; insert seguido de update continua insert"""
+    atual = pendentes.get(chave)
+    if atual is None:
+        pendentes[chave] = operacao
+        return
+    antiga, nova = (operacao, atual) if anterior else (atual, operacao)
+    pendentes[chave] = "insert" if antiga == "insert" and nova == "update" else nova
+
+
+# ============================================================
+# ASSINATURAS
+# ============================================================
+class Assinatura:
+    """Alterações pendentes de um cliente, já filtradas e agrupadas por registro.
+
+    Um cliente lento não acumula uma fila: as alterações do mesmo registro se
+    juntam, e acima de RPG_EVENTOS_MAX_PENDENTES o lote vira um reset
+    (o cliente recarrega os recursos assinados).
+    """
+
+    def __init__(self, recursos: Set[str]):
+        self.recursos = recursos
+        self.pendentes: Dict[_Chave, str] = {}
+        self.seq = 0
+        self.reset = False
+        self.encerrada = False
+        self._sinal = asyncio.Event()
+
+    def adicionar(self, recurso: str, linha: Optional[int], item: Optional[int], operacao: str, anterior: bool = False):
+        if recurso not in self.recursos or self.reset:
+            return
+        _mesclar(self.pendentes, (recurso, linha, item), operacao, anterior)
+        if len(self.pendentes) > settings.eventos_max_pendentes:
+            self.marcar_reset()
+        self._sinal.set()
+
+    def marcar_reset(self):
+        self.pendentes.clear()
+        self.reset = True
+        self._sinal.set()
+
+    def encerrar(self):
+        self.encerrada = True
+        self._sinal.set()
+
+    async def proximo(self, timeout: float) -> Optional[dict]:
+        """Próximo lote, ou None se nada chegou no timeout (ou o feed foi encerrado)"""
+        try:
+            await asyncio.wait_for(self._sinal.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if self.encerrada:
+            return None
+        # Janela curta: uma rajada de escritas sai num lote só
+        await asyncio.sleep(settings.eventos_janela)
+        self._sinal.clear()
+        lote = {"seq": self.seq, "eventos": [
+            {"recurso": recurso, "op": operacao, "id": linha, **({"item": item} if item is not None else {})}
+            for (recurso, linha, item), operacao in self.pendentes.items()
+        ]}
+        if self.reset:
+            lote["reset"] = True
+        self.pendentes = {}
+        self.reset = False
+        return lote
+
+
+# ============================================================
+# FEED DE ALTERAÇÕES (PUB/SUB NO PROCESSO)
+# ============================================================
+class FeedEventos:
+    """Lê o registro de eventos e distribui para as assinaturas do processo.
+
+    Uma única tarefa por processo lê o registro (nunca uma consulta por
+    cliente): na hora, quando um commit deste processo toca as tabelas do
+    feed, e a cada RPG_EVENTOS_INTERVALO segundos para pegar escritas de
+    outros workers. Sem assinaturas a tarefa para. Fora do SQLite não há
+    registro: cada commit vira um evento por recurso, sem id, e retomar de
+    um seq diferente do atual devolve reset.
+    """
+
+    def __init__(self):
+        self.assinaturas: Set[Assinatura] = set()
+        self.no_banco = False
+        self.ultimo = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._acordar: Optional[asyncio.Event] = None
+        self._tarefa: Optional[asyncio.Task] = None
+        self._inicio = asyncio.Lock()
+
+    # ---------------- leitura do registro (em thread) ----------------
+    def _ler(self, desde: int, ate: Optional[int] = None) -> List[tuple]:
+        r = registro_eventos.c
+        stmt = select(r.Seq, r.Tabela, r.Linha, r.Item, r.Operacao).where(r.Seq > desde)
+        if ate is not None:
+            stmt = stmt.where(r.Seq <= ate)
+        with engine.connect() as conexao:
+            return conexao.execute(stmt.order_by(r.Seq).limit(LIMITE_LEITURA)).all()
+
+    def _limites(self) -> Tuple[int, int]:
+        with engine.connect() as conexao:
+            minimo, maximo = conexao.execute(
+                select(func.min(registro_eventos.c.Seq), func.max(registro_eventos.c.Seq))
+            ).one()
+        return minimo or 0, maximo or 0
+
+    # ---------------- assinaturas ----------------
+    async def _iniciar(self):
+        async with self._inicio:
+            if self._tarefa is not None and self._loop is asyncio.get_running_loop():
+                return
+            self._loop = asyncio.get_running_loop()
+            self._acordar = asyncio.Event()
+            if self.no_banco:
+                self.ultimo = (await asyncio.to_thread(self._limites))[1]
+            self._tarefa = asyncio.create_task(self._rodar())
+
+    async def assinar(self, recursos: Set[str], desde: Optional[int] = None) -> Assinatura:
+        """Nova assinatura; com desde, recebe primeiro o que mudou depois daquele seq"""
+        await self._iniciar()
+        assinatura = Assinatura(recursos)
+        assinatura.seq = self.ultimo
+        self.assinaturas.add(assinatura)
+        if desde is not None and desde < assinatura.seq:
+            await self._recuperar(assinatura, desde, assinatura.seq)
+        return assinatura
+
+    def cancelar(self, assinatura: Assinatura):
+        self.assinaturas.discard(assinatura)
+
+    async def _recuperar(self, assinatura: Assinatura, desde: int, ate: int):
+        if not self.no_banco:
+            assinatura.marcar_reset()
+            return
+        minimo, _ = await asyncio.to_thread(self._limites)
+        if desde < minimo - 1:
+            # Parte do intervalo já saiu da retenção
+            assinatura.marcar_reset()
+            return
+        # Junta o histórico à parte e depois como "anterior" ao que já chegou ao vivo
+        historico: Dict[_Chave, str] = {}
+        while desde < ate and len(historico) <= settings.eventos_max_pendentes:
+            linhas = await asyncio.to_thread(self._ler, desde, ate)
+            if not linhas:
+                break
+            for seq, tabela, linha, item, operacao in linhas:
+                recurso = RECURSOS.get(tabela)
+                if recurso in assinatura.recursos:
+                    _mesclar(historico, (recurso, linha, item), operacao)
+            desde = linhas[-1][0]
+        for (recurso, linha, item), operacao in historico.items():
+            assinatura.adicionar(recurso, linha, item, operacao, anterior=True)
+
+    # ---------------- distribuição ----------------
+    def _distribuir(self, linhas: List[tuple]):
+        for seq, tabela, linha, item, operacao in linhas:
+            recurso = RECURSOS.get(tabela)
+            if recurso is None:
+                continue
+            for assinatura in self.assinaturas:
+                assinatura.adicionar(recurso, linha, item, operacao)
+        self.ultimo = linhas[-1][0]
+        for assinatura in self.assinaturas:
+            assinatura.seq = self.ultimo
+
+    def _alteracoes_locais(self, tabelas):
+        self.ultimo += 1
+        for assinatura in self.assinaturas:
+            assinatura.seq = self.ultimo
+            for tabela in tabelas:
+                if tabela in RECURSOS:
+                    assinatura.adicionar(RECURSOS[tabela], None, None, "update")
+
+    async def _rodar(self):
+        while self.assinaturas:
+            try:
+                await asyncio.wait_for(self._acordar.wait(), settings.eventos_intervalo)
+            except asyncio.TimeoutError:
+                pass
+            self._acordar.clear()
+            if not self.no_banco:
+                continue
+            try:
+                while linhas := await asyncio.to_thread(self._ler, self.ultimo):
+                    self._distribuir(linhas)
+                    if len(linhas) < LIMITE_LEITURA:
+                        break
+            except Exception:
+                logger.exception("Falha ao ler o registro de eventos")
+        self._tarefa = None
+
+    def _notificado(self, tabelas):
+        if self.no_banco:
+            self._acordar.set()
+        else:
+            self._alteracoes_locais(tabelas)
+
+    def notificar(self, tabelas):
+        """Chamado após cada commit do processo (de qualquer thread)"""
+        loop = self._loop
+        if loop is None or not self.assinaturas or RECURSOS.keys().isdisjoint(tabelas):
+            return
+        try:
+            loop.call_soon_threadsafe(self._notificado, frozenset(tabelas))
+        except RuntimeError:
+            pass  # loop já encerrado
+
+    async def encerrar(self):
+        """No shutdown: fecha os streams abertos e para a tarefa de leitura"""
+        for assinatura in self.assinaturas:
+            assinatura.encerrar()
+        self.assinaturas.clear()
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+        self._tarefa = None
+        self._loop = None
+        self._inicio = asyncio.Lock()
+
+
+feed_eventos = FeedEventos()
+
+
+@ao_confirmar
+def _notificar_feed(tabelas):
+    feed_eventos.notificar(tabelas)
+
+
+def detectar_registro_eventos(engine):
+    """Usa o registro do banco se a migração 0005 já criou a tabela (sem DDL)"""
+    if engine.dialect.name != "sqlite":
+        feed_eventos.no_banco = False
+        return
+    with engine.connect() as conexao:
+        feed_eventos.no_banco = conexao.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Eventos'"
+        ).first() is not None
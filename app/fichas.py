@@ -0,0 +1,197 @@
+import secrets
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import Column, Integer, MetaData, Table, Text, bindparam, delete, exists, func, insert, select, update
+from sqlalchemy.orm import Session
+from app.carregamento import opcoes_carregamento
+from app.database import SessionLocal
+from app.models import PersonagensModel
+from app.serializacao import para_json
+
+
+# ============================================================
+# FICHAS DOS PERSONAGENS (PROJEÇÃO MANTIDA POR TRIGGERS, MIGRAÇÃO 0006)
+# ============================================================
+# Metadata próprio, como os resumos de /stats: a tabela só existe no SQLite.
+# Dados é o JSON pronto da ficha; os triggers o anulam (e incrementam
+# Geracao) a cada escrita que muda a ficha, e a próxima leitura o remonta.
+metadata_fichas = MetaData()
+
+fichas = Table(
+    "Fichas",
+    metadata_fichas,
+    Column("Personagem_id", Integer, primary_key=True),
+    Column("Geracao", Integer, nullable=False, default=0),
+    Column("Dados", Text),
+)
+
+# Personagens montados por consulta na reconstrução e na conferência
+BLOCO_FICHAS = 1000
+
+# Fichas novas começam numa Geracao aleatória (migração 0007): um Id
+# reaproveitado não repete a geração do personagem apagado
+BITS_GERACAO = 48
+
+
+def usa_fichas(db: Session) -> bool:
+    return db.get_bind().dialect.name == "sqlite"
+
+
+def montar_fichas(db: Session, schema, ids: Sequence[int]) -> Dict[int, str]:
+    """JSON das fichas a partir das tabelas (número fixo de consultas para qualquer quantidade)"""
+    stmt = (
+        select(PersonagensModel)
+        .options(*opcoes_carregamento(PersonagensModel, schema))
+        .where(PersonagensModel.Id.in_(ids))
+    )
+    return {
+        personagem.Id: para_json(schema, personagem, lista=False).decode()
+        for personagem in db.scalars(stmt).all()
+    }
+
+
+def _gravar(db: Session, geracoes: Dict[int, int], montadas: Dict[int, str]) -> int:
+    """Grava só as fichas cuja Geracao não mudou desde a leitura (nenhuma escrita no meio)"""
+    linhas = [
+        {"pid": personagem_id, "geracao": geracoes[personagem_id], "dados": dados}
+        for personagem_id, dados in montadas.items()
+    ]
+    if not linhas:
+        return 0
+    stmt = (
+        update(fichas)
+        .where(fichas.c.Personagem_id == bindparam("pid"), fichas.c.Geracao == bindparam("geracao"))
+        .values(Dados=bindparam("dados"))
+    )
+    return db.connection().execute(stmt, linhas).rowcount
+
+
+# ============================================================
+# LEITURA
+# ============================================================
+def ler_fichas(db: Session, schema, ids: Sequence[int]) -> Dict[int, str]:
+    """JSON das fichas de vários personagens (ausentes ficam de fora do dict).
+
+    Uma leitura pela chave primária para todos os ids; as fichas pendentes
+    são montadas juntas (número fixo de consultas) e gravadas num UPDATE só.
+    A Geracao é lida antes das tabelas: se uma escrita chegar enquanto a
+    ficha é montada, o UPDATE condicional não grava nada e a próxima
+    leitura monta de novo.
+    """
+    if not usa_fichas(db):
+        return montar_fichas(db, schema, ids)
+    linhas = db.execute(
+        select(fichas.c.Personagem_id, fichas.c.Geracao, fichas.c.Dados).where(fichas.c.Personagem_id.in_(ids))
+    ).all()
+    prontas = {linha.Personagem_id: linha.Dados for linha in linhas if linha.Dados is not None}
+    pendentes = [personagem_id for personagem_id in ids if personagem_id not in prontas]
+    if not pendentes:
+        return prontas
+    montadas = montar_fichas(db, schema, pendentes)
+    # Sem linha em Fichas (banco inconsistente) a ficha é servida sem ser gravada;
+    # `python -m app.cli fichas conferir --corrigir` recria as linhas
+    geracoes = {linha.Personagem_id: linha.Geracao for linha in linhas if linha.Personagem_id in montadas}
+    if _gravar(db, geracoes, {personagem_id: montadas[personagem_id] for personagem_id in geracoes}):
+        db.commit()
+    prontas.update(montadas)
+    return prontas
+
+
+def ler_ficha(db: Session, schema, personagem_id: int) -> Optional[str]:
+    """JSON da ficha com uma leitura pela chave primária; None se o personagem não existe"""
+    return ler_fichas(db, schema, [personagem_id]).get(personagem_id)
+
+
+# ============================================================
+# RECONSTRUÇÃO E CONFERÊNCIA
+# ============================================================
+def _sincronizar_linhas(db: Session, corrigir: bool) -> Dict[str, List[int]]:
+    """Personagens sem linha em Fichas e fichas de personagens que não existem (criadas/removidas se corrigir)"""
+    p, f = PersonagensModel, fichas.c
+    sem_ficha = db.scalars(
+        select(p.Id).where(~exists().where(f.Personagem_id == p.Id)).order_by(p.Id)
+    ).all()
+    orfas = db.scalars(
+        select(f.Personagem_id).where(~exists().where(p.Id == f.Personagem_id)).order_by(f.Personagem_id)
+    ).all()
+    if corrigir:
+        if sem_ficha:
+            db.execute(insert(fichas), [
+                {"Personagem_id": personagem_id, "Geracao": secrets.randbits(BITS_GERACAO)} for personagem_id in sem_ficha
+            ])
+        if orfas:
+            db.execute(delete(fichas).where(f.Personagem_id.in_(orfas)))
+        db.commit()
+    return {"sem_ficha": list(sem_ficha), "orfas": list(orfas)}
+
+
+def _blocos(db: Session, condicao=None):
+    """(Id, Geracao, Dados) das fichas em blocos de BLOCO_FICHAS, pela chave primária"""
+    ultimo = 0
+    while True:
+        stmt = select(fichas.c.Personagem_id, fichas.c.Geracao, fichas.c.Dados).where(fichas.c.Personagem_id > ultimo)
+        if condicao is not None:
+            stmt = stmt.where(condicao)
+        linhas = db.execute(stmt.order_by(fichas.c.Personagem_id).limit(BLOCO_FICHAS)).all()
+        if not linhas:
+            return
+        yield linhas
+        ultimo = linhas[-1].Personagem_id
+        # As entidades do bloco anterior não são mais necessárias
+        db.expunge_all()
+
+
+def reconstruir_fichas(schema, todas: bool = False, sessao=SessionLocal, log=print) -> int:
+    """Monta e grava as fichas pendentes (Dados NULL) ou, com todas, todas elas"""
+    gravadas = 0
+    with sessao() as db:
+        if not usa_fichas(db):
+            log("ℹ️ Fichas materializadas só existem no SQLite; nada a reconstruir")
+            return 0
+        _sincronizar_linhas(db, corrigir=True)
+        for linhas in _blocos(db, None if todas else fichas.c.Dados.is_(None)):
+            geracoes = {linha.Personagem_id: linha.Geracao for linha in linhas}
+            gravadas += _gravar(db, geracoes, montar_fichas(db, schema, list(geracoes)))
+            db.commit()
+            log(f"  {gravadas} fichas gravadas (até o personagem {linhas[-1].Personagem_id})")
+    return gravadas
+
+
+def conferir_fichas(schema, corrigir: bool = False, sessao=SessionLocal) -> dict:
+    """Compara cada ficha gravada com a montada agora a partir das tabelas.
+
+    Divergências indicam uma escrita que os triggers não cobrem. Com
+    corrigir, fichas divergentes são invalidadas, linhas faltando são
+    criadas e fichas órfãs removidas.
+    """
+    resultado = {"verificadas": 0, "pendentes": 0, "divergentes": [], "sem_ficha": [], "orfas": []}
+    with sessao() as db:
+        if not usa_fichas(db):
+            return resultado
+        resultado.update(_sincronizar_linhas(db, corrigir))
+        resultado["pendentes"] = db.scalar(
+            select(func.count()).select_from(fichas).where(fichas.c.Dados.is_(None))
+        )
+        for linhas in _blocos(db, fichas.c.Dados.isnot(None)):
+            montadas = montar_fichas(db, schema, [linha.Personagem_id for linha in linhas])
+            suspeitas = {
+                linha.Personagem_id: linha.Geracao
+                for linha in linhas
+                if montadas.get(linha.Personagem_id) != linha.Dados
+            }
+            resultado["verificadas"] += len(linhas)
+            if not suspeitas:
+                continue
+            # Geracao mudou desde a leitura: foi uma escrita concorrente, não uma divergência
+            atuais = dict(db.execute(
+                select(fichas.c.Personagem_id, fichas.c.Geracao).where(fichas.c.Personagem_id.in_(list(suspeitas)))
+            ).all())
+            divergentes = [pid for pid, geracao in suspeitas.items() if atuais.get(pid) == geracao]
+            resultado["divergentes"].extend(divergentes)
+            if corrigir and divergentes:
+                db.execute(
+                    update(fichas)
+                    .where(fichas.c.Personagem_id.in_(divergentes))
+                    .values(Geracao=fichas.c.Geracao + 1, Dados=None)
+                )
+                db.commit()
+    return resultado
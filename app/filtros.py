@@ -0,0 +1,169 @@
+import inspect as pyinspect
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+from fastapi import HTTPException, Query
+from pydantic import create_model
+from sqlalchemy import Text, select
+from app.lote import LIMITE_LOTE
+
+
+# ============================================================
+# FILTROS, ORDENAÇÃO E PROJEÇÃO DAS LISTAGENS
+# ============================================================
+class ParametrosLista:
+    """Resultado dos parâmetros de query já validados contra a whitelist do model"""
+
+    def __init__(
+        self, condicoes: list, ordem: list, campos: Optional[Tuple[str, ...]], ids: Optional[List[int]] = None,
+    ):
+        self.condicoes = condicoes
+        self.ordem = ordem
+        self.campos = campos
+        self.ids = ids
+
+    def schema_resposta(self, schema):
+        return schema_projecao(schema, self.campos) if self.campos else schema
+
+    def conferir(self, limit: Optional[int], after: Optional[int], stream: bool):
+        """Combinações que a listagem não suporta viram 400"""
+        if self.ordem and after is not None:
+            raise HTTPException(status_code=400, detail="O cursor after só vale na ordenação padrão (Id); não use junto com sort")
+        if stream and (self.ordem or self.campos):
+            raise HTTPException(status_code=400, detail="stream não aceita sort nem fields")
+        if self.ids and (limit is not None or after is not None or stream):
+            raise HTTPException(status_code=400, detail="ids não aceita limit, after nem stream")
+
+    def ordenar(self, itens: list) -> list:
+        """Com ids e sem sort, os itens voltam na ordem pedida (ids inexistentes ficam de fora)"""
+        if not self.ids or self.ordem:
+            return itens
+        por_id = {item.Id: item for item in itens}
+        return [por_id[item_id] for item_id in self.ids if item_id in por_id]
+
+
+def colunas_filtraveis(model, schema) -> List[str]:
+    """Colunas do schema que podem ser filtradas/ordenadas (textos longos ficam de fora)"""
+    colunas = model.__table__.c
+    return [
+        nome for nome in schema.model_fields
+        if nome in colunas and not isinstance(colunas[nome].type, Text)
+    ]
+
+
+def _tipo(coluna):
+    try:
+        return coluna.type.python_type
+    except NotImplementedError:
+        return str
+
+
+def _separar(valor: Optional[str]) -> List[str]:
+    return [parte.strip() for parte in (valor or "").split(",") if parte.strip()]
+
+
+def lista_ids(valor: Optional[str], limite: int) -> List[int]:
+    """?ids=1,2,3 -> [1, 2, 3] sem repetidos (400 se vazio, inválido ou acima do limite)"""
+    try:
+        ids = list(dict.fromkeys(int(parte) for parte in _separar(valor)))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids deve ser uma lista de inteiros separados por vírgula")
+    if not ids:
+        raise HTTPException(status_code=400, detail="Informe ao menos um id em ids")
+    if len(ids) > limite:
+        raise HTTPException(status_code=400, detail=f"Máximo de {limite} ids por requisição")
+    return ids
+
+
+@lru_cache(maxsize=None)
+def schema_projecao(schema, campos: Tuple[str, ...]):
+    """Schema só com os campos pedidos em ?fields= (mesmos tipos do schema original)"""
+    definicoes = {nome: (schema.model_fields[nome].annotation, schema.model_fields[nome]) for nome in campos}
+    return create_model(
+        f"{schema.__name__}Campos",
+        __config__={"from_attributes": True},
+        **definicoes,
+    )
+
+
+def criar_parametros_lista(model, schema, filtraveis: Sequence[str]):
+    """Dependency com um parâmetro tipado por coluna da whitelist.
+
+    - Coluna=valor (repetível: Tipo=arma&Tipo=escudo vira IN)
+    - Coluna_min / Coluna_max para colunas numéricas
+    - sort=Coluna,-Outra (o "-" inverte; Id desempata)
+    - fields=Id,Nome (SELECT só dessas colunas; Id sempre incluído)
+    - ids=1,2,3 (um único WHERE Id IN (...), resposta na ordem de ids)
+    """
+    colunas = model.__table__.c
+    projetaveis = [nome for nome in schema.model_fields if nome in colunas]
+    parametros = []
+    for nome in filtraveis:
+        tipo = _tipo(colunas[nome])
+        parametros.append(pyinspect.Parameter(
+            nome, pyinspect.Parameter.KEYWORD_ONLY, annotation=Optional[List[tipo]],
+            default=Query(None, description=f"Filtra por {nome} (repita o parâmetro para vários valores)"),
+        ))
+        if tipo in (int, float):
+            for sufixo, descricao in (("min", "maior ou igual a"), ("max", "menor ou igual a")):
+                parametros.append(pyinspect.Parameter(
+                    f"{nome}_{sufixo}", pyinspect.Parameter.KEYWORD_ONLY, annotation=Optional[tipo],
+                    default=Query(None, description=f"{nome} {descricao}"),
+                ))
+    parametros.append(pyinspect.Parameter(
+        "sort", pyinspect.Parameter.KEYWORD_ONLY, annotation=Optional[str],
+        default=Query(None, description=f"Ordenação, ex.: -Nome,Id. Permitidos: {', '.join(filtraveis)}"),
+    ))
+    parametros.append(pyinspect.Parameter(
+        "fields", pyinspect.Parameter.KEYWORD_ONLY, annotation=Optional[str],
+        default=Query(None, description=f"Campos retornados, ex.: Id,Nome. Permitidos: {', '.join(projetaveis)}"),
+    ))
+    parametros.append(pyinspect.Parameter(
+        "ids", pyinspect.Parameter.KEYWORD_ONLY, annotation=Optional[str],
+        default=Query(None, description=f"Busca vários itens pelo Id numa consulta, ex.: 1,2,3 (até {LIMITE_LOTE})"),
+    ))
+
+    def parametros_lista(**valores) -> ParametrosLista:
+        condicoes = []
+        for nome in filtraveis:
+            coluna = colunas[nome]
+            if valores.get(nome):
+                lista = valores[nome]
+                condicoes.append(coluna == lista[0] if len(lista) == 1 else coluna.in_(lista))
+            if valores.get(f"{nome}_min") is not None:
+                condicoes.append(coluna >= valores[f"{nome}_min"])
+            if valores.get(f"{nome}_max") is not None:
+                condicoes.append(coluna <= valores[f"{nome}_max"])
+
+        ordem = []
+        for termo in _separar(valores["sort"]):
+            nome = termo.lstrip("-")
+            if nome not in filtraveis:
+                raise HTTPException(status_code=400, detail=f"Não é possível ordenar por '{nome}'")
+            ordem.append(colunas[nome].desc() if termo.startswith("-") else colunas[nome].asc())
+
+        campos = None
+        if valores["fields"] is not None:
+            pedidos = _separar(valores["fields"])
+            invalidos = [nome for nome in pedidos if nome not in projetaveis]
+            if invalidos:
+                raise HTTPException(status_code=400, detail=f"Campos inválidos em fields: {invalidos}")
+            # Ordem do schema, com Id sempre presente (usado pelo cursor)
+            campos = tuple(nome for nome in projetaveis if nome == "Id" or nome in pedidos)
+
+        ids = lista_ids(valores["ids"], LIMITE_LOTE) if valores["ids"] is not None else None
+        if ids:
+            condicoes.append(colunas["Id"].in_(ids))
+
+        return ParametrosLista(condicoes, ordem, campos, ids)
+
+    parametros_lista.__signature__ = pyinspect.Signature(parametros, return_annotation=ParametrosLista)
+    return parametros_lista
+
+
+def stmt_listagem(model, opcoes, parametros: ParametrosLista):
+    """SELECT da listagem: entidades com eager loading, ou só as colunas de fields"""
+    if parametros.campos:
+        stmt = select(*(getattr(model, nome) for nome in parametros.campos))
+    else:
+        stmt = select(model).options(*opcoes)
+    return stmt.where(*parametros.condicoes)
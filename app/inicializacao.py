@@ -0,0 +1,123 @@
+from contextlib import asynccontextmanager
+from app import database
+from app.busca import criar_indices_busca, detectar_indices_busca
+from app.config import settings
+from app.database import Base, SessionLocal, engine
+from app.eventos import detectar_registro_eventos, feed_eventos
+from app.models import (
+    RacasModel,
+    MagiasModel,
+    HabilidadesModel,
+    ClasseModel,
+    PersonagensModel,
+    AtributosModel,
+    EquipamentosModel,
+)
+from app.versoes import criar_contadores_versao, detectar_contadores_versao
+
+# Tabelas com índice de busca textual (FTS5)
+MODELS_BUSCA = [
+    RacasModel, MagiasModel, HabilidadesModel, ClasseModel,
+    AtributosModel, EquipamentosModel, PersonagensModel,
+]
+
+
+# ============================================================
+# PREPARAR O BANCO (MIGRAÇÕES, ÍNDICES DE BUSCA, VERSÕES, EVENTOS)
+# ============================================================
+# Todo o DDL fica aqui, fora do import da aplicação. Roda uma vez por
+# deploy (`python -m app.cli init-db`) ou no startup de um processo único.
+def preparar_banco(engine=engine):
+    """Aplica as migrações e cria os índices FTS e os contadores de versão"""
+    # Alembic só é importado quando há migração para rodar
+    from app.migracoes import atualizar_schema
+
+    atualizar_schema(engine)
+    criar_indices_busca(engine, MODELS_BUSCA)
+    criar_contadores_versao(engine, Base.metadata.tables)
+    detectar_registro_eventos(engine)
+
+
+def ativar_banco(engine=engine):
+    """Em cada worker: só lê o que preparar_banco já criou (nenhum DDL)"""
+    detectar_indices_busca(engine, MODELS_BUSCA)
+    detectar_contadores_versao(engine)
+    detectar_registro_eventos(engine)
+
+
+# ============================================================
+# DADOS INICIAIS
+# ============================================================
+def popular_dados(db):
+    """Insere raças, magias, habilidades, classes, equipamentos e personagens de exemplo.
+
+    Retorna False sem alterar nada se o banco já tiver dados.
+    """
+    if db.query(RacasModel).first():
+        return False  # evita duplicar dados
+
+    # Raças
+    r1 = RacasModel(Nome="Humano", Passiva="Adaptação rápida", Caracteristica="Versátil")
+    r2 = RacasModel(Nome="Elfo", Passiva="Visão aguçada", Caracteristica="Alta destreza")
+    db.add_all([r1, r2])
+    db.commit()
+
+    # Magias
+    m1 = MagiasModel(Nome="Bola de Fogo", Descricao="Dano em área")
+    m2 = MagiasModel(Nome="Cura", Descricao="Restaura PV")
+    db.add_all([m1, m2])
+    db.commit()
+
+    # Habilidades
+    h1 = HabilidadesModel(Nome="Ataque Poderoso", Descricao="Golpe físico")
+    h2 = HabilidadesModel(Nome="Furtividade", Descricao="Movimento silencioso")
+    db.add_all([h1, h2])
+    db.commit()
+
+    # Classes
+    c1 = ClasseModel(Nome="Guerreiro", Descricao="Combate corpo a corpo", Habilidades_id=h1.Id)
+    c2 = ClasseModel(Nome="Mago", Descricao="Especialista em magia", Habilidades_id=h2.Id, Magias_id=m1.Id)
+    db.add_all([c1, c2])
+    db.commit()
+
+    # Atributos
+    a1 = AtributosModel(Nome="Força", Descricao="Poder físico", Quantidade=15, Personagem_id=1)
+    a2 = AtributosModel(Nome="Inteligência", Descricao="Poder mágico", Quantidade=18, Personagem_id=2)
+
+    # Equipamentos
+    e1 = EquipamentosModel(Nome="Espada Longa", Descricao="Corte afiado", Bonus=3)
+    e2 = EquipamentosModel(Nome="Cajado", Descricao="Conduz magia", Bonus=2)
+    db.add_all([e1, e2])
+    db.commit()
+
+    # Personagens
+    p1 = PersonagensModel(Nome="Arthas", Historia="Herói do reino", Tendencia="Leal Bom", Raca_id=r1.Id, Classe_id=c1.Id, Equipamento_id=e1.Id, atributos=[a1])
+    p2 = PersonagensModel(Nome="Elrond", Historia="Elfo sábio", Tendencia="Neutro Bom", Raca_id=r2.Id, Classe_id=c2.Id, Equipamento_id=e2.Id, atributos=[a2])
+    db.add_all([p1, p2])
+    db.commit()
+    return True
+
+
+def inicializar(seed: bool = True):
+    """Prepara o banco e, se pedido, popula os dados iniciais"""
+    preparar_banco()
+    if seed:
+        with SessionLocal() as db:
+            popular_dados(db)
+
+
+# ============================================================
+# LIFESPAN DA APLICAÇÃO
+# ============================================================
+@asynccontextmanager
+async def lifespan(app):
+    """Startup/shutdown: com RPG_INICIALIZAR_BANCO=false (vários workers) não há DDL nem seed"""
+    if settings.inicializar_banco:
+        inicializar(seed=True)
+    else:
+        ativar_banco()
+    yield
+    await feed_eventos.encerrar()
+    engine.dispose()
+    if database.async_engine is not None:
+        await database.async_engine.dispose()
@@ -0,0 +1,251 @@
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Generic, List, Optional, TypeVar, Union, get_args, get_origin
+from fastapi import APIRouter, HTTPException, Depends, Body, Response
+from pydantic import BaseModel, ValidationError, create_model
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from app.carregamento import opcoes_carregamento
+from app.concorrencia import COLUNAS_CONTROLE
+from app.database import Base, get_db
+from app.serializacao import para_json, resposta_json
+
+T = TypeVar("T")
+
+# Quantidade máxima de itens aceitos por requisição de lote
+LIMITE_LOTE = 10000
+
+
+# ============================================================
+# SCHEMAS DE RESPOSTA
+# ============================================================
+class ErroLote(BaseModel):
+    indice: int
+    Id: Optional[int] = None
+    detail: Any
+
+
+class ResultadoLote(BaseModel, Generic[T]):
+    itens: List[T]
+    erros: List[ErroLote] = []
+
+
+class ResultadoDelecaoLote(BaseModel):
+    deletados: List[int]
+    erros: List[ErroLote] = []
+
+
+# ============================================================
+# FUNÇÕES AUXILIARES
+# ============================================================
+def campos_coluna(model, schema) -> List[str]:
+    """Campos do schema que são colunas da tabela (sem Id/Versao e sem relationships)"""
+    colunas = model.__table__.c
+    return [nome for nome in schema.model_fields if nome in colunas and nome not in COLUNAS_CONTROLE]
+
+
+def _sem_none(anotacao):
+    """Optional[X] -> X"""
+    if get_origin(anotacao) is Union:
+        argumentos = tuple(argumento for argumento in get_args(anotacao) if argumento is not type(None))
+        return argumentos[0] if len(argumentos) == 1 else Union[argumentos]
+    return anotacao
+
+
+@lru_cache(maxsize=None)
+def schema_parcial(model, schema):
+    """Versão do schema com todas as colunas opcionais, para atualizações parciais.
+
+    Todo campo pode faltar (o default None não é validado e some no
+    exclude_unset), mas null explícito só passa onde o schema o aceita e a
+    coluna não é NOT NULL; nos outros vira 422, não IntegrityError.
+    """
+    colunas = model.__table__.c
+    campos = {}
+    for nome in campos_coluna(model, schema):
+        anotacao = schema.model_fields[nome].annotation
+        campos[nome] = (anotacao if colunas[nome].nullable else _sem_none(anotacao), None)
+    return create_model(f"{schema.__name__}Parcial", **campos)
+
+
+def _erros_validacao(erro: ValidationError):
+    return [{"loc": e["loc"], "msg": e["msg"], "type": e["type"]} for e in erro.errors()]
+
+
+def stmts_dependencias(model, ids: List[int]) -> list:
+    """Faz em SQL o que o ORM faria ao deletar cada objeto.
+
+    Linhas de tabelas de associação e filhos obrigatórios (ex.: Atributos)
+    são removidos; chaves estrangeiras opcionais (ex.: Raca_id) viram NULL.
+    """
+    tabela_alvo = model.__table__
+    stmts = []
+    for tabela in Base.metadata.sorted_tables:
+        for fk in tabela.foreign_keys:
+            if fk.column.table is not tabela_alvo:
+                continue
+            coluna = fk.parent
+            if coluna.primary_key or not coluna.nullable:
+                stmts.append(delete(tabela).where(coluna.in_(ids)))
+            else:
+                valores = {coluna.name: None}
+                if "Versao" in tabela.c:
+                    valores["Versao"] = tabela.c.Versao + 1
+                stmts.append(update(tabela).where(coluna.in_(ids)).values(valores))
+    return stmts
+
+
+def limpar_dependencias(db: Session, model, ids: List[int]):
+    """Executa stmts_dependencias na transação da sessão"""
+    for stmt in stmts_dependencias(model, ids):
+        db.execute(stmt)
+
+
+def _carregar_por_ids(db: Session, model, opcoes, ids: List[int]) -> list:
+    if not ids:
+        return []
+    itens = db.query(model).options(*opcoes).filter(model.Id.in_(ids)).all()
+    por_id = {item.Id: item for item in itens}
+    return [por_id[i] for i in ids if i in por_id]
+
+
+def _id_valido(item_id) -> bool:
+    # bool é subclasse de int: true não pode virar Id=1
+    return isinstance(item_id, int) and not isinstance(item_id, bool)
+
+
+def _checar_tamanho(itens: list):
+    if len(itens) > LIMITE_LOTE:
+        raise HTTPException(status_code=413, detail=f"Máximo de {LIMITE_LOTE} itens por lote")
+
+
+@contextmanager
+def _integridade(db: Session):
+    """IntegrityError (NOT NULL, FK, UNIQUE) no lote vira rollback + 409, não 500"""
+    try:
+        yield
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Lote rejeitado: {e.orig}")
+
+
+def _commit(db: Session):
+    with _integridade(db):
+        db.commit()
+
+
+# ============================================================
+# ROTAS DE LOTE
+# ============================================================
+def criar_router_lote(model, schema, prefix: str):
+    """POST/PATCH/DELETE /{prefix}/bulk: várias linhas em uma única transação.
+
+    Cada item é validado separadamente; os inválidos voltam em "erros" e os
+    válidos são gravados com um único INSERT/UPDATE em lote (executemany).
+    """
+    router = APIRouter(prefix=f"/{prefix}")
+    opcoes = opcoes_carregamento(model, schema)
+    colunas = campos_coluna(model, schema)
+    parcial = schema_parcial(model, schema)
+    resultado = ResultadoLote[schema]
+
+    @router.post("/bulk", response_model=ResultadoLote[schema])
+    def criar_lote(itens: List[Dict[str, Any]] = Body(...), db: Session = Depends(get_db)):
+        _checar_tamanho(itens)
+        erros, linhas = [], []
+        for indice, bruto in enumerate(itens):
+            try:
+                item = schema.model_validate({"Id": 0, **bruto})
+            except ValidationError as e:
+                erros.append(ErroLote(indice=indice, detail=_erros_validacao(e)))
+                continue
+            linhas.append(item.model_dump(include=set(colunas)))
+
+        if not linhas:
+            return resposta_json(resultado, {"itens": [], "erros": erros}, lista=False)
+        # INSERT ... RETURNING em lote: as linhas criadas já voltam do banco
+        with _integridade(db):
+            criados = db.scalars(insert(model).returning(model), linhas).all()
+        if opcoes:
+            # Schemas com relações aninhadas: recarrega com eager loading após o commit
+            ids = [item.Id for item in criados]
+            _commit(db)
+            return resposta_json(resultado, {"itens": _carregar_por_ids(db, model, opcoes, ids), "erros": erros}, lista=False)
+        # Sem relações: serializa antes do commit, que expira os objetos
+        corpo = para_json(resultado, {"itens": criados, "erros": erros}, lista=False)
+        _commit(db)
+        return Response(content=corpo, media_type="application/json")
+
+    @router.patch("/bulk", response_model=ResultadoLote[schema])
+    def atualizar_lote(itens: List[Dict[str, Any]] = Body(...), db: Session = Depends(get_db)):
+        _checar_tamanho(itens)
+        # O mesmo Id duas vezes faria o executemany esbarrar na própria Versao (StaleDataError)
+        contagem = Counter(bruto.get("Id") for bruto in itens if _id_valido(bruto.get("Id")))
+        repetidos = sorted(item_id for item_id, vezes in contagem.items() if vezes > 1)
+        if repetidos:
+            raise HTTPException(status_code=400, detail=f"Ids repetidos no lote: {repetidos}")
+        erros, validos = [], []
+        for indice, bruto in enumerate(itens):
+            item_id = bruto.get("Id")
+            if not _id_valido(item_id):
+                erros.append(ErroLote(indice=indice, detail="Id obrigatório"))
+                continue
+            try:
+                # null em coluna NOT NULL falha aqui, só neste item (schema_parcial)
+                campos = parcial.model_validate(bruto).model_dump(exclude_unset=True)
+            except ValidationError as e:
+                erros.append(ErroLote(indice=indice, Id=item_id, detail=_erros_validacao(e)))
+                continue
+            validos.append((indice, bruto.get("Versao"), {"Id": item_id, **campos}))
+
+        # Uma única query IN para descobrir quais Ids existem e a Versao de cada um
+        existentes = dict(db.execute(
+            select(model.Id, model.Versao).where(model.Id.in_([linha["Id"] for _, _, linha in validos]))
+        ).all())
+        linhas, ids = [], []
+        for indice, esperada, linha in validos:
+            atual = existentes.get(linha["Id"])
+            if atual is None:
+                erros.append(ErroLote(indice=indice, Id=linha["Id"], detail=f"{prefix} não encontrado"))
+            elif esperada is not None and esperada != atual:
+                erros.append(ErroLote(indice=indice, Id=linha["Id"], detail=f"Versao {esperada} desatualizada (atual: {atual})"))
+            else:
+                ids.append(linha["Id"])
+                if len(linha) > 1:
+                    # Com a Versao na linha o ORM inclui "AND Versao = ?" e a incrementa
+                    linhas.append({**linha, "Versao": atual})
+
+        if linhas:
+            # UPDATE em lote pela chave primária (executemany)
+            try:
+                with _integridade(db):
+                    db.execute(update(model), linhas)
+            except StaleDataError:
+                db.rollback()
+                raise HTTPException(status_code=409, detail="Itens alterados por outra requisição durante o lote; tente de novo")
+            _commit(db)
+        erros.sort(key=lambda erro: erro.indice)
+        return resposta_json(resultado, {"itens": _carregar_por_ids(db, model, opcoes, ids), "erros": erros}, lista=False)
+
+    @router.delete("/bulk", response_model=ResultadoDelecaoLote)
+    def deletar_lote(ids: List[int] = Body(...), db: Session = Depends(get_db)):
+        _checar_tamanho(ids)
+        # Id repetido conta uma vez só (com o índice da primeira ocorrência)
+        indices = {}
+        for indice, item_id in enumerate(ids):
+            indices.setdefault(item_id, indice)
+        with _integridade(db):
+            limpar_dependencias(db, model, list(indices))
+            deletados = set(db.scalars(delete(model).where(model.Id.in_(list(indices))).returning(model.Id)))
+        _commit(db)
+        erros = [
+            ErroLote(indice=indice, Id=item_id, detail=f"{prefix} não encontrado")
+            for item_id, indice in indices.items()
+            if item_id not in deletados
+        ]
+        return resposta_json(ResultadoDelecaoLote, {"deletados": [i for i in indices if i in deletados], "erros": erros}, lista=False)
+
+    return router
@@ -1,19 +1,48 @@
-from typing import List, Optional
-from fastapi import FastAPI, HTTPException, Depends, Query, Body
+from typing import List, Optional, Sequence
+from fastapi import FastAPI, HTTPException, Depends, Query, Body, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from sqlalchemy import create_engine, Column, Integer, String, Text, ForeignKey
-from sqlalchemy.orm import declarative_base, sessionmaker, relationship, Session
-
-# ============================================================
-# CONFIGURAÇÃO DO BANCO
-# ============================================================
-DATABASE_URL = "sqlite:///./sistema_rpg.db"
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
-
-app = FastAPI(title="RPG API Completa + CRUD + Busca")
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session
+from app.config import settings
+# Engine e sessões compartilhadas com os routers (configuradas em app.config)
+from app.database import SessionLocal, get_db
+from app.models import (
+    RacasModel,
+    MagiasModel,
+    HabilidadesModel,
+    ClasseModel,
+    PersonagensModel,
+    AtributosModel,
+    EquipamentosModel,
+)
+from app.schemas import (
+    AtributoSchema,
+    ClasseSchema,
+    EquipamentoSchema,
+    HabilidadeSchema,
+    HabilidadeUpdateSchema,
+    MagiaSchema,
+    MagiaUpdateSchema,
+    PersonagemUpdateSchema,
+    RacaSchema,
+)
+from app import busca
+from app.cache import cache_respostas, resposta_em_cache, guardar_resposta
+from app.carregamento import opcoes_carregamento, tabelas_dependentes
+from app.concorrencia import COLUNAS_CONTROLE, atualizar_versionado, excluir_versionado, versoes_aceitas
+from app.lote import criar_router_lote, limpar_dependencias, schema_parcial
+from app.filtros import ParametrosLista, colunas_filtraveis, criar_parametros_lista, stmt_listagem
+from app.paginacao import LIMITE_MAXIMO, aplicar_cursor, cortar_pagina, cabecalhos_paginacao, resposta_ndjson
+from app.serializacao import RespostaPadrao, para_json, resposta_json
+from app.inicializacao import lifespan
+from app.metricas import MiddlewareMetricas, registro_metricas
+from app.compressao import MiddlewareCompressao
+from app.versoes import etag_item, etag_tabelas, nao_modificado, cabecalhos_etag
+
+# Rotas que retornam dicts (ex.: {"detail": ...}) usam orjson quando instalado.
+# Migrações e seed rodam no lifespan (app.inicializacao), nunca no import.
+app = FastAPI(title="RPG API Completa + CRUD + Busca", default_response_class=RespostaPadrao, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,189 +51,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ============================================================
-# MODELOS SQLALCHEMY
-# ============================================================
-class RacasModel(Base):
-    __tablename__ = "Racas"
-    Id = Column(Integer, primary_key=True, index=True)
-    Nome = Column(String, nullable=False)
-    Passiva = Column(Text)
-    Caracteristica = Column(Text)
-    personagens = relationship("PersonagensModel", back_populates="raca")
-
-
-class MagiasModel(Base):
-    __tablename__ = "Magias"
-    Id = Column(Integer, primary_key=True, index=True)
-    Nome = Column(String, nullable=False)
-    Descricao = Column(Text)
-    Categoria = Column(String)
-    Nivel = Column(Integer)
-    Icone = Column(String)
-    CustoMana = Column(Integer)
-    Cooldown = Column(Integer)
-    Efeito = Column(Text)
-
-
-class HabilidadesModel(Base):
-    __tablename__ = "Habilidades"
-    Id = Column(Integer, primary_key=True, index=True)
-    Nome = Column(String, nullable=False)
-    Descricao = Column(Text)
-    Tipo = Column(String)
-    Cooldown = Column(Integer)
-    Icone = Column(String)
-    Efeito = Column(Text)
-    Dano = Column(Integer)
-
-
-class ClasseModel(Base):
-    __tablename__ = "Classe"
-    Id = Column(Integer, primary_key=True, index=True)
-    Nome = Column(String, nullable=False)
-    Descricao = Column(Text)
-    Habilidades_id = Column(Integer, ForeignKey("Habilidades.Id"), nullable=True)
-    Magias_id = Column(Integer, ForeignKey("Magias.Id"), nullable=True)
-
-    habilidades = relationship("HabilidadesModel")
-    magias = relationship("MagiasModel")
-    personagens = relationship("PersonagensModel", back_populates="classe")
-
-
-class PersonagensModel(Base):
-    __tablename__ = "Personagens"
-    Id = Column(Integer, primary_key=True, index=True)
-    Nome = Column(String, nullable=False)
-    Historia = Column(Text)
-    Tendencia = Column(String)
-    Level = Column(Integer, default=1)
-    # Novos status
-    Vida = Column(Integer, default=100)
-    Forca = Column(Integer, default=10)
-    Destreza = Column(Integer, default=10)
-    Constituicao = Column(Integer, default=10)
-    Inteligencia = Column(Integer, default=10)
-    Sabedoria = Column(Integer, default=10)
-    Mana = Column(Integer, default=100)
-    Carisma = Column(Integer, default=10)
-    Sorte = Column(Integer, default=10)
-    Reputacao = Column(Integer, default=0)
-    CA = Column(Integer, default=10)  # Classe de Armadura
-    Deslocamento = Column(Integer, default=30)  # Velocidade de movimento
-    Classe_Nome = Column(String, default="Guerreiro")  # Nome da classe do personagem
-    Raca_Nome = Column(String, default="Humano")  # Nome da raça do personagem
-    Raca_id = Column(Integer, ForeignKey("Racas.Id"), nullable=True)
-    Classe_id = Column(Integer, ForeignKey("Classe.Id"), nullable=True)
-    Equipamento_id = Column(Integer, ForeignKey("Equipamentos.Id"), nullable=True)
-
-    raca = relationship("RacasModel", back_populates="personagens")
-    classe = relationship("ClasseModel", back_populates="personagens")
-    equipamento = relationship("EquipamentosModel", back_populates="personagens")
-    atributos = relationship(
-        "AtributosModel",
-        back_populates="personagem",
-        cascade="all, delete-orphan",
-        uselist=True
-    )
-
-
-class AtributosModel(Base):
-    __tablename__ = "Atributos"
-    Id = Column(Integer, primary_key=True, index=True)
-    Personagem_id = Column(Integer, ForeignKey("Personagens.Id"), nullable=False)
-    Nome = Column(String, nullable=False)
-    Descricao = Column(Text)
-    Quantidade = Column(Integer)
-
-    personagem = relationship(
-        "PersonagensModel",
-        back_populates="atributos",
-        uselist=False
-    )
-
-
-class EquipamentosModel(Base):
-    __tablename__ = "Equipamentos"
-    Id = Column(Integer, primary_key=True, index=True)
-    Nome = Column(String, nullable=False)
-    Descricao = Column(Text)
-    Tipo = Column(String)  # weapon, armor, accessory, consumable, tool
-    Raridade = Column(String)  # common, uncommon, rare, epic, legendary
-    Icone = Column(String)
-    Ataque = Column(Integer)
-    Defesa = Column(Integer)
-    Bonus = Column(Integer)
-    Peso = Column(Integer)
-
-    personagens = relationship("PersonagensModel", back_populates="equipamento")
+# gzip/br/zstd conforme o Accept-Encoding (dentro das métricas: a latência inclui a compressão)
+if settings.compressao_habilitada:
+    app.add_middleware(MiddlewareCompressao)
 
+# Latência por rota, consultas SQL por requisição e avisos de N+1 (/metrics)
+if settings.metricas_habilitadas:
+    app.add_middleware(MiddlewareMetricas)
 
 # ============================================================
 # SCHEMAS PYDANTIC
 # ============================================================
-class MagiaSchema(BaseModel):
-    Id: int
-    Nome: str
-    Descricao: Optional[str] = None
-    Categoria: Optional[str] = None
-    Nivel: Optional[int] = None
-    Icone: Optional[str] = None
-    CustoMana: Optional[int] = None
-    Cooldown: Optional[int] = None
-    Efeito: Optional[str] = None
-    model_config = {"from_attributes": True}
-
-
-class HabilidadeSchema(BaseModel):
-    Id: int
-    Nome: str
-    Descricao: Optional[str] = None
-    Tipo: Optional[str] = None
-    Cooldown: Optional[int] = None
-    Icone: Optional[str] = None
-    Efeito: Optional[str] = None
-    Dano: Optional[int] = None
-    model_config = {"from_attributes": True}
-
-
-class RacaSchema(BaseModel):
-    Id: int
-    Nome: str
-    Passiva: Optional[str] = None
-    Caracteristica: Optional[str] = None
-    model_config = {"from_attributes": True}
-
-
-class ClasseSchema(BaseModel):
-    Id: int
-    Nome: str
-    Descricao: Optional[str] = None
-    habilidades: Optional[HabilidadeSchema] = None
-    magias: Optional[MagiaSchema] = None
-    model_config = {"from_attributes": True}
-
-
-class AtributoSchema(BaseModel):
-    Id: int
-    Nome: str
-    Descricao: Optional[str] = None
-    Quantidade: int
-    model_config = {"from_attributes": True}
-
-
-class EquipamentoSchema(BaseModel):
-    Id: int
-    Nome: str
-    Descricao: Optional[str] = None
-    Tipo: Optional[str] = None
-    Raridade: Optional[str] = None
-    Icone: Optional[str] = None
-    Ataque: Optional[int] = None
-    Defesa: Optional[int] = None
-    Bonus: Optional[int] = None
-    Peso: Optional[int] = None
-    model_config = {"from_attributes": True}
+# Magia, habilidade, raça, classe, atributo e equipamento vêm de app.schemas,
+# os mesmos usados pelos routers de associações no modo síncrono
 
 
 class PersonagemSchema(BaseModel):
@@ -234,66 +93,148 @@ class PersonagemSchema(BaseModel):
     atributos: Optional[List[AtributoSchema]] = None
     magias: Optional[List[MagiaSchema]] = None
     habilidades: Optional[List[HabilidadeSchema]] = None
+    Versao: Optional[int] = None
     model_config = {"from_attributes": True}
 
 
-# ============================================================
-# DEPENDÊNCIA DE BANCO
-# ============================================================
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+class FichaSchema(PersonagemSchema):
+    """Personagem com tudo que a tela de detalhe mostra, inclusive a coleção de equipamentos"""
+    equipamentos: Optional[List[EquipamentoSchema]] = None
 
 
 # ============================================================
-# CRIAR TABELAS
+# FUNÇÃO GENÉRICA CRUD + BUSCA
 # ============================================================
-Base.metadata.create_all(bind=engine)
+def criar_rotas_crud(
+    model, schema, prefix: str, cacheavel: bool = False, filtros: Optional[Sequence[str]] = None, schema_patch=None,
+):
+    opcoes = opcoes_carregamento(model, schema)
+    tabelas = tabelas_dependentes(model, schema)
+    # Whitelist de filtros/ordenação da listagem (padrão: colunas do schema, exceto textos longos)
+    parametros_lista = criar_parametros_lista(model, schema, filtros or colunas_filtraveis(model, schema))
+    # Relationships não são colunas e Id/Versao são controlados pelo banco:
+    # ficam de fora ao criar/atualizar
+    campos_relacao = set(inspect(model).relationships.keys()) | COLUNAS_CONTROLE
+    # Corpo do PATCH: só colunas, todas opcionais
+    schema_patch = schema_patch or schema_parcial(model, schema)
+
+    def carregar(db: Session, item_id: int):
+        return db.query(model).options(*opcoes).filter(model.Id == item_id).first()
+
+    def responder_item(db: Session, db_item) -> Response:
+        # ETag do próprio registro: é o que o cliente devolve no If-Match
+        etag = etag_item(db_item.Versao, etag_tabelas(db, tabelas))
+        return Response(content=para_json(schema, db_item, lista=False), media_type="application/json", headers=cabecalhos_etag(etag))
+
+    def responder_atualizado(db: Session, db_item):
+        # Sem relações na resposta, a linha do RETURNING já basta: serializa
+        # antes do commit, que expira o objeto
+        if not opcoes:
+            resposta = responder_item(db, db_item)
+            db.commit()
+            return resposta
+        db.commit()
+        return responder_item(db, carregar(db, db_item.Id))
 
+    # /{prefix}/bulk precisa ser registrado antes de /{prefix}/{item_id}
+    app.include_router(criar_router_lote(model, schema, prefix))
 
-# ============================================================
-# FUNÇÃO GENÉRICA CRUD + BUSCA
-# ============================================================
-def criar_rotas_crud(model, schema, prefix: str):
     @app.get(f"/{prefix}/", response_model=List[schema])
-    def listar(db: Session = Depends(get_db)):
-        return db.query(model).all()
+    def listar(
+        request: Request,
+        limit: Optional[int] = Query(None, ge=1, le=LIMITE_MAXIMO, description="Quantidade máxima de itens por página"),
+        after: Optional[int] = Query(None, description="Cursor: retorna itens com Id maior que este"),
+        stream: bool = Query(False, description="Transmite todos os itens em NDJSON"),
+        parametros: ParametrosLista = Depends(parametros_lista),
+        db: Session = Depends(get_db),
+    ):
+        parametros.conferir(limit, after, stream)
+        if stream:
+            return resposta_ndjson(SessionLocal, model, schema, after, opcoes, parametros.condicoes)
+        etag = etag_tabelas(db, tabelas)
+        if resposta := nao_modificado(request, etag):
+            return resposta
+        if cacheavel and (em_cache := resposta_em_cache(request, etag)):
+            return em_cache
+        stmt = aplicar_cursor(stmt_listagem(model, opcoes, parametros), model, limit, after, parametros.ordem)
+        # Com fields o SELECT traz só colunas (Row), sem montar entidades
+        resultado = db.execute(stmt) if parametros.campos else db.scalars(stmt)
+        itens, proximo = cortar_pagina(parametros.ordenar(resultado.all()), limit)
+        cabecalhos = {**cabecalhos_paginacao(request, None if parametros.ordem else proximo), **cabecalhos_etag(etag)}
+        corpo = para_json(parametros.schema_resposta(schema), itens)
+        if cacheavel:
+            return guardar_resposta(request, corpo, tabelas, cabecalhos)
+        return Response(content=corpo, media_type="application/json", headers=cabecalhos)
 
     @app.get(f"/{prefix}/search", response_model=List[schema])
-    def buscar(nome: str = Query(..., description=f"Buscar {prefix} por nome"), db: Session = Depends(get_db)):
-        return db.query(model).filter(model.Nome.ilike(f"%{nome}%")).all()
+    def buscar(
+        request: Request,
+        nome: str = Query(..., description=f"Buscar {prefix} por nome ou texto (prefixos, ordenado por relevância)"),
+        limit: int = Query(100, ge=1, le=LIMITE_MAXIMO, description="Quantidade máxima de resultados"),
+        db: Session = Depends(get_db),
+    ):
+        etag = etag_tabelas(db, tabelas)
+        if resposta := nao_modificado(request, etag):
+            return resposta
+        if cacheavel and (em_cache := resposta_em_cache(request, etag)):
+            return em_cache
+        itens = busca.buscar(db, model, nome, limit, opcoes)
+        if cacheavel:
+            return guardar_resposta(request, para_json(schema, itens), tabelas, cabecalhos_etag(etag))
+        return resposta_json(schema, itens, cabecalhos=cabecalhos_etag(etag))
+
+    @app.get(f"/{prefix}/{{item_id}}", response_model=schema)
+    def obter(item_id: int, request: Request, db: Session = Depends(get_db)):
+        # ETag = Versao da linha + versões das tabelas, sem carregar o registro:
+        # com If-None-Match, o 304 custa só essas duas leituras
+        versao_tabelas = etag_tabelas(db, tabelas)
+        if request.headers.get("if-none-match"):
+            versao = db.scalar(select(model.Versao).where(model.Id == item_id))
+            if versao is None:
+                raise HTTPException(status_code=404, detail=f"{prefix} não encontrado")
+            if resposta := nao_modificado(request, etag_item(versao, versao_tabelas)):
+                return resposta
+        if cacheavel and (em_cache := resposta_em_cache(request, versao_tabelas)):
+            return em_cache
+        db_item = carregar(db, item_id)
+        if not db_item:
+            raise HTTPException(status_code=404, detail=f"{prefix} não encontrado")
+        corpo = para_json(schema, db_item, lista=False)
+        etag = etag_item(db_item.Versao, versao_tabelas)
+        if cacheavel:
+            return guardar_resposta(request, corpo, tabelas, cabecalhos_etag(etag), versao=versao_tabelas)
+        return Response(content=corpo, media_type="application/json", headers=cabecalhos_etag(etag))
 
     @app.post(f"/{prefix}/", response_model=schema)
     def criar(item: schema = Body(...), db: Session = Depends(get_db)):
         # Excluir Id e relationships ao criar um novo item
-        item_data = item.model_dump(exclude={'Id', 'magias', 'habilidades', 'equipamentos', 'atributos', 'raca', 'classe', 'equipamento', 'personagens', 'personagens_equipados'})
+        item_data = item.model_dump(exclude=campos_relacao)
         db_item = model(**item_data)
         db.add(db_item)
         db.commit()
-        db.refresh(db_item)
-        return db_item
+        return responder_item(db, carregar(db, db_item.Id))
 
     @app.put(f"/{prefix}/{{item_id}}", response_model=schema)
-    def atualizar(item_id: int, item: schema = Body(...), db: Session = Depends(get_db)):
-        db_item = db.query(model).filter(model.Id == item_id).first()
-        if not db_item:
-            raise HTTPException(status_code=404, detail=f"{prefix} não encontrado")
-        # Excluir Id e só atualizar campos enviados
-        for key, value in item.model_dump(exclude={'Id'}, exclude_unset=True).items():
-            setattr(db_item, key, value)
-        db.commit()
-        db.refresh(db_item)
-        return db_item
+    def atualizar(item_id: int, request: Request, item: schema = Body(...), db: Session = Depends(get_db)):
+        versoes = versoes_aceitas(request)
+        # Um único UPDATE ... RETURNING (com a Versao do If-Match no WHERE), sem
+        # SELECT antes; só os campos enviados, sem Id/Versao/relationships
+        valores = item.model_dump(exclude=campos_relacao, exclude_unset=True)
+        return responder_atualizado(db, atualizar_versionado(db, model, item_id, valores, versoes, prefix))
+
+    @app.patch(f"/{prefix}/{{item_id}}", response_model=schema)
+    def atualizar_parcial(item_id: int, request: Request, item: schema_patch = Body(...), db: Session = Depends(get_db)):
+        versoes = versoes_aceitas(request)
+        valores = item.model_dump(exclude=COLUNAS_CONTROLE, exclude_unset=True)
+        return responder_atualizado(db, atualizar_versionado(db, model, item_id, valores, versoes, prefix))
 
     @app.delete(f"/{prefix}/{{item_id}}")
-    def deletar(item_id: int, db: Session = Depends(get_db)):
-        db_item = db.query(model).filter(model.Id == item_id).first()
-        if not db_item:
-            raise HTTPException(status_code=404, detail=f"{prefix} não encontrado")
-        db.delete(db_item)
+    def deletar(item_id: int, request: Request, db: Session = Depends(get_db)):
+        versoes = versoes_aceitas(request)
+        # Dependentes em SQL (associações, atributos, FKs opcionais) e um DELETE ... RETURNING,
+        # sem carregar o objeto e as coleções como o db.delete do ORM
+        limpar_dependencias(db, model, [item_id])
+        excluir_versionado(db, model, item_id, versoes, prefix)
         db.commit()
         return {"detail": f"{prefix} deletado"}
 
@@ -301,95 +242,118 @@ def criar_rotas_crud(model, schema, prefix: str):
 # ============================================================
 # CRIAR ROTAS CRUD AUTOMÁTICAS
 # ============================================================
-criar_rotas_crud(RacasModel, RacaSchema, "racas")
-criar_rotas_crud(MagiasModel, MagiaSchema, "magias")
-criar_rotas_crud(HabilidadesModel, HabilidadeSchema, "habilidades")
-criar_rotas_crud(ClasseModel, ClasseSchema, "classes")
-criar_rotas_crud(AtributosModel, AtributoSchema, "atributos")
-criar_rotas_crud(EquipamentosModel, EquipamentoSchema, "equipamentos")
-criar_rotas_crud(PersonagensModel, PersonagemSchema, "personagens")
+# Catálogos mudam pouco: respostas de leitura ficam no cache em memória
+CATALOGOS = {"racas", "magias", "habilidades", "classes", "equipamentos"}
+
+RECURSOS = [
+    (RacasModel, RacaSchema, "racas"),
+    (MagiasModel, MagiaSchema, "magias"),
+    (HabilidadesModel, HabilidadeSchema, "habilidades"),
+    (ClasseModel, ClasseSchema, "classes"),
+    (AtributosModel, AtributoSchema, "atributos"),
+    (EquipamentosModel, EquipamentoSchema, "equipamentos"),
+    (PersonagensModel, PersonagemSchema, "personagens"),
+]
+
+# Corpo do PATCH /{recurso}/{id}; os demais usam o schema com todas as colunas opcionais
+SCHEMAS_PATCH = {
+    "magias": MagiaUpdateSchema,
+    "habilidades": HabilidadeUpdateSchema,
+    "personagens": PersonagemUpdateSchema,
+}
 
 # ============================================================
-# INCLUIR ROUTER DE MAGIAS E HABILIDADES DE PERSONAGENS
+# STATUS DERIVADOS DE COMBATE
 # ============================================================
-try:
-    from app.routers.personagens_magias_habilidades import router as personagens_magias_habilidades_router
-    app.include_router(personagens_magias_habilidades_router)
-    print("✅ Router de personagens_magias_habilidades carregado com sucesso!")
-except ImportError as e:
-    print(f"❌ Erro ao carregar router de personagens_magias_habilidades: {e}")
-except Exception as e:
-    print(f"❌ Erro inesperado ao carregar router: {e}")
+# Antes do CRUD: /personagens/derived não pode cair em /personagens/{item_id}.
+# Só leitura com a sessão síncrona, igual nos dois modos.
+from app.routers.combate import router as combate_router
+app.include_router(combate_router)
 
 # ============================================================
-# INCLUIR ROUTER DE EQUIPAMENTOS DE PERSONAGENS
+# FICHA E PACOTE DO PERSONAGEM (/personagens/{id}/sheet, /personagens/bundle)
 # ============================================================
-try:
+# Projeção desnormalizada mantida por triggers (migração 0006); só leitura
+# com a sessão síncrona, igual nos dois modos. Antes do CRUD pelo mesmo
+# motivo do combate: /personagens/bundle não pode cair em /personagens/{item_id}.
+from app.routers.fichas import criar_router_fichas
+app.include_router(criar_router_fichas(FichaSchema))
+
+if settings.modo_async:
+    # ============================================================
+    # MODO ASSÍNCRONO: CRUD E ASSOCIAÇÕES COM AsyncSession
+    # ============================================================
+    from app.routers.assincrono import criar_router_crud_async, criar_router_associacoes_async
+
+    for model, schema, prefix in RECURSOS:
+        app.include_router(criar_router_lote(model, schema, prefix))
+        app.include_router(criar_router_crud_async(
+            model, schema, prefix, cacheavel=prefix in CATALOGOS, schema_patch=SCHEMAS_PATCH.get(prefix),
+        ))
+    app.include_router(criar_router_associacoes_async(MagiaSchema, HabilidadeSchema, EquipamentoSchema))
+    print("✅ Rotas assíncronas carregadas com sucesso!")
+else:
+    for model, schema, prefix in RECURSOS:
+        criar_rotas_crud(model, schema, prefix, cacheavel=prefix in CATALOGOS, schema_patch=SCHEMAS_PATCH.get(prefix))
+
+    # ============================================================
+    # MAGIAS, HABILIDADES E EQUIPAMENTOS DE PERSONAGENS
+    # ============================================================
+    from app.routers.personagens_magias_habilidades import router as personagens_magias_habilidades_router
     from app.routers.personagens_equipamentos import router as personagens_equipamentos_router
+
+    app.include_router(personagens_magias_habilidades_router)
     app.include_router(personagens_equipamentos_router)
-    print("✅ Router de personagens_equipamentos carregado com sucesso!")
-except ImportError as e:
-    print(f"❌ Erro ao carregar router de personagens_equipamentos: {e}")
-except Exception as e:
-    print(f"❌ Erro inesperado ao carregar router de equipamentos: {e}")
 
 
 # ============================================================
-# ROTA RAIZ
+# ESTATÍSTICAS (/stats)
 # ============================================================
-@app.get("/")
-def read_root():
-    return {"message": "RPG API está funcionando!"}
+# Só consultas de leitura com a sessão síncrona: o mesmo router atende os dois modos
+from app.routers.estatisticas import router as estatisticas_router
+app.include_router(estatisticas_router)
 
 
 # ============================================================
-# POPULAR DADOS AUTOMATICAMENTE
+# FEED DE ALTERAÇÕES (/events: SSE E WEBSOCKET)
 # ============================================================
-@app.on_event("startup")
-def popular_dados():
-    db = SessionLocal()
-    try:
-        if db.query(RacasModel).first():
-            return  # evita duplicar dados
-
-        # Raças
-        r1 = RacasModel(Nome="Humano", Passiva="Adaptação rápida", Caracteristica="Versátil")
-        r2 = RacasModel(Nome="Elfo", Passiva="Visão aguçada", Caracteristica="Alta destreza")
-        db.add_all([r1, r2])
-        db.commit()
+# O registro é alimentado por triggers; o mesmo router atende os dois modos
+from app.routers.eventos import router as eventos_router
+app.include_router(eventos_router)
 
-        # Magias
-        m1 = MagiasModel(Nome="Bola de Fogo", Descricao="Dano em área")
-        m2 = MagiasModel(Nome="Cura", Descricao="Restaura PV")
-        db.add_all([m1, m2])
-        db.commit()
 
-        # Habilidades
-        h1 = HabilidadesModel(Nome="Ataque Poderoso", Descricao="Golpe físico")
-        h2 = HabilidadesModel(Nome="Furtividade", Descricao="Movimento silencioso")
-        db.add_all([h1, h2])
-        db.commit()
+# ============================================================
+# IMPORTAÇÃO E EXPORTAÇÃO EM LOTE (/export, /import)
+# ============================================================
+from app.routers.transferencia import router as transferencia_router
+app.include_router(transferencia_router)
 
-        # Classes
-        c1 = ClasseModel(Nome="Guerreiro", Descricao="Combate corpo a corpo", Habilidades_id=h1.Id)
-        c2 = ClasseModel(Nome="Mago", Descricao="Especialista em magia", Habilidades_id=h2.Id, Magias_id=m1.Id)
-        db.add_all([c1, c2])
-        db.commit()
 
-        # Atributos
-        a1 = AtributosModel(Nome="Força", Descricao="Poder físico", Quantidade=15, Personagem_id=1)
-        a2 = AtributosModel(Nome="Inteligência", Descricao="Poder mágico", Quantidade=18, Personagem_id=2)
+# ============================================================
+# ROTA RAIZ
+# ============================================================
+@app.get("/")
+def read_root():
+    return {"message": "RPG API está funcionando!"}
+
 
-        # Equipamentos
-        e1 = EquipamentosModel(Nome="Espada Longa", Descricao="Corte afiado", Bonus=3)
-        e2 = EquipamentosModel(Nome="Cajado", Descricao="Conduz magia", Bonus=2)
-        db.add_all([e1, e2])
-        db.commit()
+# ============================================================
+# ESTATÍSTICAS DO CACHE
+# ============================================================
+@app.get("/cache/stats")
+def estatisticas_cache():
+    return cache_respostas.estatisticas()
 
-        # Personagens
-        p1 = PersonagensModel(Nome="Arthas", Historia="Herói do reino", Tendencia="Leal Bom", Raca_id=r1.Id, Classe_id=c1.Id, Equipamento_id=e1.Id, atributos=[a1])
-        p2 = PersonagensModel(Nome="Elrond", Historia="Elfo sábio", Tendencia="Neutro Bom", Raca_id=r2.Id, Classe_id=c2.Id, Equipamento_id=e2.Id, atributos=[a2])
-        db.add_all([p1, p2])
-        db.commit()
-    finally:
-        db.close()
+
+# ============================================================
+# MÉTRICAS (PROMETHEUS)
+# ============================================================
+@app.get("/metrics", include_in_schema=False)
+def metricas():
+    cache = cache_respostas.estatisticas()
+    extras = {
+        "rpg_cache_hits_total": ("counter", "Leituras atendidas pelo cache de respostas", cache["hits"]),
+        "rpg_cache_misses_total": ("counter", "Leituras que não estavam no cache de respostas", cache["misses"]),
+        "rpg_cache_bytes": ("gauge", "Bytes ocupados pelo cache de respostas", cache["bytes"]),
+    }
+    return Response(content=registro_metricas.exportar(extras), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,243 @@
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+from sqlalchemy import event
+from app.config import settings
+
+logger = logging.getLogger("app.metricas")
+
+
+# ============================================================
+# MEDIÇÃO DA REQUISIÇÃO ATUAL
+# ============================================================
+# O middleware cria uma _Medicao por requisição e a guarda numa ContextVar;
+# as rotas síncronas rodam no threadpool com uma cópia do contexto, então os
+# eventos do SQLAlchemy (em qualquer thread) somam no mesmo objeto.
+class _Medicao:
+    __slots__ = ("consultas", "tempo_sql", "repeticoes")
+
+    def __init__(self):
+        self.consultas = 0
+        self.tempo_sql = 0.0
+        self.repeticoes: Dict[str, int] = {}
+
+
+_medicao_atual: ContextVar[Optional[_Medicao]] = ContextVar("medicao_atual", default=None)
+
+
+def _antes_cursor(conn, cursor, statement, parameters, context, executemany):
+    if _medicao_atual.get() is not None:
+        conn.info.setdefault("inicio_consultas", []).append(time.perf_counter())
+
+
+def _depois_cursor(conn, cursor, statement, parameters, context, executemany):
+    medicao = _medicao_atual.get()
+    if medicao is None:
+        return
+    inicios = conn.info.get("inicio_consultas")
+    if inicios:
+        medicao.tempo_sql += time.perf_counter() - inicios.pop()
+    medicao.consultas += 1
+    medicao.repeticoes[statement] = medicao.repeticoes.get(statement, 0) + 1
+
+
+def medir_consultas(engine):
+    """Liga a contagem de consultas/tempo de banco em uma engine (AsyncEngine: passe .sync_engine)"""
+    event.listen(engine, "before_cursor_execute", _antes_cursor)
+    event.listen(engine, "after_cursor_execute", _depois_cursor)
+
+
+# ============================================================
+# REGISTRO DAS MÉTRICAS (FORMATO PROMETHEUS)
+# ============================================================
+BUCKETS_DURACAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTAS = (1, 2, 5, 10, 20, 50, 100)
+
+
+class _Histograma:
+    __slots__ = ("buckets", "contagens", "soma", "total")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.contagens = [0] * len(buckets)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float):
+        for i, limite in enumerate(self.buckets):
+            if valor <= limite:
+                self.contagens[i] += 1
+                break
+        self.soma += valor
+        self.total += 1
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _rotulos(**rotulos) -> str:
+    return "{" + ",".join(f'{nome}="{_escapar(valor)}"' for nome, valor in rotulos.items()) + "}"
+
+
+class RegistroMetricas:
+    """Contadores e histogramas por rota (o template, ex.: /personagens/{item_id})"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requisicoes: Dict[Tuple[str, str, int], int] = {}
+        self.duracao: Dict[Tuple[str, str, bool], _Histograma] = {}
+        self.consultas: Dict[Tuple[str, str], _Histograma] = {}
+        self.tempo_sql: Dict[Tuple[str, str], float] = {}
+        self.n_mais_um: Dict[Tuple[str, str], int] = {}
+
+    def registrar(
+        self, metodo: str, rota: str, status: int, duracao: Optional[float], medicao: _Medicao,
+        n_mais_um: bool, stream: bool = False,
+    ):
+        """duracao=None (conexões SSE) conta a requisição sem entrar nos histogramas"""
+        chave = (metodo, rota)
+        with self._lock:
+            self.requisicoes[(metodo, rota, status)] = self.requisicoes.get((metodo, rota, status), 0) + 1
+            if duracao is None:
+                return
+            self.duracao.setdefault((metodo, rota, stream), _Histograma(BUCKETS_DURACAO)).observar(duracao)
+            self.consultas.setdefault(chave, _Histograma(BUCKETS_CONSULTAS)).observar(medicao.consultas)
+            self.tempo_sql[chave] = self.tempo_sql.get(chave, 0.0) + medicao.tempo_sql
+            if n_mais_um:
+                self.n_mais_um[chave] = self.n_mais_um.get(chave, 0) + 1
+
+    def limpar(self):
+        with self._lock:
+            for tabela in (self.requisicoes, self.duracao, self.consultas, self.tempo_sql, self.n_mais_um):
+                tabela.clear()
+
+    def _histograma(self, linhas, nome, valores, nomes_rotulos=("metodo", "rota")):
+        for chave, histograma in sorted(valores.items()):
+            rotulos = {rotulo: str(valor).lower() if isinstance(valor, bool) else valor
+                       for rotulo, valor in zip(nomes_rotulos, chave)}
+            acumulado = 0
+            for limite, quantidade in zip(histograma.buckets, histograma.contagens):
+                acumulado += quantidade
+                linhas.append(f"{nome}_bucket{_rotulos(**rotulos, le=limite)} {acumulado}")
+            linhas.append(f"{nome}_bucket{_rotulos(**rotulos, le='+Inf')} {histograma.total}")
+            linhas.append(f"{nome}_sum{_rotulos(**rotulos)} {histograma.soma}")
+            linhas.append(f"{nome}_count{_rotulos(**rotulos)} {histograma.total}")
+
+    def exportar(self, extras: Optional[Dict[str, Tuple[str, str, float]]] = None) -> str:
+        """Texto no formato de exposição do Prometheus (text/plain; version=0.0.4)"""
+        linhas = []
+        with self._lock:
+            linhas += [
+                "# HELP rpg_http_requisicoes_total Requisições atendidas por rota e status",
+                "# TYPE rpg_http_requisicoes_total counter",
+            ]
+            for (metodo, rota, status), total in sorted(self.requisicoes.items()):
+                linhas.append(f"rpg_http_requisicoes_total{_rotulos(metodo=metodo, rota=rota, status=status)} {total}")
+
+            linhas += [
+                "# HELP rpg_http_duracao_segundos Latência das requisições por rota (stream=true: até o último byte)",
+                "# TYPE rpg_http_duracao_segundos histogram",
+            ]
+            self._histograma(linhas, "rpg_http_duracao_segundos", self.duracao, ("metodo", "rota", "stream"))
+
+            linhas += [
+                "# HELP rpg_sql_consultas_por_requisicao Consultas SQL executadas por requisição",
+                "# TYPE rpg_sql_consultas_por_requisicao histogram",
+            ]
+            self._histograma(linhas, "rpg_sql_consultas_por_requisicao", self.consultas)
+
+            linhas += [
+                "# HELP rpg_sql_duracao_segundos_total Tempo gasto no banco por rota",
+                "# TYPE rpg_sql_duracao_segundos_total counter",
+            ]
+            for (metodo, rota), total in sorted(self.tempo_sql.items()):
+                linhas.append(f"rpg_sql_duracao_segundos_total{_rotulos(metodo=metodo, rota=rota)} {total}")
+
+            linhas += [
+                "# HELP rpg_sql_n_mais_um_total Requisições com a mesma consulta repetida além do limite (N+1)",
+                "# TYPE rpg_sql_n_mais_um_total counter",
+            ]
+            for (metodo, rota), total in sorted(self.n_mais_um.items()):
+                linhas.append(f"rpg_sql_n_mais_um_total{_rotulos(metodo=metodo, rota=rota)} {total}")
+
+        for nome, (tipo, ajuda, valor) in (extras or {}).items():
+            linhas += [f"# HELP {nome} {ajuda}", f"# TYPE {nome} {tipo}", f"{nome} {valor}"]
+        return "\n".join(linhas) + "\n"
+
+
+registro_metricas = RegistroMetricas()
+
+
+# ============================================================
+# MIDDLEWARE ASGI
+# ============================================================
+# ASGI puro (sem BaseHTTPMiddleware): não copia o corpo da resposta nem cria
+# tarefas extras. O Server-Timing só sai quando pedido com o cabeçalho
+# X-Server-Timing: 1 (ou sempre, com RPG_METRICAS_SERVER_TIMING=true).
+# Ele vai junto com http.response.start: em respostas em stream (listas
+# NDJSON, /export) mede só até o primeiro byte; as consultas e a duração
+# completas ficam nas métricas, com o rótulo stream="true". Conexões SSE
+# (text/event-stream) duram o quanto o cliente quiser e não entram nos
+# histogramas, só na contagem de requisições.
+def _n_mais_um(medicao: _Medicao, metodo: str, rota: str) -> bool:
+    statement, vezes = max(medicao.repeticoes.items(), key=lambda item: item[1], default=("", 0))
+    if vezes <= settings.metricas_limite_n_mais_um:
+        return False
+    logger.warning(
+        "Possível N+1 em %s %s: mesma consulta executada %d vezes na requisição: %s",
+        metodo, rota, vezes, " ".join(statement.split())[:200],
+    )
+    return True
+
+
+class MiddlewareMetricas:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        medicao = _Medicao()
+        token = _medicao_atual.set(medicao)
+        inicio = time.perf_counter()
+        status = 500
+        sse = False
+        stream: Optional[bool] = None
+        server_timing = settings.metricas_server_timing or (b"x-server-timing", b"1") in scope["headers"]
+
+        async def enviar(mensagem):
+            nonlocal status, sse, stream
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+                sse = any(
+                    nome.lower() == b"content-type" and valor.startswith(b"text/event-stream")
+                    for nome, valor in mensagem.get("headers", [])
+                )
+                if server_timing:
+                    total = (time.perf_counter() - inicio) * 1000
+                    valor = (
+                        f'db;dur={medicao.tempo_sql * 1000:.2f};desc="{medicao.consultas} consultas", '
+                        f"app;dur={total:.2f}"
+                    )
+                    mensagem["headers"] = [*mensagem.get("headers", []), (b"server-timing", valor.encode())]
+            elif mensagem["type"] == "http.response.body" and stream is None:
+                # StreamingResponse manda cada pedaço com more_body; Response manda tudo de uma vez
+                stream = mensagem.get("more_body", False)
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _medicao_atual.reset(token)
+            rota_encontrada = scope.get("route")
+            rota = getattr(rota_encontrada, "path", None) or "desconhecida"
+            metodo = scope["method"]
+            registro_metricas.registrar(
+                metodo, rota, status, None if sse else time.perf_counter() - inicio, medicao,
+                not sse and _n_mais_um(medicao, metodo, rota), bool(stream),
+            )
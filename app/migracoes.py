@@ -0,0 +1,24 @@
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+
+
+# ============================================================
+# MIGRAÇÕES (ALEMBIC)
+# ============================================================
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def config_alembic(conexao=None) -> Config:
+    """Config do Alembic apontando para migrations/, independente do diretório atual"""
+    config = Config(str(RAIZ / "alembic.ini"))
+    config.set_main_option("script_location", str(RAIZ / "migrations"))
+    if conexao is not None:
+        config.attributes["connection"] = conexao
+    return config
+
+
+def atualizar_schema(engine):
+    """Aplica as migrações pendentes (equivalente a `alembic upgrade head`)"""
+    with engine.begin() as conexao:
+        command.upgrade(config_alembic(conexao), "head")
@@ -1,14 +1,26 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Table
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Table, Index
+from sqlalchemy.orm import declared_attr, relationship
 from app.database import Base
 
 
+class Versionado:
+    """Versao começa em 1 e sobe a cada UPDATE da linha (controle otimista: If-Match -> 412)"""
+    Versao = Column(Integer, nullable=False, default=1, server_default="1")
+
+    @declared_attr.directive
+    def __mapper_args__(cls):
+        return {"version_id_col": cls.Versao}
+
+
 # Tabela de associação Many-to-Many: Personagens <-> Magias
 personagem_magias = Table(
     'Personagem_Magias',
     Base.metadata,
     Column('Personagem_id', Integer, ForeignKey('Personagens.Id'), primary_key=True),
-    Column('Magia_id', Integer, ForeignKey('Magias.Id'), primary_key=True)
+    Column('Magia_id', Integer, ForeignKey('Magias.Id'), primary_key=True),
+    # Nas três associações a PK (Personagem_id, item) só atende a busca pelo personagem;
+    # o índice (item, Personagem_id) cobre o sentido inverso ("quem tem este item") sem ler a tabela
+    Index('ix_Personagem_Magias_Magia_id_Personagem_id', 'Magia_id', 'Personagem_id')
 )
 
 # Tabela de associação Many-to-Many: Personagens <-> Habilidades
@@ -16,7 +28,8 @@ personagem_habilidades = Table(
     'Personagem_Habilidades',
     Base.metadata,
     Column('Personagem_id', Integer, ForeignKey('Personagens.Id'), primary_key=True),
-    Column('Habilidade_id', Integer, ForeignKey('Habilidades.Id'), primary_key=True)
+    Column('Habilidade_id', Integer, ForeignKey('Habilidades.Id'), primary_key=True),
+    Index('ix_Personagem_Habilidades_Habilidade_id_Personagem_id', 'Habilidade_id', 'Personagem_id')
 )
 
 # Tabela de associação Many-to-Many: Personagens <-> Equipamentos
@@ -24,26 +37,27 @@ personagem_equipamentos = Table(
     'Personagem_Equipamentos',
     Base.metadata,
     Column('Personagem_id', Integer, ForeignKey('Personagens.Id'), primary_key=True),
-    Column('Equipamento_id', Integer, ForeignKey('Equipamentos.Id'), primary_key=True)
+    Column('Equipamento_id', Integer, ForeignKey('Equipamentos.Id'), primary_key=True),
+    Index('ix_Personagem_Equipamentos_Equipamento_id_Personagem_id', 'Equipamento_id', 'Personagem_id')
 )
 
 
-class RacasModel(Base):
+class RacasModel(Versionado, Base):
     __tablename__ = "Racas"
     
     Id = Column(Integer, primary_key=True, index=True)
-    Nome = Column(String, nullable=False)
+    Nome = Column(String, nullable=False, index=True)
     Passiva = Column(Text)
     Caracteristica = Column(Text)
     
     personagens = relationship("PersonagensModel", back_populates="raca")
 
 
-class MagiasModel(Base):
+class MagiasModel(Versionado, Base):
     __tablename__ = "Magias"
     
     Id = Column(Integer, primary_key=True, index=True)
-    Nome = Column(String, nullable=False)
+    Nome = Column(String, nullable=False, index=True)
     Descricao = Column(Text)
     Categoria = Column(String)  # attack, defense, support, buff, debuff
     Nivel = Column(Integer)
@@ -53,11 +67,11 @@ class MagiasModel(Base):
     Efeito = Column(Text)
 
 
-class HabilidadesModel(Base):
+class HabilidadesModel(Versionado, Base):
     __tablename__ = "Habilidades"
     
     Id = Column(Integer, primary_key=True, index=True)
-    Nome = Column(String, nullable=False)
+    Nome = Column(String, nullable=False, index=True)
     Descricao = Column(Text)
     Tipo = Column(String)  # passive, active, ultimate, special
     Cooldown = Column(Integer)
@@ -66,25 +80,25 @@ class HabilidadesModel(Base):
     Dano = Column(Integer)  # Dano base da habilidade
 
 
-class ClasseModel(Base):
+class ClasseModel(Versionado, Base):
     __tablename__ = "Classe"
     
     Id = Column(Integer, primary_key=True, index=True)
-    Nome = Column(String, nullable=False)
+    Nome = Column(String, nullable=False, index=True)
     Descricao = Column(Text)
-    Habilidades_id = Column(Integer, ForeignKey("Habilidades.Id"), nullable=True)
-    Magias_id = Column(Integer, ForeignKey("Magias.Id"), nullable=True)
+    Habilidades_id = Column(Integer, ForeignKey("Habilidades.Id"), nullable=True, index=True)
+    Magias_id = Column(Integer, ForeignKey("Magias.Id"), nullable=True, index=True)
 
     habilidades = relationship("HabilidadesModel")
     magias = relationship("MagiasModel")
     personagens = relationship("PersonagensModel", back_populates="classe")
 
 
-class PersonagensModel(Base):
+class PersonagensModel(Versionado, Base):
     __tablename__ = "Personagens"
     
     Id = Column(Integer, primary_key=True, index=True)
-    Nome = Column(String, nullable=False)
+    Nome = Column(String, nullable=False, index=True)
     Historia = Column(Text)
     Tendencia = Column(String)
     Level = Column(Integer, default=1)
@@ -103,9 +117,9 @@ class PersonagensModel(Base):
     Deslocamento = Column(Integer, default=30)  # Velocidade de movimento
     Classe_Nome = Column(String, default="Guerreiro")  # Nome da classe do personagem
     Raca_Nome = Column(String, default="Humano")  # Nome da raça do personagem
-    Raca_id = Column(Integer, ForeignKey("Racas.Id"), nullable=True)
-    Classe_id = Column(Integer, ForeignKey("Classe.Id"), nullable=True)
-    Equipamento_id = Column(Integer, ForeignKey("Equipamentos.Id"), nullable=True)
+    Raca_id = Column(Integer, ForeignKey("Racas.Id"), nullable=True, index=True)
+    Classe_id = Column(Integer, ForeignKey("Classe.Id"), nullable=True, index=True)
+    Equipamento_id = Column(Integer, ForeignKey("Equipamentos.Id"), nullable=True, index=True)
 
     raca = relationship("RacasModel", back_populates="personagens")
     classe = relationship("ClasseModel", back_populates="personagens")
@@ -133,15 +147,18 @@ class PersonagensModel(Base):
     )
 
 
-class AtributosModel(Base):
+class AtributosModel(Versionado, Base):
     __tablename__ = "Atributos"
     
     Id = Column(Integer, primary_key=True, index=True)
     Personagem_id = Column(Integer, ForeignKey("Personagens.Id"), nullable=False)
-    Nome = Column(String, nullable=False)
+    Nome = Column(String, nullable=False, index=True)
     Descricao = Column(Text)
     Quantidade = Column(Integer)
 
+    # Carregamento dos atributos de um personagem e busca de um atributo pelo nome
+    __table_args__ = (Index("ix_Atributos_Personagem_id_Nome", "Personagem_id", "Nome"),)
+
     personagem = relationship(
         "PersonagensModel",
         back_populates="atributos",
@@ -149,11 +166,11 @@ class AtributosModel(Base):
     )
 
 
-class EquipamentosModel(Base):
+class EquipamentosModel(Versionado, Base):
     __tablename__ = "Equipamentos"
     
     Id = Column(Integer, primary_key=True, index=True)
-    Nome = Column(String, nullable=False)
+    Nome = Column(String, nullable=False, index=True)
     Descricao = Column(Text)
     Tipo = Column(String)  # weapon, armor, accessory, consumable, tool
     Raridade = Column(String)  # common, uncommon, rare, epic, legendary
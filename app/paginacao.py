@@ -0,0 +1,80 @@
+from typing import Optional
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+
+# ============================================================
+# PAGINAÇÃO POR CURSOR (KEYSET NO Id)
+# ============================================================
+LIMITE_MAXIMO = 1000
+TAMANHO_LOTE_STREAM = 500
+
+
+def aplicar_cursor(query, model, limit: Optional[int], after: Optional[int], ordem=()):
+    """Filtra por Id > after e ordena por Id; pede um item a mais para detectar a próxima página.
+
+    Funciona tanto com Query (sessão síncrona) quanto com select() (sessão assíncrona).
+    Com `ordem` (?sort=), o Id só desempata e o cursor não se aplica.
+    """
+    if after is not None:
+        query = query.filter(model.Id > after)
+    query = query.order_by(*ordem, model.Id)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    return query
+
+
+def cortar_pagina(itens: list, limit: Optional[int]):
+    """Retorna (itens da página, próximo cursor ou None)"""
+    if limit is None or len(itens) <= limit:
+        return itens, None
+    itens = itens[:limit]
+    return itens, itens[-1].Id
+
+
+def cabecalhos_paginacao(request: Request, proximo: Optional[int]) -> dict:
+    """Cabeçalhos Link (rel=next) e X-Next-Cursor quando há próxima página"""
+    if proximo is None:
+        return {}
+    url = request.url.include_query_params(after=proximo)
+    return {"Link": f'<{url}>; rel="next"', "X-Next-Cursor": str(proximo)}
+
+
+# ============================================================
+# STREAMING NDJSON
+# ============================================================
+def _stmt_stream(model, after: Optional[int], opcoes, condicoes):
+    stmt = select(model).options(*opcoes).where(*condicoes)
+    if after is not None:
+        stmt = stmt.where(model.Id > after)
+    return stmt.order_by(model.Id).execution_options(
+        stream_results=True, yield_per=TAMANHO_LOTE_STREAM
+    )
+
+
+def resposta_ndjson(session_factory, model, schema, after: Optional[int] = None, opcoes=(), condicoes=()):
+    """Transmite a tabela inteira em NDJSON, lendo em lotes com cursor no servidor.
+
+    A sessão é aberta dentro do gerador porque a dependência get_db já foi
+    encerrada quando o corpo da resposta começa a ser enviado.
+    """
+    def gerar():
+        db = session_factory()
+        try:
+            for item in db.scalars(_stmt_stream(model, after, opcoes, condicoes)):
+                yield schema.model_validate(item).model_dump_json() + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(gerar(), media_type="application/x-ndjson")
+
+
+def resposta_ndjson_async(session_factory, model, schema, after: Optional[int] = None, opcoes=(), condicoes=()):
+    """Versão de resposta_ndjson para AsyncSession (usa stream_scalars)"""
+    async def gerar():
+        async with session_factory() as db:
+            async for item in await db.stream_scalars(_stmt_stream(model, after, opcoes, condicoes)):
+                yield schema.model_validate(item).model_dump_json() + "\n"
+
+    return StreamingResponse(gerar(), media_type="application/x-ndjson")
@@ -1,6 +1,8 @@
 from typing import List
 from fastapi import APIRouter, HTTPException, Depends, Query, Body
 from sqlalchemy.orm import Session
+from app import busca
+from app.carregamento import opcoes_carregamento
 from app.database import get_db
 from app.models import RacasModel, MagiasModel, HabilidadesModel, ClasseModel, EquipamentosModel, AtributosModel
 from app.schemas import RacaSchema, MagiaSchema, HabilidadeSchema, ClasseSchema, EquipamentoSchema, AtributoSchema
@@ -9,21 +11,23 @@ from app.schemas import RacaSchema, MagiaSchema, HabilidadeSchema, ClasseSchema,
 def criar_router_crud(model, schema, prefix: str, tag: str):
     """Factory function para criar routers CRUD genéricos"""
     router = APIRouter(prefix=f"/{prefix}", tags=[tag])
+    opcoes = opcoes_carregamento(model, schema)
 
     @router.get("/", response_model=List[schema])
     def listar(db: Session = Depends(get_db)):
-        return db.query(model).all()
+        return db.query(model).options(*opcoes).all()
 
     @router.get("/search", response_model=List[schema])
     def buscar(
         nome: str = Query(..., description=f"Buscar {tag.lower()} por nome"),
+        limit: int = Query(100, ge=1, le=1000),
         db: Session = Depends(get_db)
     ):
-        return db.query(model).filter(model.Nome.ilike(f"%{nome}%")).all()
+        return busca.buscar(db, model, nome, limit, opcoes)
 
     @router.get("/{item_id}", response_model=schema)
     def obter(item_id: int, db: Session = Depends(get_db)):
-        item = db.query(model).filter(model.Id == item_id).first()
+        item = db.query(model).options(*opcoes).filter(model.Id == item_id).first()
         if not item:
             raise HTTPException(status_code=404, detail=f"{tag} não encontrado")
         return item
@@ -65,10 +69,21 @@ def criar_router_crud(model, schema, prefix: str, tag: str):
     return router
 
 
-# Criar routers para cada recurso
-racas_router = criar_router_crud(RacasModel, RacaSchema, "racas", "Raças")
-magias_router = criar_router_crud(MagiasModel, MagiaSchema, "magias", "Magias")
-habilidades_router = criar_router_crud(HabilidadesModel, HabilidadeSchema, "habilidades", "Habilidades")
-classes_router = criar_router_crud(ClasseModel, ClasseSchema, "classes", "Classes")
-equipamentos_router = criar_router_crud(EquipamentosModel, EquipamentoSchema, "equipamentos", "Equipamentos")
-atributos_router = criar_router_crud(AtributosModel, AtributoSchema, "atributos", "Atributos")
+# Routers de cada recurso, montados só quando acessados: importar qualquer
+# módulo de app.routers passa por este pacote e não deve pagar essa montagem
+ROUTERS = {
+    "racas_router": (RacasModel, RacaSchema, "racas", "Raças"),
+    "magias_router": (MagiasModel, MagiaSchema, "magias", "Magias"),
+    "habilidades_router": (HabilidadesModel, HabilidadeSchema, "habilidades", "Habilidades"),
+    "classes_router": (ClasseModel, ClasseSchema, "classes", "Classes"),
+    "equipamentos_router": (EquipamentosModel, EquipamentoSchema, "equipamentos", "Equipamentos"),
+    "atributos_router": (AtributosModel, AtributoSchema, "atributos", "Atributos"),
+}
+
+
+def __getattr__(nome: str):
+    if nome not in ROUTERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    router = criar_router_crud(*ROUTERS[nome])
+    globals()[nome] = router
+    return router
@@ -0,0 +1,256 @@
+from typing import List, Optional, Sequence
+from fastapi import APIRouter, HTTPException, Depends, Query, Body, Request, Response
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import busca
+from app.cache import resposta_em_cache, guardar_resposta
+from app.carregamento import opcoes_carregamento, tabelas_dependentes
+from app.concorrencia import COLUNAS_CONTROLE, atualizar_versionado_async, excluir_versionado_async, versoes_aceitas
+from app.database import get_async_db, AsyncSessionLocal
+from app.associacoes import (
+    ASSOCIACOES,
+    Associacao,
+    ids_faltando,
+    stmt_ids_existentes,
+    stmt_inserir,
+    stmt_item_existe,
+    stmt_itens_personagem,
+    stmt_manter_apenas,
+    stmt_personagem_existe,
+    stmt_possui,
+    stmt_remover,
+)
+from app.schemas import AssociacaoDiffSchema
+from app.lote import schema_parcial, stmts_dependencias
+from app.filtros import ParametrosLista, colunas_filtraveis, criar_parametros_lista, stmt_listagem
+from app.paginacao import LIMITE_MAXIMO, aplicar_cursor, cortar_pagina, cabecalhos_paginacao, resposta_ndjson_async
+from app.serializacao import para_json, resposta_json
+from app.versoes import etag_item, etag_tabelas_async, nao_modificado, cabecalhos_etag
+
+
+# ============================================================
+# CRUD GENÉRICO ASSÍNCRONO (RPG_MODO_ASYNC=true)
+# ============================================================
+def criar_router_crud_async(
+    model, schema, prefix: str, cacheavel: bool = False, filtros: Optional[Sequence[str]] = None, schema_patch=None,
+):
+    """Mesmas rotas de criar_rotas_crud (app.main), usando AsyncSession.
+
+    Com sessão assíncrona não existe lazy load: tudo que a resposta
+    serializa é carregado pelas opções de opcoes_carregamento.
+    """
+    router = APIRouter(prefix=f"/{prefix}")
+    opcoes = opcoes_carregamento(model, schema)
+    tabelas = tabelas_dependentes(model, schema)
+    parametros_lista = criar_parametros_lista(model, schema, filtros or colunas_filtraveis(model, schema))
+    campos_relacao = set(inspect(model).relationships.keys()) | COLUNAS_CONTROLE
+    schema_patch = schema_patch or schema_parcial(model, schema)
+
+    async def carregar(db: AsyncSession, item_id: int):
+        stmt = (
+            select(model)
+            .options(*opcoes)
+            .where(model.Id == item_id)
+            .execution_options(populate_existing=True)
+        )
+        return (await db.scalars(stmt)).first()
+
+    async def responder_item(db: AsyncSession, db_item) -> Response:
+        # ETag do próprio registro: é o que o cliente devolve no If-Match
+        etag = etag_item(db_item.Versao, await etag_tabelas_async(db, tabelas))
+        return Response(content=para_json(schema, db_item, lista=False), media_type="application/json", headers=cabecalhos_etag(etag))
+
+    async def responder_atualizado(db: AsyncSession, db_item):
+        # expire_on_commit=False: sem relações na resposta, a linha do RETURNING basta
+        await db.commit()
+        return await responder_item(db, db_item if not opcoes else await carregar(db, db_item.Id))
+
+    @router.get("/", response_model=List[schema])
+    async def listar(
+        request: Request,
+        limit: Optional[int] = Query(None, ge=1, le=LIMITE_MAXIMO, description="Quantidade máxima de itens por página"),
+        after: Optional[int] = Query(None, description="Cursor: retorna itens com Id maior que este"),
+        stream: bool = Query(False, description="Transmite todos os itens em NDJSON"),
+        parametros: ParametrosLista = Depends(parametros_lista),
+        db: AsyncSession = Depends(get_async_db),
+    ):
+        parametros.conferir(limit, after, stream)
+        if stream:
+            return resposta_ndjson_async(AsyncSessionLocal, model, schema, after, opcoes, parametros.condicoes)
+        etag = await etag_tabelas_async(db, tabelas)
+        if resposta := nao_modificado(request, etag):
+            return resposta
+        if cacheavel and (em_cache := resposta_em_cache(request, etag)):
+            return em_cache
+        stmt = aplicar_cursor(stmt_listagem(model, opcoes, parametros), model, limit, after, parametros.ordem)
+        resultado = await (db.execute(stmt) if parametros.campos else db.scalars(stmt))
+        itens, proximo = cortar_pagina(parametros.ordenar(resultado.all()), limit)
+        cabecalhos = {**cabecalhos_paginacao(request, None if parametros.ordem else proximo), **cabecalhos_etag(etag)}
+        corpo = para_json(parametros.schema_resposta(schema), itens)
+        if cacheavel:
+            return guardar_resposta(request, corpo, tabelas, cabecalhos)
+        return Response(content=corpo, media_type="application/json", headers=cabecalhos)
+
+    @router.get("/search", response_model=List[schema])
+    async def buscar(
+        request: Request,
+        nome: str = Query(..., description=f"Buscar {prefix} por nome ou texto (prefixos, ordenado por relevância)"),
+        limit: int = Query(100, ge=1, le=LIMITE_MAXIMO, description="Quantidade máxima de resultados"),
+        db: AsyncSession = Depends(get_async_db),
+    ):
+        etag = await etag_tabelas_async(db, tabelas)
+        if resposta := nao_modificado(request, etag):
+            return resposta
+        if cacheavel and (em_cache := resposta_em_cache(request, etag)):
+            return em_cache
+        itens = await busca.buscar_async(db, model, nome, limit, opcoes)
+        if cacheavel:
+            return guardar_resposta(request, para_json(schema, itens), tabelas, cabecalhos_etag(etag))
+        return resposta_json(schema, itens, cabecalhos=cabecalhos_etag(etag))
+
+    @router.get("/{item_id}", response_model=schema)
+    async def obter(item_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+        # Como em app.main: com If-None-Match, o 304 sai de SELECT Versao + versões das tabelas
+        versao_tabelas = await etag_tabelas_async(db, tabelas)
+        if request.headers.get("if-none-match"):
+            versao = await db.scalar(select(model.Versao).where(model.Id == item_id))
+            if versao is None:
+                raise HTTPException(status_code=404, detail=f"{prefix} não encontrado")
+            if resposta := nao_modificado(request, etag_item(versao, versao_tabelas)):
+                return resposta
+        if cacheavel and (em_cache := resposta_em_cache(request, versao_tabelas)):
+            return em_cache
+        db_item = await carregar(db, item_id)
+        if not db_item:
+            raise HTTPException(status_code=404, detail=f"{prefix} não encontrado")
+        corpo = para_json(schema, db_item, lista=False)
+        etag = etag_item(db_item.Versao, versao_tabelas)
+        if cacheavel:
+            return guardar_resposta(request, corpo, tabelas, cabecalhos_etag(etag), versao=versao_tabelas)
+        return Response(content=corpo, media_type="application/json", headers=cabecalhos_etag(etag))
+
+    @router.post("/", response_model=schema)
+    async def criar(item: schema = Body(...), db: AsyncSession = Depends(get_async_db)):
+        db_item = model(**item.model_dump(exclude=campos_relacao))
+        db.add(db_item)
+        await db.commit()
+        return await responder_item(db, await carregar(db, db_item.Id))
+
+    @router.put("/{item_id}", response_model=schema)
+    async def atualizar(item_id: int, request: Request, item: schema = Body(...), db: AsyncSession = Depends(get_async_db)):
+        versoes = versoes_aceitas(request)
+        valores = item.model_dump(exclude=campos_relacao, exclude_unset=True)
+        return await responder_atualizado(db, await atualizar_versionado_async(db, model, item_id, valores, versoes, prefix))
+
+    @router.patch("/{item_id}", response_model=schema)
+    async def atualizar_parcial(
+        item_id: int, request: Request, item: schema_patch = Body(...), db: AsyncSession = Depends(get_async_db),
+    ):
+        versoes = versoes_aceitas(request)
+        valores = item.model_dump(exclude=COLUNAS_CONTROLE, exclude_unset=True)
+        return await responder_atualizado(db, await atualizar_versionado_async(db, model, item_id, valores, versoes, prefix))
+
+    @router.delete("/{item_id}")
+    async def deletar(item_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+        versoes = versoes_aceitas(request)
+        for stmt in stmts_dependencias(model, [item_id]):
+            await db.execute(stmt)
+        await excluir_versionado_async(db, model, item_id, versoes, prefix)
+        await db.commit()
+        return {"detail": f"{prefix} deletado"}
+
+    return router
+
+
+# ============================================================
+# ASSOCIAÇÕES DE PERSONAGENS ASSÍNCRONAS
+# ============================================================
+def _rotas_associacao_async(router: APIRouter, assoc: Associacao, schema):
+    """Listar/adicionar/remover itens de uma coleção N:N do personagem"""
+    caminho = f"/personagens/{{personagem_id}}/{assoc.recurso}"
+    tabelas = assoc.tabelas_leitura
+
+    async def garantir_personagem(db: AsyncSession, personagem_id: int):
+        if not await db.scalar(stmt_personagem_existe(personagem_id)):
+            raise HTTPException(status_code=404, detail="Personagem não encontrado")
+
+    async def garantir_item(db: AsyncSession, item_id: int):
+        if not await db.scalar(stmt_item_existe(assoc, item_id)):
+            raise HTTPException(status_code=404, detail=f"{assoc.rotulo} não {assoc.nao_encontrado}")
+
+    async def validar_ids(db: AsyncSession, ids: List[int]):
+        existentes = (await db.scalars(stmt_ids_existentes(assoc, ids))).all() if ids else []
+        faltando = ids_faltando(ids, existentes)
+        if faltando:
+            raise HTTPException(
+                status_code=404,
+                detail=f"{assoc.recurso.capitalize()} não {assoc.nao_encontrado}s: {faltando}",
+            )
+
+    async def inserir(db: AsyncSession, personagem_id: int, ids: List[int]):
+        if ids:
+            dialeto = db.get_bind().dialect.name
+            await db.execute(stmt_inserir(assoc, dialeto, personagem_id, dict.fromkeys(ids)))
+
+    async def itens(db: AsyncSession, personagem_id: int):
+        return (await db.scalars(stmt_itens_personagem(assoc, personagem_id))).all()
+
+    @router.get(caminho, response_model=List[schema])
+    async def listar(personagem_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+        etag = await etag_tabelas_async(db, tabelas)
+        if resposta := nao_modificado(request, etag):
+            return resposta
+        if em_cache := resposta_em_cache(request, etag):
+            return em_cache
+        await garantir_personagem(db, personagem_id)
+        corpo = para_json(schema, await itens(db, personagem_id))
+        return guardar_resposta(request, corpo, tabelas, cabecalhos_etag(etag))
+
+    @router.put(caminho, response_model=List[schema])
+    async def definir(personagem_id: int, ids: List[int] = Body(...), db: AsyncSession = Depends(get_async_db)):
+        await garantir_personagem(db, personagem_id)
+        ids = list(dict.fromkeys(ids))
+        await validar_ids(db, ids)
+        await db.execute(stmt_manter_apenas(assoc, personagem_id, ids))
+        await inserir(db, personagem_id, ids)
+        await db.commit()
+        return resposta_json(schema, await itens(db, personagem_id))
+
+    @router.patch(caminho, response_model=List[schema])
+    async def alterar(personagem_id: int, diff: AssociacaoDiffSchema = Body(...), db: AsyncSession = Depends(get_async_db)):
+        await garantir_personagem(db, personagem_id)
+        adicionar = list(dict.fromkeys(diff.adicionar))
+        await validar_ids(db, adicionar)
+        if diff.remover:
+            await db.execute(stmt_remover(assoc, personagem_id, diff.remover))
+        await inserir(db, personagem_id, adicionar)
+        await db.commit()
+        return resposta_json(schema, await itens(db, personagem_id))
+
+    @router.post(f"{caminho}/{{item_id}}")
+    async def adicionar(personagem_id: int, item_id: int, db: AsyncSession = Depends(get_async_db)):
+        await garantir_personagem(db, personagem_id)
+        await garantir_item(db, item_id)
+        if await db.scalar(stmt_possui(assoc, personagem_id, item_id)):
+            raise HTTPException(status_code=400, detail=f"Personagem já possui {assoc.este} {assoc.rotulo.lower()}")
+        await inserir(db, personagem_id, [item_id])
+        await db.commit()
+        return {"detail": f"{assoc.rotulo} adicionad{assoc.artigo} com sucesso"}
+
+    @router.delete(f"{caminho}/{{item_id}}")
+    async def remover(personagem_id: int, item_id: int, db: AsyncSession = Depends(get_async_db)):
+        await garantir_personagem(db, personagem_id)
+        await garantir_item(db, item_id)
+        if not (await db.execute(stmt_remover(assoc, personagem_id, [item_id]))).rowcount:
+            raise HTTPException(status_code=400, detail=f"Personagem não possui {assoc.este} {assoc.rotulo.lower()}")
+        await db.commit()
+        return {"detail": f"{assoc.rotulo} removid{assoc.artigo} com sucesso"}
+
+
+def criar_router_associacoes_async(magia_schema, habilidade_schema, equipamento_schema):
+    """Router com /personagens/{id}/magias|habilidades|equipamentos em modo assíncrono"""
+    router = APIRouter(tags=["Personagens - Associações"])
+    _rotas_associacao_async(router, ASSOCIACOES["magias"], magia_schema)
+    _rotas_associacao_async(router, ASSOCIACOES["habilidades"], habilidade_schema)
+    _rotas_associacao_async(router, ASSOCIACOES["equipamentos"], equipamento_schema)
+    return router
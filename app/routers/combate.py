@@ -0,0 +1,74 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from app.cache import resposta_em_cache, guardar_resposta
+from app.combate import TABELAS_DERIVADOS, derivados
+from app.database import get_db
+from app.lote import LIMITE_LOTE
+from app.filtros import lista_ids
+from app.serializacao import para_json
+from app.versoes import etag_tabelas, nao_modificado, cabecalhos_etag
+
+# Incluído antes do CRUD de personagens: /personagens/derived precisa ser
+# registrado antes de /personagens/{item_id}
+router = APIRouter(prefix="/personagens", tags=["Personagens"])
+
+
+# ============================================================
+# SCHEMAS
+# ============================================================
+class DanoHabilidadeSchema(BaseModel):
+    Id: int
+    Nome: str
+    dano: int
+
+
+class DerivadosSchema(BaseModel):
+    Id: int
+    ca: int
+    ataque: int
+    iniciativa: int
+    vida_maxima: int
+    carga: int
+    carga_maxima: int
+    sobrecarregado: bool
+    dano_habilidades_total: int
+    custo_mana_total: int
+    magias_lancaveis: int
+    habilidades: List[DanoHabilidadeSchema]
+
+
+# ============================================================
+# ROTAS
+# ============================================================
+def _responder(request: Request, db: Session, ids: List[int], lista: bool):
+    etag = etag_tabelas(db, TABELAS_DERIVADOS)
+    if resposta := nao_modificado(request, etag):
+        return resposta
+    if em_cache := resposta_em_cache(request, etag):
+        return em_cache
+    resultados = derivados(db, ids, etag)
+    faltando = [personagem_id for personagem_id in ids if personagem_id not in resultados]
+    if faltando:
+        detalhe = "Personagem não encontrado" if not lista else f"Personagens não encontrados: {faltando}"
+        raise HTTPException(status_code=404, detail=detalhe)
+    dados = [resultados[personagem_id] for personagem_id in ids]
+    corpo = para_json(DerivadosSchema, dados if lista else dados[0], lista=lista)
+    return guardar_resposta(request, corpo, TABELAS_DERIVADOS, cabecalhos_etag(etag))
+
+
+@router.get("/derived", response_model=List[DerivadosSchema])
+def derivados_em_lote(
+    request: Request,
+    ids: str = Query(..., description="Ids separados por vírgula, ex.: 1,2,3"),
+    db: Session = Depends(get_db),
+):
+    """Status derivados (CA, ataque, carga, dano das habilidades...) de vários personagens, na ordem de ids"""
+    return _responder(request, db, lista_ids(ids, LIMITE_LOTE), lista=True)
+
+
+@router.get("/{item_id}/derived", response_model=DerivadosSchema)
+def derivados_personagem(item_id: int, request: Request, db: Session = Depends(get_db)):
+    """Status derivados de um personagem"""
+    return _responder(request, db, [item_id], lista=False)
@@ -0,0 +1,131 @@
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, Query, Request
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from app.associacoes import ASSOCIACOES
+from app.cache import resposta_em_cache, guardar_resposta
+from app.database import get_db
+from app.estatisticas import (
+    TABELAS_PERSONAGENS,
+    TABELAS_PESO,
+    stmt_distribuicao,
+    stmt_medias_classe,
+    stmt_peso,
+    stmt_populares,
+    usa_resumos,
+)
+from app.paginacao import LIMITE_MAXIMO, cortar_pagina, cabecalhos_paginacao
+from app.serializacao import para_json
+from app.versoes import etag_tabelas, nao_modificado, cabecalhos_etag
+
+router = APIRouter(prefix="/stats", tags=["Estatísticas"])
+
+
+# ============================================================
+# SCHEMAS
+# ============================================================
+class DistribuicaoSchema(BaseModel):
+    valor: Optional[str] = None
+    quantidade: int
+    model_config = {"from_attributes": True}
+
+
+class MediasClasseSchema(BaseModel):
+    classe: Optional[str] = None
+    quantidade: int
+    media_level: float
+    media_forca: float
+    media_mana: float
+    model_config = {"from_attributes": True}
+
+
+class ItemPopularSchema(BaseModel):
+    Id: int
+    Nome: str
+    quantidade: int
+    model_config = {"from_attributes": True}
+
+
+class PesoPersonagemSchema(BaseModel):
+    Id: int
+    Nome: str
+    peso_total: int
+    itens: int
+    model_config = {"from_attributes": True}
+
+
+# ============================================================
+# RESPOSTA COM ETAG + CACHE
+# ============================================================
+# Com os resumos mantidos por triggers cada consulta lê poucas linhas; o
+# resultado ainda fica no cache até a próxima escrita nas tabelas de origem,
+# então atualizar um dashboard sem mudanças custa só a checagem de versão.
+def _responder(request: Request, db: Session, tabelas, schema, montar_stmt, paginar_limit=None):
+    etag = etag_tabelas(db, tabelas)
+    if resposta := nao_modificado(request, etag):
+        return resposta
+    if em_cache := resposta_em_cache(request, etag):
+        return em_cache
+    linhas = db.execute(montar_stmt(usa_resumos(db))).all()
+    cabecalhos = cabecalhos_etag(etag)
+    if paginar_limit is not None:
+        linhas, proximo = cortar_pagina(linhas, paginar_limit)
+        cabecalhos.update(cabecalhos_paginacao(request, proximo))
+    return guardar_resposta(request, para_json(schema, linhas), tabelas, cabecalhos)
+
+
+# ============================================================
+# PERSONAGENS
+# ============================================================
+@router.get("/personagens/por-{dimensao}", response_model=List[DistribuicaoSchema])
+def distribuicao_personagens(dimensao: Literal["classe", "raca"], request: Request, db: Session = Depends(get_db)):
+    """Quantidade de personagens por Classe_Nome ou Raca_Nome"""
+    return _responder(
+        request, db, TABELAS_PERSONAGENS, DistribuicaoSchema,
+        lambda resumos: stmt_distribuicao(dimensao, resumos),
+    )
+
+
+@router.get("/classes/medias", response_model=List[MediasClasseSchema])
+def medias_por_classe(request: Request, db: Session = Depends(get_db)):
+    """Quantidade de personagens e médias de Level, Forca e Mana por classe"""
+    return _responder(request, db, TABELAS_PERSONAGENS, MediasClasseSchema, stmt_medias_classe)
+
+
+@router.get("/personagens/peso", response_model=List[PesoPersonagemSchema])
+def peso_por_personagem(
+    request: Request,
+    limit: int = Query(100, ge=1, le=LIMITE_MAXIMO, description="Quantidade máxima de personagens por página"),
+    after: Optional[int] = Query(None, description="Cursor: retorna personagens com Id maior que este"),
+    db: Session = Depends(get_db),
+):
+    """Peso total e quantidade de equipamentos carregados por personagem"""
+    return _responder(
+        request, db, TABELAS_PESO, PesoPersonagemSchema,
+        lambda resumos: stmt_peso(limit, after, resumos),
+        paginar_limit=limit,
+    )
+
+
+# ============================================================
+# MAGIAS, HABILIDADES E EQUIPAMENTOS MAIS USADOS
+# ============================================================
+def _registrar_populares(assoc):
+    tabelas = frozenset({assoc.tabela.name, assoc.model.__tablename__})
+
+    @router.get(f"/{assoc.recurso}/populares", response_model=List[ItemPopularSchema], name=f"{assoc.recurso}_populares")
+    def populares(
+        request: Request,
+        limit: int = Query(10, ge=1, le=LIMITE_MAXIMO, description="Quantidade de itens no ranking"),
+        db: Session = Depends(get_db),
+    ):
+        return _responder(
+            request, db, tabelas, ItemPopularSchema,
+            lambda resumos: stmt_populares(assoc, limit, resumos),
+        )
+
+    populares.__doc__ = f"{assoc.recurso.capitalize()} com mais personagens"
+
+
+for _assoc in ASSOCIACOES.values():
+    _registrar_populares(_assoc)
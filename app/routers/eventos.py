@@ -0,0 +1,102 @@
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from app.config import settings
+from app.eventos import Assinatura, feed_eventos, ler_recursos
+
+router = APIRouter(prefix="/events", tags=["Eventos"])
+
+
+def _recursos(valor: Optional[str]):
+    try:
+        return ler_recursos(valor.split(",") if valor else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _json(lote: dict) -> str:
+    return json.dumps(lote, separators=(",", ":"), ensure_ascii=False)
+
+
+# ============================================================
+# SERVER-SENT EVENTS
+# ============================================================
+# Cada lote sai como `event: alteracoes` com `id: <seq>`; ao reconectar, o
+# navegador reenvia Last-Event-ID e o feed retoma dali. Lotes com
+# "reset": true pedem para recarregar os recursos assinados.
+@router.get("")
+async def eventos_sse(
+    request: Request,
+    recursos: Optional[str] = Query(None, description="Recursos separados por vírgula (ex.: personagens,magias); vazio = todos"),
+    desde: Optional[int] = Query(None, description="Retoma a partir deste seq (padrão: cabeçalho Last-Event-ID)"),
+):
+    filtro = _recursos(recursos)
+    ultimo_id = request.headers.get("last-event-id", "")
+    if desde is None and ultimo_id.isdigit():
+        desde = int(ultimo_id)
+    assinatura = await feed_eventos.assinar(filtro, desde)
+
+    async def gerar():
+        try:
+            yield f"retry: 3000\nid: {assinatura.seq}\nevent: conectado\ndata: {_json({'seq': assinatura.seq})}\n\n"
+            while not assinatura.encerrada:
+                lote = await assinatura.proximo(settings.eventos_heartbeat)
+                if lote is None:
+                    yield ": ping\n\n"
+                    continue
+                yield f"id: {lote['seq']}\nevent: alteracoes\ndata: {_json(lote)}\n\n"
+        finally:
+            feed_eventos.cancelar(assinatura)
+
+    return StreamingResponse(
+        gerar(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ============================================================
+# WEBSOCKET
+# ============================================================
+# Mensagens do cliente: {"assinar": ["magias"]} e {"cancelar": ["personagens.magias"]}
+# mudam os recursos da conexão; o servidor envia os mesmos lotes do SSE.
+async def _enviar_lotes(websocket: WebSocket, assinatura: Assinatura):
+    await websocket.send_text(_json({"seq": assinatura.seq, "recursos": sorted(assinatura.recursos)}))
+    while not assinatura.encerrada:
+        lote = await assinatura.proximo(settings.eventos_heartbeat)
+        if lote is not None:
+            await websocket.send_text(_json(lote))
+    await websocket.close(code=1001)
+
+
+@router.websocket("/ws")
+async def eventos_websocket(websocket: WebSocket, recursos: Optional[str] = None, desde: Optional[int] = None):
+    await websocket.accept()
+    try:
+        filtro = ler_recursos(recursos.split(",") if recursos else None)
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+    assinatura = await feed_eventos.assinar(filtro, desde)
+    envio = asyncio.create_task(_enviar_lotes(websocket, assinatura))
+    try:
+        while True:
+            mensagem = await websocket.receive_json()
+            try:
+                if not isinstance(mensagem, dict):
+                    raise ValueError("Envie {\"assinar\": [...]} ou {\"cancelar\": [...]}")
+                if mensagem.get("assinar"):
+                    assinatura.recursos |= ler_recursos(mensagem["assinar"])
+                if mensagem.get("cancelar"):
+                    assinatura.recursos -= ler_recursos(mensagem["cancelar"])
+            except (TypeError, ValueError) as e:
+                await websocket.send_text(_json({"erro": str(e)}))
+                continue
+            await websocket.send_text(_json({"seq": assinatura.seq, "recursos": sorted(assinatura.recursos)}))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        envio.cancel()
+        feed_eventos.cancelar(assinatura)
@@ -0,0 +1,52 @@
+import hashlib
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.fichas import ler_ficha, ler_fichas
+from app.filtros import lista_ids
+from app.lote import LIMITE_LOTE
+from app.versoes import cabecalhos_etag, nao_modificado
+
+
+def _responder(request: Request, dados: str) -> Response:
+    # O ETag vem do próprio JSON gravado: nenhuma consulta além da leitura das fichas
+    etag = '"' + hashlib.blake2b(dados.encode(), digest_size=12).hexdigest() + '"'
+    if resposta := nao_modificado(request, etag):
+        return resposta
+    return Response(content=dados, media_type="application/json", headers=cabecalhos_etag(etag))
+
+
+def criar_router_fichas(schema) -> APIRouter:
+    """Fichas e pacotes (bundle) de personagens servidos da projeção Fichas (o mesmo router nos dois modos).
+
+    Incluído antes do CRUD: /personagens/bundle precisa ser registrado antes
+    de /personagens/{item_id}.
+    """
+    router = APIRouter(prefix="/personagens", tags=["Personagens"])
+
+    @router.get("/bundle", response_model=List[schema])
+    def obter_pacotes(
+        request: Request,
+        ids: str = Query(..., description="Ids separados por vírgula, ex.: 1,2,3"),
+        db: Session = Depends(get_db),
+    ):
+        """Vários personagens com magias, habilidades e equipamentos, na ordem de ids (404 se algum não existe)"""
+        ids = lista_ids(ids, LIMITE_LOTE)
+        encontradas = ler_fichas(db, schema, ids)
+        faltando = [personagem_id for personagem_id in ids if personagem_id not in encontradas]
+        if faltando:
+            raise HTTPException(status_code=404, detail=f"Personagens não encontrados: {faltando}")
+        # As fichas já são JSON: a lista é montada sem serializar de novo
+        return _responder(request, "[" + ",".join(encontradas[personagem_id] for personagem_id in ids) + "]")
+
+    @router.get("/{personagem_id}/sheet", response_model=schema)
+    @router.get("/{personagem_id}/bundle", response_model=schema)
+    def obter_ficha(personagem_id: int, request: Request, db: Session = Depends(get_db)):
+        """Ficha completa: personagem, raça, classe, equipamento, atributos, magias, habilidades e equipamentos"""
+        dados = ler_ficha(db, schema, personagem_id)
+        if dados is None:
+            raise HTTPException(status_code=404, detail="Personagem não encontrado")
+        return _responder(request, dados)
+
+    return router
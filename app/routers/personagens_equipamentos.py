@@ -1,9 +1,21 @@
 from typing import List
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Request
+from sqlalchemy.orm import Session, selectinload
+from app.associacoes import (
+    ASSOCIACOES,
+    adicionar_varios,
+    registrar_rotas_conjunto,
+    stmt_item_existe,
+    stmt_personagem_existe,
+    stmt_possui,
+    stmt_remover,
+)
+from app.cache import resposta_em_cache, guardar_resposta
 from app.database import get_db
 from app.models import PersonagensModel, EquipamentosModel
-from app.schemas import PersonagemSchema, EquipamentoSchema
+from app.serializacao import para_json
+from app.versoes import etag_tabelas, nao_modificado, cabecalhos_etag
+from app.schemas import EquipamentoSchema
 
 router = APIRouter(tags=["Personagens - Equipamentos"])
 
@@ -12,13 +24,28 @@ router = APIRouter(tags=["Personagens - Equipamentos"])
 # ENDPOINTS PARA EQUIPAMENTOS
 # ============================================================
 
+# PUT (substituir) e PATCH (adicionar/remover) com vários Ids de uma vez
+registrar_rotas_conjunto(router, ASSOCIACOES["equipamentos"], EquipamentoSchema)
+
+
 @router.get("/personagens/{personagem_id}/equipamentos", response_model=List[EquipamentoSchema])
-def listar_equipamentos_personagem(personagem_id: int, db: Session = Depends(get_db)):
+def listar_equipamentos_personagem(personagem_id: int, request: Request, db: Session = Depends(get_db)):
     """Lista todos os equipamentos de um personagem"""
-    personagem = db.query(PersonagensModel).filter(PersonagensModel.Id == personagem_id).first()
+    tabelas = ASSOCIACOES["equipamentos"].tabelas_leitura
+    etag = etag_tabelas(db, tabelas)
+    if resposta := nao_modificado(request, etag):
+        return resposta
+    if em_cache := resposta_em_cache(request, etag):
+        return em_cache
+    personagem = (
+        db.query(PersonagensModel)
+        .options(selectinload(PersonagensModel.equipamentos))
+        .filter(PersonagensModel.Id == personagem_id)
+        .first()
+    )
     if not personagem:
         raise HTTPException(status_code=404, detail="Personagem não encontrado")
-    return personagem.equipamentos
+    return guardar_resposta(request, para_json(EquipamentoSchema, personagem.equipamentos), tabelas, cabecalhos_etag(etag))
 
 
 @router.post("/personagens/{personagem_id}/equipamentos/{equipamento_id}")
@@ -28,19 +55,18 @@ def adicionar_equipamento_personagem(
     db: Session = Depends(get_db)
 ):
     """Adiciona um equipamento ao personagem"""
-    personagem = db.query(PersonagensModel).filter(PersonagensModel.Id == personagem_id).first()
-    if not personagem:
+    assoc = ASSOCIACOES["equipamentos"]
+    if not db.scalar(stmt_personagem_existe(personagem_id)):
         raise HTTPException(status_code=404, detail="Personagem não encontrado")
     
-    equipamento = db.query(EquipamentosModel).filter(EquipamentosModel.Id == equipamento_id).first()
-    if not equipamento:
+    if not db.scalar(stmt_item_existe(assoc, equipamento_id)):
         raise HTTPException(status_code=404, detail="Equipamento não encontrado")
     
-    # Verificar se já possui o equipamento
-    if equipamento in personagem.equipamentos:
+    # Verificar se já possui o equipamento (EXISTS pela chave da associação, sem carregar a coleção)
+    if db.scalar(stmt_possui(assoc, personagem_id, equipamento_id)):
         raise HTTPException(status_code=400, detail="Personagem já possui este equipamento")
     
-    personagem.equipamentos.append(equipamento)
+    adicionar_varios(db, assoc, personagem_id, [equipamento_id])
     db.commit()
     return {"detail": "Equipamento adicionado com sucesso"}
 
@@ -52,18 +78,16 @@ def remover_equipamento_personagem(
     db: Session = Depends(get_db)
 ):
     """Remove um equipamento do personagem"""
-    personagem = db.query(PersonagensModel).filter(PersonagensModel.Id == personagem_id).first()
-    if not personagem:
+    assoc = ASSOCIACOES["equipamentos"]
+    if not db.scalar(stmt_personagem_existe(personagem_id)):
         raise HTTPException(status_code=404, detail="Personagem não encontrado")
     
-    equipamento = db.query(EquipamentosModel).filter(EquipamentosModel.Id == equipamento_id).first()
-    if not equipamento:
+    if not db.scalar(stmt_item_existe(assoc, equipamento_id)):
         raise HTTPException(status_code=404, detail="Equipamento não encontrado")
     
-    # Verificar se possui o equipamento
-    if equipamento not in personagem.equipamentos:
+    # Verificar se possui o equipamento: o DELETE não afeta nenhuma linha
+    if not db.execute(stmt_remover(assoc, personagem_id, [equipamento_id])).rowcount:
         raise HTTPException(status_code=400, detail="Personagem não possui este equipamento")
     
-    personagem.equipamentos.remove(equipamento)
     db.commit()
     return {"detail": "Equipamento removido com sucesso"}
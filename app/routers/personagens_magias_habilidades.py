@@ -1,9 +1,21 @@
 from typing import List
-from fastapi import APIRouter, HTTPException, Depends, Body
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Request, Body
+from sqlalchemy.orm import Session, selectinload
+from app.associacoes import (
+    ASSOCIACOES,
+    adicionar_varios,
+    registrar_rotas_conjunto,
+    stmt_item_existe,
+    stmt_personagem_existe,
+    stmt_possui,
+    stmt_remover,
+)
+from app.cache import resposta_em_cache, guardar_resposta
 from app.database import get_db
 from app.models import PersonagensModel, MagiasModel, HabilidadesModel
-from app.schemas import PersonagemSchema, MagiaSchema, HabilidadeSchema
+from app.serializacao import para_json
+from app.versoes import etag_tabelas, nao_modificado, cabecalhos_etag
+from app.schemas import MagiaSchema, HabilidadeSchema
 
 router = APIRouter(tags=["Personagens - Magias e Habilidades"])
 
@@ -12,13 +24,28 @@ router = APIRouter(tags=["Personagens - Magias e Habilidades"])
 # ENDPOINTS PARA MAGIAS
 # ============================================================
 
+# PUT (substituir) e PATCH (adicionar/remover) com vários Ids de uma vez
+registrar_rotas_conjunto(router, ASSOCIACOES["magias"], MagiaSchema)
+
+
 @router.get("/personagens/{personagem_id}/magias", response_model=List[MagiaSchema])
-def listar_magias_personagem(personagem_id: int, db: Session = Depends(get_db)):
+def listar_magias_personagem(personagem_id: int, request: Request, db: Session = Depends(get_db)):
     """Lista todas as magias de um personagem"""
-    personagem = db.query(PersonagensModel).filter(PersonagensModel.Id == personagem_id).first()
+    tabelas = ASSOCIACOES["magias"].tabelas_leitura
+    etag = etag_tabelas(db, tabelas)
+    if resposta := nao_modificado(request, etag):
+        return resposta
+    if em_cache := resposta_em_cache(request, etag):
+        return em_cache
+    personagem = (
+        db.query(PersonagensModel)
+        .options(selectinload(PersonagensModel.magias))
+        .filter(PersonagensModel.Id == personagem_id)
+        .first()
+    )
     if not personagem:
         raise HTTPException(status_code=404, detail="Personagem não encontrado")
-    return personagem.magias
+    return guardar_resposta(request, para_json(MagiaSchema, personagem.magias), tabelas, cabecalhos_etag(etag))
 
 
 @router.post("/personagens/{personagem_id}/magias/{magia_id}")
@@ -28,19 +55,18 @@ def adicionar_magia_personagem(
     db: Session = Depends(get_db)
 ):
     """Adiciona uma magia ao personagem"""
-    personagem = db.query(PersonagensModel).filter(PersonagensModel.Id == personagem_id).first()
-    if not personagem:
+    assoc = ASSOCIACOES["magias"]
+    if not db.scalar(stmt_personagem_existe(personagem_id)):
         raise HTTPException(status_code=404, detail="Personagem não encontrado")
     
-    magia = db.query(MagiasModel).filter(MagiasModel.Id == magia_id).first()
-    if not magia:
+    if not db.scalar(stmt_item_existe(assoc, magia_id)):
         raise HTTPException(status_code=404, detail="Magia não encontrada")
     
-    # Verificar se já possui a magia
-    if magia in personagem.magias:
+    # Verificar se já possui a magia (EXISTS pela chave da associação, sem carregar a coleção)
+    if db.scalar(stmt_possui(assoc, personagem_id, magia_id)):
         raise HTTPException(status_code=400, detail="Personagem já possui esta magia")
     
-    personagem.magias.append(magia)
+    adicionar_varios(db, assoc, personagem_id, [magia_id])
     db.commit()
     return {"detail": "Magia adicionada com sucesso"}
 
@@ -52,19 +78,17 @@ def remover_magia_personagem(
     db: Session = Depends(get_db)
 ):
     """Remove uma magia do personagem"""
-    personagem = db.query(PersonagensModel).filter(PersonagensModel.Id == personagem_id).first()
-    if not personagem:
+    assoc = ASSOCIACOES["magias"]
+    if not db.scalar(stmt_personagem_existe(personagem_id)):
         raise HTTPException(status_code=404, detail="Personagem não encontrado")
     
-    magia = db.query(MagiasModel).filter(MagiasModel.Id == magia_id).first()
-    if not magia:
+    if not db.scalar(stmt_item_existe(assoc, magia_id)):
         raise HTTPException(status_code=404, detail="Magia não encontrada")
     
-    # Verificar se possui a magia
-    if magia not in personagem.magias:
+    # Verificar se possui a magia: o DELETE não afeta nenhuma linha
+    if not db.execute(stmt_remover(assoc, personagem_id, [magia_id])).rowcount:
         raise HTTPException(status_code=400, detail="Personagem não possui esta magia")
     
-    personagem.magias.remove(magia)
     db.commit()
     return {"detail": "Magia removida com sucesso"}
 
@@ -73,13 +97,28 @@ def remover_magia_personagem(
 # ENDPOINTS PARA HABILIDADES
 # ============================================================
 
+# PUT (substituir) e PATCH (adicionar/remover) com vários Ids de uma vez
+registrar_rotas_conjunto(router, ASSOCIACOES["habilidades"], HabilidadeSchema)
+
+
 @router.get("/personagens/{personagem_id}/habilidades", response_model=List[HabilidadeSchema])
-def listar_habilidades_personagem(personagem_id: int, db: Session = Depends(get_db)):
+def listar_habilidades_personagem(personagem_id: int, request: Request, db: Session = Depends(get_db)):
     """Lista todas as habilidades de um personagem"""
-    personagem = db.query(PersonagensModel).filter(PersonagensModel.Id == personagem_id).first()
+    tabelas = ASSOCIACOES["habilidades"].tabelas_leitura
+    etag = etag_tabelas(db, tabelas)
+    if resposta := nao_modificado(request, etag):
+        return resposta
+    if em_cache := resposta_em_cache(request, etag):
+        return em_cache
+    personagem = (
+        db.query(PersonagensModel)
+        .options(selectinload(PersonagensModel.habilidades))
+        .filter(PersonagensModel.Id == personagem_id)
+        .first()
+    )
     if not personagem:
         raise HTTPException(status_code=404, detail="Personagem não encontrado")
-    return personagem.habilidades
+    return guardar_resposta(request, para_json(HabilidadeSchema, personagem.habilidades), tabelas, cabecalhos_etag(etag))
 
 
 @router.post("/personagens/{personagem_id}/habilidades/{habilidade_id}")
@@ -89,19 +128,18 @@ def adicionar_habilidade_personagem(
     db: Session = Depends(get_db)
 ):
     """Adiciona uma habilidade ao personagem"""
-    personagem = db.query(PersonagensModel).filter(PersonagensModel.Id == personagem_id).first()
-    if not personagem:
+    assoc = ASSOCIACOES["habilidades"]
+    if not db.scalar(stmt_personagem_existe(personagem_id)):
         raise HTTPException(status_code=404, detail="Personagem não encontrado")
     
-    habilidade = db.query(HabilidadesModel).filter(HabilidadesModel.Id == habilidade_id).first()
-    if not habilidade:
+    if not db.scalar(stmt_item_existe(assoc, habilidade_id)):
         raise HTTPException(status_code=404, detail="Habilidade não encontrada")
     
-    # Verificar se já possui a habilidade
-    if habilidade in personagem.habilidades:
+    # Verificar se já possui a habilidade (EXISTS pela chave da associação, sem carregar a coleção)
+    if db.scalar(stmt_possui(assoc, personagem_id, habilidade_id)):
         raise HTTPException(status_code=400, detail="Personagem já possui esta habilidade")
     
-    personagem.habilidades.append(habilidade)
+    adicionar_varios(db, assoc, personagem_id, [habilidade_id])
     db.commit()
     return {"detail": "Habilidade adicionada com sucesso"}
 
@@ -113,18 +151,16 @@ def remover_habilidade_personagem(
     db: Session = Depends(get_db)
 ):
     """Remove uma habilidade do personagem"""
-    personagem = db.query(PersonagensModel).filter(PersonagensModel.Id == personagem_id).first()
-    if not personagem:
+    assoc = ASSOCIACOES["habilidades"]
+    if not db.scalar(stmt_personagem_existe(personagem_id)):
         raise HTTPException(status_code=404, detail="Personagem não encontrado")
     
-    habilidade = db.query(HabilidadesModel).filter(HabilidadesModel.Id == habilidade_id).first()
-    if not habilidade:
+    if not db.scalar(stmt_item_existe(assoc, habilidade_id)):
         raise HTTPException(status_code=404, detail="Habilidade não encontrada")
     
-    # Verificar se possui a habilidade
-    if habilidade not in personagem.habilidades:
+    # Verificar se possui a habilidade: o DELETE não afeta nenhuma linha
+    if not db.execute(stmt_remover(assoc, personagem_id, [habilidade_id])).rowcount:
         raise HTTPException(status_code=400, detail="Personagem não possui esta habilidade")
     
-    personagem.habilidades.remove(habilidade)
     db.commit()
     return {"detail": "Habilidade removida com sucesso"}
@@ -0,0 +1,77 @@
+import tempfile
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from app.transferencia import (
+    FORMATOS,
+    TABELAS,
+    FormatoIndisponivel,
+    Importador,
+    conferir_formato,
+    exportar,
+)
+
+router = APIRouter(tags=["Importação e exportação"])
+
+# Upload guardado em memória até este tamanho; acima disso vai para um arquivo temporário
+LIMITE_MEMORIA_UPLOAD = 8 * 1024 * 1024
+
+
+def _conferir(recurso: str, formato: str):
+    if recurso not in TABELAS:
+        raise HTTPException(status_code=404, detail=f"Recurso desconhecido: {recurso}. Opções: {', '.join(TABELAS)}")
+    try:
+        conferir_formato(formato)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FormatoIndisponivel as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+
+def _formato_do_conteudo(request: Request) -> Optional[str]:
+    tipo = request.headers.get("content-type", "").split(";")[0].strip()
+    for formato, media_type in FORMATOS.items():
+        if media_type.split(";")[0] == tipo:
+            return formato
+    return None
+
+
+@router.get("/export/{recurso}")
+def exportar_recurso(recurso: str, formato: str = Query("ndjson", description="ndjson, csv ou parquet")):
+    """Tabela inteira em streaming (cursor no servidor, memória constante), sem Versao"""
+    _conferir(recurso, formato)
+    return StreamingResponse(
+        exportar(recurso, formato),
+        media_type=FORMATOS[formato],
+        headers={"Content-Disposition": f'attachment; filename="{recurso}.{formato}"'},
+    )
+
+
+@router.post("/import/{recurso}")
+async def importar_recurso(
+    request: Request,
+    recurso: str,
+    formato: Optional[str] = Query(None, description="ndjson, csv ou parquet (padrão: pelo Content-Type)"),
+    modo: Literal["manter", "novos"] = Query("manter", description="manter: upsert pelos Ids do arquivo; novos: Ids gerados pelo banco"),
+    referencias_existentes: Optional[str] = Query(
+        None, description="modo novos: recursos (separados por vírgula) cujas FKs já trazem Ids do banco, ex.: racas,classes",
+    ),
+):
+    """Corpo da requisição = o arquivo (ex.: curl --data-binary @personagens.csv -H 'Content-Type: text/csv')"""
+    formato = formato or _formato_do_conteudo(request) or "ndjson"
+    _conferir(recurso, formato)
+    # Cada requisição é uma execução: no modo novos nenhum mapa de Ids vem de chamadas anteriores
+    try:
+        importador = Importador(
+            modo=modo,
+            referencias_existentes=[nome.strip() for nome in (referencias_existentes or "").split(",") if nome.strip()],
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    with tempfile.SpooledTemporaryFile(max_size=LIMITE_MEMORIA_UPLOAD) as arquivo:
+        async for pedaco in request.stream():
+            arquivo.write(pedaco)
+        arquivo.seek(0)
+        # Leitura e gravação em blocos fora do event loop
+        return await run_in_threadpool(importador.importar_arquivo, recurso, arquivo, formato)
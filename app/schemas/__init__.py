@@ -12,6 +12,7 @@ class MagiaSchema(BaseModel):
     CustoMana: Optional[int] = None
     Cooldown: Optional[int] = None
     Efeito: Optional[str] = None
+    Versao: Optional[int] = None  # Controle otimista (If-Match)
     
     model_config = {"from_attributes": True}
 
@@ -30,7 +31,8 @@ class MagiaCreateSchema(BaseModel):
 
 class MagiaUpdateSchema(BaseModel):
     """Schema para atualização de magia"""
-    Nome: Optional[str] = None
+    # Pode faltar, mas não vir como null (coluna NOT NULL): o default None não é validado
+    Nome: str = None
     Descricao: Optional[str] = None
     Categoria: Optional[str] = None
     Nivel: Optional[int] = None
@@ -49,6 +51,7 @@ class HabilidadeSchema(BaseModel):
     Icone: Optional[str] = None
     Efeito: Optional[str] = None
     Dano: Optional[int] = None
+    Versao: Optional[int] = None
     
     model_config = {"from_attributes": True}
 
@@ -66,7 +69,7 @@ class HabilidadeCreateSchema(BaseModel):
 
 class HabilidadeUpdateSchema(BaseModel):
     """Schema para atualização de habilidade"""
-    Nome: Optional[str] = None
+    Nome: str = None
     Descricao: Optional[str] = None
     Tipo: Optional[str] = None
     Cooldown: Optional[int] = None
@@ -80,6 +83,7 @@ class RacaSchema(BaseModel):
     Nome: str
     Passiva: Optional[str] = None
     Caracteristica: Optional[str] = None
+    Versao: Optional[int] = None
     
     model_config = {"from_attributes": True}
 
@@ -90,6 +94,7 @@ class ClasseSchema(BaseModel):
     Descricao: Optional[str] = None
     habilidades: Optional[HabilidadeSchema] = None
     magias: Optional[MagiaSchema] = None
+    Versao: Optional[int] = None
     
     model_config = {"from_attributes": True}
 
@@ -99,6 +104,7 @@ class AtributoSchema(BaseModel):
     Nome: str
     Descricao: Optional[str] = None
     Quantidade: int
+    Versao: Optional[int] = None
     
     model_config = {"from_attributes": True}
 
@@ -114,6 +120,7 @@ class EquipamentoSchema(BaseModel):
     Defesa: Optional[int] = None
     Bonus: Optional[int] = None
     Peso: Optional[int] = None
+    Versao: Optional[int] = None
     
     model_config = {"from_attributes": True}
 
@@ -144,10 +151,20 @@ class PersonagemCreateSchema(BaseModel):
     Historia: Optional[str] = None
     Tendencia: Optional[str] = None
     Level: Optional[int] = 1
-    Strength: Optional[int] = 10
-    Agility: Optional[int] = 10
-    Intelligence: Optional[int] = 10
-    Health: Optional[int] = 100
+    Vida: Optional[int] = 100
+    Forca: Optional[int] = 10
+    Destreza: Optional[int] = 10
+    Constituicao: Optional[int] = 10
+    Inteligencia: Optional[int] = 10
+    Sabedoria: Optional[int] = 10
+    Mana: Optional[int] = 100
+    Carisma: Optional[int] = 10
+    Sorte: Optional[int] = 10
+    Reputacao: Optional[int] = 0
+    CA: Optional[int] = 10
+    Deslocamento: Optional[int] = 30
+    Classe_Nome: Optional[str] = "Guerreiro"
+    Raca_Nome: Optional[str] = "Humano"
     Raca_id: Optional[int] = None
     Classe_id: Optional[int] = None
     Equipamento_id: Optional[int] = None
@@ -155,14 +172,30 @@ class PersonagemCreateSchema(BaseModel):
 
 class PersonagemUpdateSchema(BaseModel):
     """Schema para atualização de personagem (sem relacionamentos aninhados)"""
-    Nome: Optional[str] = None
+    Nome: str = None
     Historia: Optional[str] = None
     Tendencia: Optional[str] = None
     Level: Optional[int] = None
-    Strength: Optional[int] = None
-    Agility: Optional[int] = None
-    Intelligence: Optional[int] = None
-    Health: Optional[int] = None
+    Vida: Optional[int] = None
+    Forca: Optional[int] = None
+    Destreza: Optional[int] = None
+    Constituicao: Optional[int] = None
+    Inteligencia: Optional[int] = None
+    Sabedoria: Optional[int] = None
+    Mana: Optional[int] = None
+    Carisma: Optional[int] = None
+    Sorte: Optional[int] = None
+    Reputacao: Optional[int] = None
+    CA: Optional[int] = None
+    Deslocamento: Optional[int] = None
+    Classe_Nome: Optional[str] = None
+    Raca_Nome: Optional[str] = None
     Raca_id: Optional[int] = None
     Classe_id: Optional[int] = None
     Equipamento_id: Optional[int] = None
+
+
+class AssociacaoDiffSchema(BaseModel):
+    """Schema para adicionar/remover vários itens de uma coleção do personagem"""
+    adicionar: List[int] = []
+    remover: List[int] = []
@@ -0,0 +1,35 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as RespostaPadrao
+except ImportError:  # orjson é opcional
+    RespostaPadrao = JSONResponse
+
+
+# ============================================================
+# SERIALIZAÇÃO DIRETA PARA BYTES JSON
+# ============================================================
+# Com response_model, o FastAPI converte o ORM em modelo Pydantic, valida
+# de novo, gera dicts com jsonable_encoder e só então chama json.dumps.
+# As rotas de leitura retornam os bytes prontos: uma validação
+# (from_attributes) e um dump_json feito em Rust pelo pydantic-core. O
+# response_model continua nas rotas e mantém o OpenAPI igual.
+@lru_cache(maxsize=None)
+def _adaptador(schema, lista: bool) -> TypeAdapter:
+    return TypeAdapter(List[schema] if lista else schema)
+
+
+def para_json(schema, dados: Any, lista: bool = True) -> bytes:
+    """Valida objetos ORM com o schema (from_attributes) e gera os bytes JSON em uma passada"""
+    adaptador = _adaptador(schema, lista)
+    return adaptador.dump_json(adaptador.validate_python(dados, from_attributes=True))
+
+
+def resposta_json(schema, dados: Any, lista: bool = True, cabecalhos: Optional[Dict[str, str]] = None) -> Response:
+    """Response com os bytes de para_json; o FastAPI não revalida respostas prontas"""
+    return Response(content=para_json(schema, dados, lista), media_type="application/json", headers=cabecalhos)
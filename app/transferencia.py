@@ -0,0 +1,376 @@
+import csv
+import io
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Set
+from sqlalchemy import Integer, insert, select
+from sqlalchemy.exc import IntegrityError
+from app.database import engine
+from app.models import (
+    RacasModel,
+    MagiasModel,
+    HabilidadesModel,
+    ClasseModel,
+    PersonagensModel,
+    AtributosModel,
+    EquipamentosModel,
+    personagem_magias,
+    personagem_habilidades,
+    personagem_equipamentos,
+)
+
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # orjson é opcional
+    import json
+
+    def _dumps(dados) -> bytes:
+        return json.dumps(dados, ensure_ascii=False, separators=(",", ":")).encode()
+
+    _loads = json.loads
+
+
+# ============================================================
+# RECURSOS E FORMATOS
+# ============================================================
+# Em ordem de dependência: importar nesta ordem resolve todas as FKs
+TABELAS = {
+    "racas": RacasModel.__table__,
+    "magias": MagiasModel.__table__,
+    "habilidades": HabilidadesModel.__table__,
+    "equipamentos": EquipamentosModel.__table__,
+    "classes": ClasseModel.__table__,
+    "personagens": PersonagensModel.__table__,
+    "atributos": AtributosModel.__table__,
+    "personagem_magias": personagem_magias,
+    "personagem_habilidades": personagem_habilidades,
+    "personagem_equipamentos": personagem_equipamentos,
+}
+
+FORMATOS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+MODOS = ("manter", "novos")
+
+# Linhas por leitura do cursor na exportação e por transação na importação
+BLOCO_EXPORTACAO = 5000
+BLOCO_IMPORTACAO = 20000
+
+# Erros detalhados no resumo da importação (o total continua sendo contado)
+LIMITE_ERROS = 100
+
+
+class FormatoIndisponivel(Exception):
+    """Parquet sem o pyarrow instalado"""
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise FormatoIndisponivel("Parquet requer o pacote pyarrow (pip install pyarrow)")
+    return pyarrow, pyarrow.parquet
+
+
+def formato_do_nome(nome: str) -> Optional[str]:
+    """ndjson/csv/parquet pela extensão do arquivo (.jsonl também vale como ndjson)"""
+    extensao = nome.rsplit(".", 1)[-1].lower() if "." in nome else ""
+    return {"jsonl": "ndjson"}.get(extensao, extensao if extensao in FORMATOS else None)
+
+
+def conferir_formato(formato: str):
+    """ValueError para formato desconhecido; FormatoIndisponivel sem pyarrow"""
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconhecido: {formato}. Opções: {', '.join(FORMATOS)}")
+    if formato == "parquet":
+        _pyarrow()
+
+
+def colunas(tabela) -> list:
+    """Colunas transferidas; Versao é controle de concorrência local e recomeça em 1"""
+    return [coluna for coluna in tabela.columns if coluna.name != "Versao"]
+
+
+# ============================================================
+# EXPORTAÇÃO (STREAMING, MEMÓRIA CONSTANTE)
+# ============================================================
+def _escrever_ndjson(nomes: List[str], blocos) -> Iterator[bytes]:
+    for bloco in blocos:
+        yield b"".join(_dumps(dict(zip(nomes, linha))) + b"\n" for linha in bloco)
+
+
+def _escrever_csv(nomes: List[str], blocos) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, lineterminator="\n")
+    escritor.writerow(nomes)
+    for bloco in blocos:
+        escritor.writerows(bloco)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _Saida(io.RawIOBase):
+    """Arquivo só de escrita que o ParquetWriter enche e o gerador esvazia a cada row group"""
+
+    def __init__(self):
+        self._pedacos: List[bytes] = []
+        self._posicao = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, dados) -> int:
+        self._pedacos.append(bytes(dados))
+        self._posicao += len(dados)
+        return len(dados)
+
+    def tell(self) -> int:
+        return self._posicao
+
+    def esvaziar(self) -> bytes:
+        dados, self._pedacos = b"".join(self._pedacos), []
+        return dados
+
+
+def _escrever_parquet(nomes: List[str], blocos, tipos) -> Iterator[bytes]:
+    pa, pq = _pyarrow()
+    schema = pa.schema([
+        (nome, pa.int64() if isinstance(tipo, Integer) else pa.string()) for nome, tipo in zip(nomes, tipos)
+    ])
+    saida = _Saida()
+    escritor = pq.ParquetWriter(saida, schema)
+    try:
+        for bloco in blocos:
+            colunas_bloco = list(zip(*bloco))
+            escritor.write_table(pa.Table.from_arrays(
+                [pa.array(valores, type=campo.type) for valores, campo in zip(colunas_bloco, schema)], schema=schema,
+            ))
+            yield saida.esvaziar()
+    finally:
+        escritor.close()
+    yield saida.esvaziar()
+
+
+def exportar(recurso: str, formato: str, engine=engine) -> Iterator[bytes]:
+    """Gera o arquivo em pedaços, lendo a tabela com cursor no servidor (yield_per)"""
+    tabela = TABELAS[recurso]
+    selecionadas = colunas(tabela)
+    nomes = [str(coluna.name) for coluna in selecionadas]
+    stmt = select(*selecionadas).order_by(*tabela.primary_key.columns)
+    with engine.connect() as conexao:
+        resultado = conexao.execution_options(stream_results=True, yield_per=BLOCO_EXPORTACAO).execute(stmt)
+        blocos = resultado.partitions()
+        if formato == "ndjson":
+            yield from _escrever_ndjson(nomes, blocos)
+        elif formato == "csv":
+            yield from _escrever_csv(nomes, blocos)
+        else:
+            yield from _escrever_parquet(nomes, blocos, [coluna.type for coluna in selecionadas])
+
+
+# ============================================================
+# LEITURA INCREMENTAL DOS ARQUIVOS
+# ============================================================
+class LinhaInvalida:
+    """Linha que nem chegou a virar objeto (JSON quebrado); vira erro no resumo"""
+
+    def __init__(self, motivo: str):
+        self.motivo = motivo
+
+
+def _ler_ndjson(arquivo: IO[bytes]) -> Iterator[Any]:
+    for linha in arquivo:
+        if not linha.strip():
+            continue
+        try:
+            yield _loads(linha)
+        except ValueError as e:
+            yield LinhaInvalida(f"JSON inválido: {e}")
+
+
+def _ler_csv(arquivo: IO[bytes]) -> Iterator[Any]:
+    texto = io.TextIOWrapper(arquivo, encoding="utf-8-sig", newline="")
+    try:
+        # Célula vazia vira NULL
+        for linha in csv.DictReader(texto):
+            yield {chave: valor if valor != "" else None for chave, valor in linha.items()}
+    finally:
+        texto.detach()
+
+
+def _ler_parquet(arquivo: IO[bytes]) -> Iterator[Any]:
+    _, pq = _pyarrow()
+    for lote in pq.ParquetFile(arquivo).iter_batches(batch_size=BLOCO_EXPORTACAO):
+        yield from lote.to_pylist()
+
+
+LEITORES = {"ndjson": _ler_ndjson, "csv": _ler_csv, "parquet": _ler_parquet}
+
+
+# ============================================================
+# IMPORTAÇÃO EM BLOCOS
+# ============================================================
+def _stmt_gravar(tabela, dialeto: str, nomes: List[str]):
+    """Modo manter: upsert pelo Id (entidades) ou ON CONFLICT DO NOTHING (associações)"""
+    if dialeto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as insert_dialeto
+    elif dialeto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as insert_dialeto
+    else:
+        # Sem ON CONFLICT: Ids repetidos derrubam o bloco
+        return insert(tabela)
+    stmt = insert_dialeto(tabela)
+    if "Id" not in tabela.c:
+        return stmt.on_conflict_do_nothing()
+    atualizar = {nome: stmt.excluded[nome] for nome in nomes if nome != "Id"}
+    if "Versao" in tabela.c:
+        atualizar["Versao"] = tabela.c.Versao + 1
+    return stmt.on_conflict_do_update(index_elements=[tabela.c.Id], set_=atualizar)
+
+
+class Importador:
+    """Importa linhas em blocos (uma transação por bloco), resolvendo FKs em memória.
+
+    - modo "manter": os Ids do arquivo são mantidos (upsert); reimportar é idempotente
+    - modo "novos": o banco gera Ids novos e guarda Id de origem -> Id novo por tabela;
+      FKs para tabelas importadas na mesma execução (o mesmo Importador) são traduzidas
+      por esse mapa. Sem mapa a FK é erro da linha: o Id de origem não diz nada sobre
+      os Ids do banco, a menos que a tabela esteja em referencias_existentes (recursos
+      cujas FKs já vêm com Ids do banco, ex.: o catálogo de raças já cadastrado)
+
+    Os Ids existentes de cada tabela referenciada são lidos uma vez e
+    atualizados a cada bloco gravado, então FKs inválidas viram erros da
+    linha sem nenhuma consulta extra.
+    """
+
+    def __init__(
+        self, engine=engine, modo: str = "manter", tamanho_bloco: int = BLOCO_IMPORTACAO,
+        referencias_existentes: Iterable[str] = (),
+    ):
+        if modo not in MODOS:
+            raise ValueError(f"Modo desconhecido: {modo}. Opções: {', '.join(MODOS)}")
+        desconhecidos = [recurso for recurso in referencias_existentes if recurso not in TABELAS]
+        if desconhecidos:
+            raise ValueError(f"Recursos desconhecidos: {', '.join(desconhecidos)}. Opções: {', '.join(TABELAS)}")
+        self.engine = engine
+        self.modo = modo
+        self.referencias_existentes = {TABELAS[recurso].name for recurso in referencias_existentes}
+        self.tamanho_bloco = tamanho_bloco
+        self.mapas: Dict[str, Dict[int, int]] = {}
+        self._existentes: Dict[str, Set[int]] = {}
+
+    def _ids(self, tabela) -> Set[int]:
+        if tabela.name not in self._existentes:
+            with self.engine.connect() as conexao:
+                self._existentes[tabela.name] = set(conexao.scalars(select(tabela.c.Id)))
+        return self._existentes[tabela.name]
+
+    def _campos(self, selecionadas) -> List[tuple]:
+        """(nome, padrão, inteiro?, obrigatório?, tabela referida) de cada coluna, calculado uma vez por recurso"""
+        campos = []
+        for coluna in selecionadas:
+            padrao = coluna.default.arg if coluna.default is not None and coluna.default.is_scalar else None
+            # No modo novos o Id de origem é opcional (só serve para traduzir FKs)
+            obrigatorio = not coluna.nullable and not (coluna.name == "Id" and self.modo == "novos")
+            referida = next(iter(coluna.foreign_keys)).column.table if coluna.foreign_keys else None
+            campos.append((coluna.name, padrao, isinstance(coluna.type, Integer), obrigatorio, referida))
+        return campos
+
+    def _resolver(self, nome: str, referida, valor: int) -> int:
+        mapa = self.mapas.get(referida.name)
+        if mapa is not None:
+            if valor not in mapa:
+                raise ValueError(f"{nome}={valor} não está entre os {referida.name} importados")
+            return mapa[valor]
+        if self.modo == "novos" and referida.name not in self.referencias_existentes:
+            raise ValueError(
+                f"{nome}={valor}: {referida.name} não foi importada nesta execução; importe-a junto "
+                f"ou indique em referencias_existentes que o Id já é do banco"
+            )
+        if valor not in self._ids(referida):
+            raise ValueError(f"{nome}={valor} não existe em {referida.name}")
+        return valor
+
+    def _converter(self, campos: List[tuple], linha) -> dict:
+        if isinstance(linha, LinhaInvalida):
+            raise ValueError(linha.motivo)
+        if not isinstance(linha, dict):
+            raise ValueError("Cada linha deve ser um objeto")
+        valores = {}
+        for nome, padrao, inteiro, obrigatorio, referida in campos:
+            valor = linha.get(nome, padrao)
+            if valor is None:
+                if obrigatorio:
+                    raise ValueError(f"{nome} é obrigatório")
+            else:
+                if inteiro:
+                    try:
+                        valor = int(valor)
+                    except (TypeError, ValueError):
+                        raise ValueError(f"{nome} deve ser inteiro (recebido {valor!r})")
+                if referida is not None:
+                    valor = self._resolver(nome, referida, valor)
+            valores[nome] = valor
+        return valores
+
+    def _gravar(self, tabela, bloco: List[tuple], resumo: dict):
+        linhas = [valores for _, valores in bloco]
+        entidade = "Id" in tabela.c
+        try:
+            with self.engine.begin() as conexao:
+                if self.modo == "novos" and entidade:
+                    origem = [linha.pop("Id") for linha in linhas]
+                    stmt = insert(tabela).returning(tabela.c.Id, sort_by_parameter_order=True)
+                    novos = conexao.scalars(stmt, linhas).all()
+                    mapa = self.mapas.setdefault(tabela.name, {})
+                    mapa.update((antigo, novo) for antigo, novo in zip(origem, novos) if antigo is not None)
+                    gravados = novos
+                else:
+                    conexao.execute(_stmt_gravar(tabela, conexao.dialect.name, list(linhas[0])), linhas)
+                    gravados = [linha["Id"] for linha in linhas] if entidade else []
+        except IntegrityError as e:
+            self._erro(resumo, bloco[0][0], f"Bloco até a linha {bloco[-1][0]} rejeitado: {e.orig}")
+            return
+        resumo["gravadas"] += len(linhas)
+        if tabela.name in self._existentes:
+            self._existentes[tabela.name].update(gravados)
+
+    @staticmethod
+    def _erro(resumo: dict, numero: int, motivo: str):
+        resumo["total_erros"] += 1
+        if len(resumo["erros"]) < LIMITE_ERROS:
+            resumo["erros"].append({"linha": numero, "detail": motivo})
+
+    def importar(self, recurso: str, linhas: Iterable[Any]) -> dict:
+        """Grava as linhas de um recurso e devolve o resumo (linhas lidas, gravadas e erros)"""
+        tabela = TABELAS[recurso]
+        campos = self._campos(colunas(tabela))
+        if self.modo == "novos" and "Id" in tabela.c:
+            self.mapas.setdefault(tabela.name, {})
+        resumo = {"recurso": recurso, "linhas": 0, "gravadas": 0, "total_erros": 0, "erros": []}
+        bloco = []
+        for numero, linha in enumerate(linhas, 1):
+            resumo["linhas"] += 1
+            try:
+                bloco.append((numero, self._converter(campos, linha)))
+            except ValueError as e:
+                self._erro(resumo, numero, str(e))
+                continue
+            if len(bloco) >= self.tamanho_bloco:
+                self._gravar(tabela, bloco, resumo)
+                bloco = []
+        if bloco:
+            self._gravar(tabela, bloco, resumo)
+        return resumo
+
+    def importar_arquivo(self, recurso: str, arquivo: IO[bytes], formato: str) -> dict:
+        conferir_formato(formato)
+        return self.importar(recurso, LEITORES[formato](arquivo))
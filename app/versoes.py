@@ -0,0 +1,154 @@
+import hashlib
+import re
+import uuid
+from typing import Dict, Iterable, Optional
+from fastapi import Request, Response
+from sqlalchemy import Column, Integer, String, Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.alteracoes import ao_confirmar
+from app.database import Base
+
+
+# ============================================================
+# CONTADOR DE VERSÃO POR TABELA
+# ============================================================
+# No SQLite, triggers incrementam Versoes_Tabelas na mesma transação da
+# escrita, então todos os workers (e escritas feitas fora da API) enxergam
+# a mesma versão. Em outros bancos os contadores ficam em memória,
+# atualizados após cada commit, e o ETag inclui um identificador do
+# processo para nunca coincidir entre workers diferentes.
+versoes_tabelas = Table(
+    "Versoes_Tabelas",
+    Base.metadata,
+    Column("Tabela", String(100), primary_key=True),
+    Column("Versao", Integer, nullable=False, default=0),
+)
+
+_contadores_no_banco = False
+_versoes_locais: Dict[str, int] = {}
+_INSTANCIA = uuid.uuid4().hex
+
+
+@ao_confirmar
+def _incrementar_locais(tabelas):
+    for tabela in tabelas:
+        _versoes_locais[tabela] = _versoes_locais.get(tabela, 0) + 1
+
+
+def criar_contadores_versao(engine, tabelas: Iterable[str]):
+    """Cria (se não existirem) os triggers que versionam cada tabela no SQLite"""
+    global _contadores_no_banco
+    if engine.dialect.name != "sqlite":
+        return
+
+    versoes = versoes_tabelas.name
+    with engine.begin() as conn:
+        for tabela in tabelas:
+            if tabela == versoes:
+                continue
+            for operacao in ("INSERT", "UPDATE", "DELETE"):
+                conn.exec_driver_sql(
+                    f'CREATE TRIGGER IF NOT EXISTS "{tabela}_versao_{operacao.lower()}" '
+                    f'AFTER {operacao} ON "{tabela}" BEGIN '
+                    f'INSERT INTO "{versoes}"("Tabela", "Versao") VALUES (\'{tabela}\', 1) '
+                    f'ON CONFLICT("Tabela") DO UPDATE SET "Versao" = "Versao" + 1; END'
+                )
+    _contadores_no_banco = True
+
+
+def detectar_contadores_versao(engine):
+    """Usa os contadores do banco se os triggers já existirem (sem DDL)"""
+    global _contadores_no_banco
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.connect() as conn:
+        _contadores_no_banco = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name LIKE '%\\_versao\\_insert' ESCAPE '\\'"
+        ).first() is not None
+
+
+def _stmt_versoes(tabelas):
+    return select(versoes_tabelas.c.Tabela, versoes_tabelas.c.Versao).where(
+        versoes_tabelas.c.Tabela.in_(sorted(tabelas))
+    )
+
+
+def _etag(versoes: Dict[str, int], tabelas) -> str:
+    base = ";".join(f"{tabela}={versoes.get(tabela, 0)}" for tabela in sorted(tabelas))
+    if not _contadores_no_banco:
+        base = f"{_INSTANCIA};{base}"
+    return '"' + hashlib.blake2b(base.encode(), digest_size=12).hexdigest() + '"'
+
+
+# ============================================================
+# ETAG E REQUISIÇÕES CONDICIONAIS
+# ============================================================
+# O ETag deve ser calculado ANTES de ler os dados: se um commit acontecer no
+# meio, a resposta leva um ETag antigo com dados novos (no pior caso o
+# cliente baixa de novo), nunca o contrário.
+def etag_tabelas(db: Session, tabelas) -> str:
+    """ETag forte a partir das versões das tabelas lidas pela resposta"""
+    if not _contadores_no_banco:
+        return _etag(_versoes_locais, tabelas)
+    return _etag(dict(db.execute(_stmt_versoes(tabelas)).all()), tabelas)
+
+
+async def etag_tabelas_async(db: AsyncSession, tabelas) -> str:
+    """Versão de etag_tabelas para AsyncSession"""
+    if not _contadores_no_banco:
+        return _etag(_versoes_locais, tabelas)
+    return _etag(dict((await db.execute(_stmt_versoes(tabelas))).all()), tabelas)
+
+
+def etag_item(versao: int, versao_tabelas: str) -> str:
+    """ETag do detalhe de um registro: "<Versao>-<hash de etag_tabelas>".
+
+    A Versao é da própria linha (o If-Match só confere ela: escritas em
+    outras linhas não dão 412); as versões das tabelas cobrem as relações
+    aninhadas. Sai de um SELECT Versao + Versoes_Tabelas, então o 304 não
+    precisa carregar o registro.
+    """
+    return f'"{versao}-{hashlib.blake2b(versao_tabelas.encode(), digest_size=8).hexdigest()}"'
+
+
+def cabecalhos_etag(etag: str) -> Dict[str, str]:
+    """ETag + Cache-Control: o cliente pode guardar, mas revalida a cada uso"""
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+# Um corpo comprimido é outra representação e leva outro ETag forte: o
+# middleware de compressão (app.compressao) acrescenta a codificação, "x" -> "x-gzip".
+_SUFIXO_CODIFICACAO = re.compile(r'-(?:gzip|br|zstd)"$')
+
+
+def etag_codificado(etag: str, codificacao: str) -> str:
+    """ETag da representação comprimida: "x" -> "x-gzip" (W/"x" -> W/"x-gzip")"""
+    return f'{etag[:-1]}-{codificacao}"' if etag.endswith('"') else etag
+
+
+def _corresponde(request: Request, etag: str) -> Optional[str]:
+    """Tag do If-None-Match que ainda vale para etag (None se nenhuma)"""
+    valor = request.headers.get("if-none-match")
+    if not valor:
+        return None
+    if valor.strip() == "*":
+        return etag
+    # If-None-Match usa comparação fraca: W/"x" e "x-gzip" equivalem a "x"
+    for tag in valor.split(","):
+        tag = tag.strip()
+        if _SUFIXO_CODIFICACAO.sub('"', tag.removeprefix("W/")) == etag:
+            return tag
+    return None
+
+
+def nao_modificado(request: Request, etag: str) -> Optional[Response]:
+    """Resposta 304 quando o If-None-Match do cliente ainda é válido.
+
+    O 304 devolve a tag que o cliente mandou: é o validador da representação
+    (comprimida ou não) que ele tem guardada.
+    """
+    tag = _corresponde(request, etag)
+    if tag is None:
+        return None
+    return Response(status_code=304, headers=cabecalhos_etag(tag))
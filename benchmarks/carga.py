@@ -0,0 +1,274 @@
+"""Teste de carga da API com dados sintéticos (1k / 100k / 1M personagens).
+
+Uso (na raiz do projeto):
+    python -m benchmarks.carga --tamanho 1k
+    python -m benchmarks.carga --tamanho 100k --modo ambos --saida resultados/atual.json
+    python -m benchmarks.carga --tamanho 100k --comparar resultados/base.json --tolerancia 0.15
+
+Gera um banco SQLite temporário (benchmarks/dados.py) e mede cada cenário
+(listagem, busca, detalhe, ficha, busca por ids, pacotes, associações,
+criação, lote) de dois jeitos:
+- asgi: o app FastAPI no mesmo processo, via httpx.ASGITransport
+- uvicorn: um servidor local (run.py --producao) acessado por HTTP
+
+Para cada cenário reporta p50/p99 (ms) e requisições por segundo, além do
+pico de memória (RSS) do processo que atende. Com --saida grava o JSON; com
+--comparar confronta com um JSON anterior e termina com código 1 se algum
+cenário piorar além da tolerância.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+_pasta = tempfile.mkdtemp(prefix="rpg_carga_")
+BANCO = os.path.join(_pasta, "carga.db")
+os.environ["RPG_DATABASE_URL"] = f"sqlite:///{BANCO}"
+os.environ["RPG_INICIALIZAR_BANCO"] = "false"
+
+import httpx  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import engine  # noqa: E402
+from app.inicializacao import preparar_banco  # noqa: E402
+from benchmarks.dados import CATALOGO, gerar_dados, quantidade  # noqa: E402
+
+
+# ============================================================
+# CENÁRIOS
+# ============================================================
+# Cada cenário monta a i-ésima requisição: (método, caminho, corpo JSON).
+# Leituras vêm antes das escritas para não medir listas que cresceram.
+def _id(i: int, n: int) -> int:
+    return (i * 7919) % n + 1
+
+
+def _ids(i: int, n: int, k: int = 20) -> str:
+    return ",".join(str(_id(i * k + j, n)) for j in range(k))
+
+
+CENARIOS = {
+    "listar": lambda i, n: ("GET", f"/personagens/?limit=100&after={(i * 997) % max(n - 100, 1)}", None),
+    "listar_filtro": lambda i, n: ("GET", f"/personagens/?Classe_Nome=Mago&Level_min={i % 20}&limit=50&fields=Id,Nome,Level", None),
+    "buscar": lambda i, n: ("GET", f"/personagens/search?nome=Personagem {_id(i, n)}&limit=20", None),
+    "detalhe": lambda i, n: ("GET", f"/personagens/{_id(i, n)}", None),
+    "ficha": lambda i, n: ("GET", f"/personagens/{_id(i, n)}/sheet", None),
+    "por_ids": lambda i, n: ("GET", f"/personagens/?ids={_ids(i, n)}", None),
+    "pacotes": lambda i, n: ("GET", f"/personagens/bundle?ids={_ids(i, n)}", None),
+    "associacoes": lambda i, n: ("GET", f"/personagens/{_id(i, n)}/magias", None),
+    "criar": lambda i, n: ("POST", "/personagens/", {"Id": 0, "Nome": f"Novo {i}", "Raca_id": 1, "Classe_id": 1}),
+    "lote": lambda i, n: ("POST", "/personagens/bulk", [{"Nome": f"Lote {i}-{k}", "Level": k % 20} for k in range(100)]),
+    "associar": lambda i, n: ("PUT", f"/personagens/{_id(i, n)}/magias", [(i + k * 13) % CATALOGO + 1 for k in range(3)]),
+}
+
+
+def _percentil(valores, p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p * (len(ordenados) - 1))))]
+
+
+async def medir_cenario(cliente: httpx.AsyncClient, montar, n: int, requisicoes: int, concorrencia: int) -> dict:
+    latencias, erros = [], 0
+    proximo = iter(range(requisicoes))
+
+    async def trabalhador():
+        nonlocal erros
+        for i in proximo:
+            metodo, caminho, corpo = montar(i, n)
+            inicio = time.perf_counter()
+            resposta = await cliente.request(metodo, caminho, json=corpo)
+            latencias.append(time.perf_counter() - inicio)
+            erros += resposta.status_code >= 400
+
+    # Aquecimento: primeira requisição fora da medição (compila rotas, enche o pool)
+    metodo, caminho, corpo = montar(requisicoes, n)
+    await cliente.request(metodo, caminho, json=corpo)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabalhador() for _ in range(concorrencia)))
+    duracao = time.perf_counter() - inicio
+    return {
+        "requisicoes": len(latencias),
+        "erros": erros,
+        "p50_ms": round(_percentil(latencias, 0.50) * 1000, 3),
+        "p99_ms": round(_percentil(latencias, 0.99) * 1000, 3),
+        "media_ms": round(statistics.fmean(latencias) * 1000, 3),
+        "req_por_s": round(len(latencias) / duracao, 1),
+    }
+
+
+async def rodar_cenarios(cliente, n: int, args) -> dict:
+    resultados = {}
+    for nome in args.cenarios:
+        resultados[nome] = await medir_cenario(cliente, CENARIOS[nome], n, args.requisicoes, args.concorrencia)
+        r = resultados[nome]
+        print(f"  {nome:<14} p50 {r['p50_ms']:8.2f} ms  p99 {r['p99_ms']:8.2f} ms  {r['req_por_s']:8.1f} req/s  erros {r['erros']}")
+    return resultados
+
+
+# ============================================================
+# MODOS: NO MESMO PROCESSO (ASGI) E UVICORN
+# ============================================================
+def _rss_pico_kb(pid: int) -> int:
+    """VmHWM do processo e dos filhos (Linux); fora do Linux, só o processo atual"""
+    try:
+        total = 0
+        pids = [pid]
+        filhos = Path(f"/proc/{pid}/task/{pid}/children")
+        if filhos.exists():
+            pids += [int(p) for p in filhos.read_text().split()]
+        for atual in pids:
+            for linha in Path(f"/proc/{atual}/status").read_text().splitlines():
+                if linha.startswith("VmHWM:"):
+                    total += int(linha.split()[1])
+        return total
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if pid == os.getpid() else 0
+
+
+async def modo_asgi(n: int, args) -> dict:
+    from app.inicializacao import ativar_banco
+    from app.main import app
+
+    ativar_banco()
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        cenarios = await rodar_cenarios(cliente, n, args)
+    return {"cenarios": cenarios, "rss_pico_mb": round(_rss_pico_kb(os.getpid()) / 1024, 1)}
+
+
+def _porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def modo_uvicorn(n: int, args) -> dict:
+    porta = _porta_livre()
+    ambiente = dict(os.environ, PYTHONPATH=str(RAIZ), RPG_SERVIDOR_ACCESS_LOG="false")
+    servidor = subprocess.Popen(
+        [sys.executable, "run.py", "--producao", "--workers", str(args.workers), "--porta", str(porta)],
+        cwd=RAIZ, env=ambiente, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        limites = httpx.Limits(max_connections=args.concorrencia, max_keepalive_connections=args.concorrencia)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{porta}", limits=limites, timeout=60) as cliente:
+            for _ in range(300):
+                try:
+                    if (await cliente.get("/")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+            else:
+                raise SystemExit("uvicorn não respondeu em 30s")
+            cenarios = await rodar_cenarios(cliente, n, args)
+        return {"cenarios": cenarios, "rss_pico_mb": round(_rss_pico_kb(servidor.pid) / 1024, 1)}
+    finally:
+        servidor.terminate()
+        servidor.wait(timeout=60)
+
+
+# ============================================================
+# COMPARAÇÃO COM UMA EXECUÇÃO ANTERIOR
+# ============================================================
+def comparar(atual: dict, base: dict, tolerancia: float) -> list:
+    """Cenários em que p50/p99 subiram ou req/s caiu além da tolerância"""
+    regressoes = []
+    for modo, dados in atual["modos"].items():
+        for cenario, r in dados["cenarios"].items():
+            anterior = base.get("modos", {}).get(modo, {}).get("cenarios", {}).get(cenario)
+            if not anterior:
+                continue
+            for campo, pior_se_maior in (("p50_ms", True), ("p99_ms", True), ("req_por_s", False)):
+                antes, agora = anterior[campo], r[campo]
+                if not antes:
+                    continue
+                variacao = (agora - antes) / antes
+                if (variacao > tolerancia) if pior_se_maior else (variacao < -tolerancia):
+                    regressoes.append(f"{modo}/{cenario} {campo}: {antes} -> {agora} ({variacao:+.0%})")
+    return regressoes
+
+
+def _commit_atual() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanho", default="1k", help="1k, 100k, 1m ou um número de personagens")
+    parser.add_argument("--modo", choices=("asgi", "uvicorn", "ambos"), default="asgi")
+    parser.add_argument("--cenarios", nargs="+", choices=list(CENARIOS), default=list(CENARIOS))
+    parser.add_argument("--requisicoes", type=int, default=200, help="Requisições medidas por cenário")
+    parser.add_argument("--concorrencia", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=1, help="Workers do uvicorn no modo uvicorn")
+    parser.add_argument("--sem-cache", action="store_true", help="Desliga o cache de respostas (mede sempre o banco)")
+    parser.add_argument("--saida", help="Arquivo JSON para gravar os resultados")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.10, help="Piora relativa aceita antes de acusar regressão")
+    args = parser.parse_args()
+
+    if args.sem_cache:
+        os.environ["RPG_CACHE_HABILITADO"] = "false"
+        settings.cache_habilitado = False
+
+    n = quantidade(args.tamanho)
+    print(f"Gerando {n} personagens em {BANCO}")
+    preparar_banco()
+    gerar_dados(engine, n)
+    # Fichas já montadas, como em produção depois do primeiro acesso
+    from app.fichas import reconstruir_fichas
+    from app.main import FichaSchema
+
+    inicio = time.perf_counter()
+    print(f"  fichas: {reconstruir_fichas(FichaSchema, log=lambda *_: None)} ({time.perf_counter() - inicio:.1f}s)")
+    engine.dispose()
+
+    resultado = {
+        "commit": _commit_atual(),
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "personagens": n,
+        "requisicoes": args.requisicoes,
+        "concorrencia": args.concorrencia,
+        "cache": not args.sem_cache,
+        "modos": {},
+    }
+    modos = ("asgi", "uvicorn") if args.modo == "ambos" else (args.modo,)
+    for modo in modos:
+        print(f"\n[{modo}]")
+        resultado["modos"][modo] = asyncio.run(modo_asgi(n, args) if modo == "asgi" else modo_uvicorn(n, args))
+        print(f"  pico de memória: {resultado['modos'][modo]['rss_pico_mb']} MB")
+
+    if args.saida:
+        Path(args.saida).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.saida).write_text(json.dumps(resultado, indent=2, ensure_ascii=False))
+        print(f"\nResultados gravados em {args.saida}")
+
+    if args.comparar:
+        regressoes = comparar(resultado, json.loads(Path(args.comparar).read_text()), args.tolerancia)
+        if regressoes:
+            print(f"\n❌ {len(regressoes)} regressões (tolerância {args.tolerancia:.0%}):")
+            for linha in regressoes:
+                print(f"  {linha}")
+            return 1
+        print(f"\n✅ Nenhuma regressão além de {args.tolerancia:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
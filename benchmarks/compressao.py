@@ -0,0 +1,100 @@
+"""CPU x banda da compressão das respostas (gzip, brotli e zstd em cada nível).
+
+Uso (na raiz do projeto):
+    python -m benchmarks.compressao
+    python -m benchmarks.compressao --personagens 5000 --banda 10 --repeticoes 20
+
+Gera um banco SQLite temporário (benchmarks/dados.py), pega respostas reais
+do app sem compressão (lista de personagens com relações, catálogo de magias
+e uma exportação NDJSON) e mede, para cada codificação e nível: tempo de
+compressão, taxa (MB/s), tamanho final, tempo de descompressão no cliente e
+o tempo total até o cliente numa conexão de --banda Mbit/s (comprimir +
+transferir + descomprimir). brotli e zstd entram só se instalados.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+
+_pasta = tempfile.mkdtemp(prefix="rpg_compressao_")
+os.environ["RPG_DATABASE_URL"] = f"sqlite:///{os.path.join(_pasta, 'compressao.db')}"
+os.environ["RPG_INICIALIZAR_BANCO"] = "false"
+os.environ["RPG_CACHE_HABILITADO"] = "false"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.compressao import CODIFICACOES, brotli, zstandard  # noqa: E402
+from app.database import engine  # noqa: E402
+from app.inicializacao import preparar_banco  # noqa: E402
+from benchmarks.dados import gerar_dados  # noqa: E402
+
+NIVEIS = {"gzip": (1, 3, 6, 9), "br": (0, 2, 4, 6, 9, 11), "zstd": (1, 3, 6, 12, 19)}
+
+RESPOSTAS = {
+    "personagens (100)": "/personagens/?limit=100",
+    "personagens (1000)": "/personagens/?limit=1000",
+    "catálogo de magias": "/magias/",
+    "export personagens": "/export/personagens?formato=ndjson",
+}
+
+
+def _descomprimir(codificacao: str):
+    if codificacao == "gzip":
+        return lambda dados: zlib.decompress(dados, 31)
+    if codificacao == "br":
+        return brotli.decompress
+    return lambda dados: zstandard.ZstdDecompressor().decompressobj().decompress(dados)
+
+
+def _mediana_ms(funcao, repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def medir(nome: str, corpo: bytes, banda_mbit: float, repeticoes: int):
+    transferir = lambda tamanho: tamanho * 8 / (banda_mbit * 1_000_000) * 1000  # noqa: E731
+    print(f"\n{nome}: {len(corpo) / 1024:.0f} KiB sem compressão, {transferir(len(corpo)):.1f} ms a {banda_mbit:g} Mbit/s")
+    print(f"  {'codificação':<8} {'nível':>5} {'comprimir':>10} {'MB/s':>7} {'tamanho':>9} {'taxa':>6} {'descomp.':>9} {'total':>9}")
+    for codificacao in CODIFICACOES:
+        funcao = CODIFICACOES[codificacao][0]
+        descomprimir = _descomprimir(codificacao)
+        for nivel in NIVEIS[codificacao]:
+            comprimido = funcao(corpo, nivel)
+            ms = _mediana_ms(lambda: funcao(corpo, nivel), repeticoes)
+            ms_descomprimir = _mediana_ms(lambda: descomprimir(comprimido), repeticoes)
+            total = ms + transferir(len(comprimido)) + ms_descomprimir
+            print(
+                f"  {codificacao:<8} {nivel:>5} {ms:>8.2f}ms {len(corpo) / 1e6 / (ms / 1000):>7.0f} "
+                f"{len(comprimido) / 1024:>7.1f}KiB {len(corpo) / len(comprimido):>5.1f}x "
+                f"{ms_descomprimir:>7.2f}ms {total:>7.1f}ms"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--personagens", type=int, default=2000)
+    parser.add_argument("--banda", type=float, default=20.0, help="Mbit/s da conexão do cliente")
+    parser.add_argument("--repeticoes", type=int, default=10)
+    args = parser.parse_args()
+
+    preparar_banco()
+    gerar_dados(engine, args.personagens, log=lambda *_: None)
+    print(f"{args.personagens} personagens; codificações disponíveis: {', '.join(CODIFICACOES)}")
+
+    from app.main import app
+
+    with TestClient(app) as cliente:
+        for nome, caminho in RESPOSTAS.items():
+            resposta = cliente.get(caminho, headers={"Accept-Encoding": "identity"})
+            medir(nome, resposta.content, args.banda, args.repeticoes)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Confere que listagens e detalhes rodam um número fixo de consultas SQL (sem N+1).
+
+Uso (na raiz do projeto):
+    python -m benchmarks.consultas
+    python -m benchmarks.consultas --personagens 2000
+
+Gera um banco SQLite temporário (benchmarks/dados.py) e, para cada rota,
+faz a mesma requisição com tamanhos diferentes (página de 1 e de 200 itens,
+personagem sem itens e com dezenas deles, 1 e 100 ids). A contagem vem do
+Server-Timing do middleware de métricas (app.metricas.medir_consultas).
+Termina com código 1 se a contagem variar com o tamanho ou passar do
+esperado em ESPERADO.
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+
+_pasta = tempfile.mkdtemp(prefix="rpg_consultas_")
+os.environ["RPG_DATABASE_URL"] = f"sqlite:///{os.path.join(_pasta, 'consultas.db')}"
+os.environ["RPG_INICIALIZAR_BANCO"] = "false"
+os.environ["RPG_CACHE_HABILITADO"] = "false"
+os.environ["RPG_METRICAS_HABILITADAS"] = "true"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.database import engine  # noqa: E402
+from app.inicializacao import preparar_banco  # noqa: E402
+from benchmarks.dados import CATALOGO, gerar_dados  # noqa: E402
+
+# Rota -> máximo de consultas por requisição (ETag + SELECT principal + um
+# selectinload por coleção/nível do schema). Subir um número aqui precisa
+# de motivo: é justamente o que este script existe para pegar (tests/test_consultas.py
+# confere os mesmos números a cada execução do pytest).
+ESPERADO = {
+    "GET /personagens/": 5,
+    "GET /personagens/{id}": 5,  # + Versoes_Tabelas: o ETag sai antes de carregar (304 em 2 consultas)
+    "GET /personagens/{id}/magias": 3,
+    "GET /personagens/{id}/equipamentos": 3,
+    "GET /personagens/?ids=": 5,
+    "GET /personagens/bundle?ids=": 1,
+    "GET /personagens/derived?ids=": 6,
+    "GET /classes/": 2,
+    "GET /atributos/": 2,
+}
+
+_CONSULTAS = re.compile(r'desc="(\d+) consultas"')
+
+
+def _ids(inicio: int, quantidade: int) -> str:
+    return ",".join(str(i) for i in range(inicio, inicio + quantidade))
+
+
+def cenarios(vazio: int, cheio: int) -> dict:
+    """Rota -> URLs da mesma rota com tamanhos diferentes"""
+    return {
+        "GET /personagens/": ["/personagens/?limit=1", "/personagens/?limit=200"],
+        "GET /personagens/{id}": [f"/personagens/{vazio}", f"/personagens/{cheio}", "/personagens/1"],
+        "GET /personagens/{id}/magias": [f"/personagens/{vazio}/magias", f"/personagens/{cheio}/magias"],
+        "GET /personagens/{id}/equipamentos": [f"/personagens/{vazio}/equipamentos", f"/personagens/{cheio}/equipamentos"],
+        "GET /personagens/?ids=": [f"/personagens/?ids={_ids(1, 1)}", f"/personagens/?ids={_ids(1, 100)}"],
+        "GET /personagens/bundle?ids=": [f"/personagens/bundle?ids={_ids(1, 1)}", f"/personagens/bundle?ids={_ids(1, 100)}"],
+        "GET /personagens/derived?ids=": [f"/personagens/derived?ids={_ids(1, 1)}", f"/personagens/derived?ids={_ids(1, 100)}"],
+        "GET /classes/": ["/classes/?limit=1", "/classes/"],
+        "GET /atributos/": ["/atributos/?limit=1", "/atributos/?limit=200"],
+    }
+
+
+def consultas(cliente, url: str) -> int:
+    resposta = cliente.get(url, headers={"X-Server-Timing": "1"})
+    if resposta.status_code != 200:
+        raise SystemExit(f"{url}: HTTP {resposta.status_code}")
+    return int(_CONSULTAS.search(resposta.headers["server-timing"]).group(1))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--personagens", type=int, default=500)
+    args = parser.parse_args()
+
+    preparar_banco()
+    gerar_dados(engine, args.personagens, log=lambda *_: None)
+    from app.fichas import reconstruir_fichas
+    from app.main import FichaSchema, app
+
+    reconstruir_fichas(FichaSchema, log=lambda *_: None)
+    falhas = 0
+    with TestClient(app) as cliente:
+        # Um personagem sem nenhum item e outro com dezenas em cada coleção
+        vazio = cliente.post("/personagens/", json={"Id": 0, "Nome": "Sem itens"}).json()["Id"]
+        cheio = cliente.post("/personagens/", json={"Id": 0, "Nome": "Cheio de itens"}).json()["Id"]
+        for colecao in ("magias", "habilidades", "equipamentos"):
+            cliente.put(f"/personagens/{cheio}/{colecao}", json=list(range(1, min(CATALOGO, 50) + 1)))
+        # Monta as fichas invalidadas acima antes de medir
+        reconstruir_fichas(FichaSchema, log=lambda *_: None)
+
+        for rota, urls in cenarios(vazio, cheio).items():
+            contagens = [consultas(cliente, url) for url in urls]
+            ok = len(set(contagens)) == 1 and contagens[0] <= ESPERADO[rota]
+            falhas += not ok
+            print(f"[{'ok' if ok else 'FALHOU'}] {rota:<36} {contagens} (máx. {ESPERADO[rota]})")
+    print(f"\n{len(ESPERADO) - falhas}/{len(ESPERADO)} rotas com número fixo de consultas")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Geração de dados sintéticos para os benchmarks.
+
+Insere com Core (executemany em blocos), sem objetos ORM, para que 1M de
+personagens caibam em poucos minutos. Cada personagem recebe raça, classe,
+equipamento principal, 2 atributos e `por_personagem` magias, habilidades e
+equipamentos na coleção.
+"""
+import time
+from sqlalchemy import func, insert, select
+from app.models import (
+    AtributosModel,
+    ClasseModel,
+    EquipamentosModel,
+    HabilidadesModel,
+    MagiasModel,
+    PersonagensModel,
+    RacasModel,
+    personagem_equipamentos,
+    personagem_habilidades,
+    personagem_magias,
+)
+
+TAMANHOS = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+CATALOGO = 200  # magias, habilidades e equipamentos
+BLOCO = 20_000
+CLASSES = ("Guerreiro", "Mago", "Ladino", "Clérigo", "Bardo")
+RACAS = ("Humano", "Elfo", "Anão", "Orc", "Halfling")
+
+
+def quantidade(tamanho: str) -> int:
+    """'1k' / '100k' / '1m' ou um número"""
+    return TAMANHOS.get(tamanho.lower()) or int(tamanho)
+
+
+def _em_blocos(conexao, tabela, linhas):
+    bloco = []
+    for linha in linhas:
+        bloco.append(linha)
+        if len(bloco) >= BLOCO:
+            conexao.execute(insert(tabela), bloco)
+            bloco = []
+    if bloco:
+        conexao.execute(insert(tabela), bloco)
+
+
+def gerar_dados(engine, personagens: int, por_personagem: int = 3, log=print) -> dict:
+    """Popula um banco vazio (já migrado) e retorna as contagens inseridas"""
+    inicio = time.perf_counter()
+    with engine.begin() as conexao:
+        if conexao.execute(select(func.count()).select_from(PersonagensModel)).scalar():
+            raise SystemExit("O banco já tem personagens; use um banco novo para os benchmarks")
+
+        conexao.execute(insert(RacasModel), [{"Nome": nome, "Passiva": f"Passiva {nome}"} for nome in RACAS])
+        conexao.execute(insert(MagiasModel), [
+            {"Nome": f"Magia {i}", "Descricao": f"Descrição da magia {i}", "Nivel": i % 10, "CustoMana": 5 + i % 50}
+            for i in range(CATALOGO)
+        ])
+        conexao.execute(insert(HabilidadesModel), [
+            {"Nome": f"Habilidade {i}", "Descricao": f"Descrição da habilidade {i}", "Dano": i % 40}
+            for i in range(CATALOGO)
+        ])
+        conexao.execute(insert(EquipamentosModel), [
+            {"Nome": f"Equipamento {i}", "Ataque": i % 12, "Defesa": i % 8, "Bonus": i % 3, "Peso": 1 + i % 20}
+            for i in range(CATALOGO)
+        ])
+        conexao.execute(insert(ClasseModel), [
+            {"Nome": nome, "Descricao": f"Classe {nome}", "Habilidades_id": i + 1, "Magias_id": i + 1}
+            for i, nome in enumerate(CLASSES)
+        ])
+
+        _em_blocos(conexao, PersonagensModel.__table__, (
+            {
+                "Nome": f"Personagem {i}", "Historia": f"História do personagem {i}", "Level": 1 + i % 20,
+                "Forca": 8 + i % 12, "Inteligencia": 8 + (i * 7) % 12, "Mana": 50 + i % 100,
+                "Classe_Nome": CLASSES[i % len(CLASSES)], "Raca_Nome": RACAS[i % len(RACAS)],
+                "Raca_id": i % len(RACAS) + 1, "Classe_id": i % len(CLASSES) + 1, "Equipamento_id": i % CATALOGO + 1,
+            }
+            for i in range(personagens)
+        ))
+        log(f"  personagens: {personagens} ({time.perf_counter() - inicio:.1f}s)")
+        _em_blocos(conexao, AtributosModel.__table__, (
+            {"Personagem_id": p + 1, "Nome": nome, "Quantidade": 10 + p % 8}
+            for p in range(personagens) for nome in ("Força", "Destreza")
+        ))
+        for tabela, coluna in (
+            (personagem_magias, "Magia_id"),
+            (personagem_habilidades, "Habilidade_id"),
+            (personagem_equipamentos, "Equipamento_id"),
+        ):
+            _em_blocos(conexao, tabela, (
+                {"Personagem_id": p + 1, coluna: (p * 7 + k * 31) % CATALOGO + 1}
+                for p in range(personagens) for k in range(por_personagem)
+            ))
+        log(f"  associações: {3 * personagens * por_personagem} ({time.perf_counter() - inicio:.1f}s)")
+        if engine.dialect.name == "sqlite":
+            conexao.exec_driver_sql("ANALYZE")
+    return {"personagens": personagens, "catalogo": CATALOGO, "por_personagem": por_personagem}
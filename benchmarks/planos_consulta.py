@@ -0,0 +1,113 @@
+"""Confere no EXPLAIN QUERY PLAN do SQLite que as consultas quentes usam índices.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.planos_consulta
+
+Aplica as migrações em um banco temporário e, para cada consulta, verifica
+se o plano usa o índice esperado. Termina com código 1 se alguma consulta
+fizer varredura completa (SCAN) da tabela.
+"""
+import os
+import sys
+import tempfile
+
+_pasta = tempfile.mkdtemp(prefix="rpg_planos_")
+os.environ["RPG_DATABASE_URL"] = f"sqlite:///{os.path.join(_pasta, 'planos.db')}"
+
+from sqlalchemy import delete, select, update  # noqa: E402
+from app.database import engine  # noqa: E402
+from app.migracoes import atualizar_schema  # noqa: E402
+from app.models import (  # noqa: E402
+    AtributosModel,
+    ClasseModel,
+    MagiasModel,
+    PersonagensModel,
+    personagem_equipamentos,
+    personagem_habilidades,
+    personagem_magias,
+)
+
+# (descrição, statement, índice esperado no plano)
+CONSULTAS = [
+    (
+        "quem tem esta magia",
+        select(personagem_magias.c.Personagem_id).where(personagem_magias.c.Magia_id == 1),
+        "ix_Personagem_Magias_Magia_id_Personagem_id",
+    ),
+    (
+        "quem tem esta habilidade",
+        select(personagem_habilidades.c.Personagem_id).where(personagem_habilidades.c.Habilidade_id == 1),
+        "ix_Personagem_Habilidades_Habilidade_id_Personagem_id",
+    ),
+    (
+        "remover equipamento deletado das associações",
+        delete(personagem_equipamentos).where(personagem_equipamentos.c.Equipamento_id.in_([1, 2])),
+        "ix_Personagem_Equipamentos_Equipamento_id_Personagem_id",
+    ),
+    (
+        "selectinload de atributos",
+        select(AtributosModel).where(AtributosModel.Personagem_id.in_([1, 2, 3])),
+        "ix_Atributos_Personagem_id_Nome",
+    ),
+    (
+        "atributo do personagem pelo nome",
+        select(AtributosModel.Quantidade).where(AtributosModel.Personagem_id == 1, AtributosModel.Nome == "Força"),
+        "ix_Atributos_Personagem_id_Nome",
+    ),
+    (
+        "personagens de uma raça",
+        select(PersonagensModel.Id).where(PersonagensModel.Raca_id == 1),
+        "ix_Personagens_Raca_id",
+    ),
+    (
+        "desvincular classe deletada",
+        update(PersonagensModel).where(PersonagensModel.Classe_id.in_([1])).values(Classe_id=None),
+        "ix_Personagens_Classe_id",
+    ),
+    (
+        "desvincular equipamento deletado",
+        update(PersonagensModel).where(PersonagensModel.Equipamento_id.in_([1])).values(Equipamento_id=None),
+        "ix_Personagens_Equipamento_id",
+    ),
+    (
+        "classes que usam uma magia",
+        select(ClasseModel.Id).where(ClasseModel.Magias_id == 1),
+        "ix_Classe_Magias_id",
+    ),
+    (
+        "magia pelo nome",
+        select(MagiasModel).where(MagiasModel.Nome == "Cura"),
+        "ix_Magias_Nome",
+    ),
+    (
+        "personagens ordenados por nome",
+        select(PersonagensModel.Id, PersonagensModel.Nome).order_by(PersonagensModel.Nome).limit(50),
+        "ix_Personagens_Nome",
+    ),
+]
+
+
+def plano(conexao, stmt) -> list:
+    sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+    return [linha[-1] for linha in conexao.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def main() -> int:
+    atualizar_schema(engine)
+    falhas = 0
+    with engine.connect() as conexao:
+        for descricao, stmt, indice in CONSULTAS:
+            detalhes = plano(conexao, stmt)
+            ok = any(indice in d for d in detalhes) and not any(
+                d.startswith("SCAN") and "INDEX" not in d for d in detalhes
+            )
+            falhas += not ok
+            print(f"[{'ok' if ok else 'FALHOU'}] {descricao}")
+            for d in detalhes:
+                print(f"        {d}")
+    print(f"\n{len(CONSULTAS) - falhas}/{len(CONSULTAS)} consultas usam o índice esperado")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""Compara a serialização padrão do FastAPI (response_model) com para_json.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.serializacao --personagens 2000 --repeticoes 20
+
+Cria um banco SQLite temporário com personagens completos (raça, classe,
+equipamento, atributos, magias e habilidades), carrega a lista uma vez e
+mede só a etapa de transformar os objetos ORM no corpo da resposta.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+_pasta = tempfile.mkdtemp(prefix="rpg_bench_")
+os.environ["RPG_DATABASE_URL"] = f"sqlite:///{os.path.join(_pasta, 'bench.db')}"
+os.environ["RPG_CACHE_HABILITADO"] = "false"
+
+from typing import List  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from app.carregamento import opcoes_carregamento  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.inicializacao import preparar_banco  # noqa: E402
+from app.main import PersonagemSchema  # noqa: E402
+from app.models import (  # noqa: E402
+    AtributosModel,
+    ClasseModel,
+    EquipamentosModel,
+    HabilidadesModel,
+    MagiasModel,
+    PersonagensModel,
+    RacasModel,
+    personagem_habilidades,
+    personagem_magias,
+)
+from app.serializacao import RespostaPadrao, para_json  # noqa: E402
+
+
+# ============================================================
+# DADOS
+# ============================================================
+def popular(db, quantidade: int):
+    db.execute(insert(RacasModel), [{"Nome": f"Raça {i}", "Passiva": "Passiva " * 5} for i in range(10)])
+    db.execute(insert(MagiasModel), [{"Nome": f"Magia {i}", "Descricao": "Descrição " * 10, "Nivel": i % 10, "CustoMana": 10} for i in range(50)])
+    db.execute(insert(HabilidadesModel), [{"Nome": f"Habilidade {i}", "Descricao": "Descrição " * 10, "Dano": i} for i in range(50)])
+    db.execute(insert(EquipamentosModel), [{"Nome": f"Equipamento {i}", "Ataque": i, "Defesa": i} for i in range(50)])
+    db.execute(insert(ClasseModel), [{"Nome": f"Classe {i}", "Habilidades_id": i + 1, "Magias_id": i + 1} for i in range(10)])
+    db.execute(insert(PersonagensModel), [
+        {"Nome": f"Personagem {i}", "Historia": "História " * 20, "Raca_id": i % 10 + 1, "Classe_id": i % 10 + 1, "Equipamento_id": i % 50 + 1}
+        for i in range(quantidade)
+    ])
+    db.execute(insert(AtributosModel), [
+        {"Personagem_id": p + 1, "Nome": nome, "Quantidade": 10}
+        for p in range(quantidade) for nome in ("Força", "Destreza", "Constituição")
+    ])
+    db.execute(insert(personagem_magias), [
+        {"Personagem_id": p + 1, "Magia_id": (p + k) % 50 + 1} for p in range(quantidade) for k in range(4)
+    ])
+    db.execute(insert(personagem_habilidades), [
+        {"Personagem_id": p + 1, "Habilidade_id": (p + k) % 50 + 1} for p in range(quantidade) for k in range(4)
+    ])
+    db.commit()
+
+
+# ============================================================
+# CAMINHOS COMPARADOS
+# ============================================================
+campo_resposta = create_model_field("resposta", List[PersonagemSchema], mode="serialization")
+
+
+async def _padrao_fastapi(itens, classe_resposta):
+    # O que o FastAPI faz com response_model quando a rota retorna objetos ORM
+    conteudo = await serialize_response(field=campo_resposta, response_content=itens)
+    return classe_resposta(conteudo).body
+
+
+def medir(nome: str, funcao, repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    mediana = statistics.median(tempos)
+    print(f"{nome:<40} mediana {mediana:8.2f} ms   min {min(tempos):8.2f} ms")
+    return mediana
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--personagens", type=int, default=2000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    preparar_banco()
+    db = SessionLocal()
+    popular(db, args.personagens)
+    itens = db.query(PersonagensModel).options(*opcoes_carregamento(PersonagensModel, PersonagemSchema)).all()
+    print(f"{len(itens)} personagens, {len(para_json(PersonagemSchema, itens)) / 1024:.0f} KiB de JSON\n")
+
+    laco = asyncio.new_event_loop()
+    base = medir("response_model + JSONResponse", lambda: laco.run_until_complete(_padrao_fastapi(itens, JSONResponse)), args.repeticoes)
+    if RespostaPadrao is not JSONResponse:
+        medir("response_model + ORJSONResponse", lambda: laco.run_until_complete(_padrao_fastapi(itens, RespostaPadrao)), args.repeticoes)
+    rapido = medir("para_json (TypeAdapter.dump_json)", lambda: para_json(PersonagemSchema, itens), args.repeticoes)
+    print(f"\npara_json é {base / rapido:.1f}x mais rápido que o caminho padrão")
+    laco.close()
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Mede o tempo de importar app.main com `python -X importtime` e falha acima do limite.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.tempo_importacao --limite-ms 2000
+
+Importa a aplicação em um processo novo, apontando para um banco SQLite
+temporário, e confere duas coisas:
+- o tempo acumulado de `import app.main` fica abaixo de --limite-ms;
+- o import não cria o arquivo do banco (nenhum DDL/seed fora do lifespan).
+Mostra os módulos mais lentos e termina com código 1 se algo falhar.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def medir(modulo: str, banco: str):
+    """Linhas (self_us, acumulado_us, módulo) do -X importtime de um processo novo"""
+    ambiente = dict(os.environ, RPG_DATABASE_URL=f"sqlite:///{banco}", PYTHONPATH=str(RAIZ))
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=RAIZ, env=ambiente, capture_output=True, text=True,
+    )
+    if processo.returncode != 0:
+        sys.exit(f"❌ Falha ao importar {modulo}:\n{processo.stderr[-2000:]}")
+    linhas = []
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        proprio, acumulado, nome = linha[len("import time:"):].split("|")
+        linhas.append((int(proprio), int(acumulado), nome.strip()))
+    return linhas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modulo", default="app.main")
+    parser.add_argument("--limite-ms", type=float, default=2000.0)
+    parser.add_argument("--repeticoes", type=int, default=3, help="Usa o menor tempo (descarta ruído de disco/cache)")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    pasta = tempfile.mkdtemp(prefix="rpg_import_")
+    banco = os.path.join(pasta, "import.db")
+    medicoes = [medir(args.modulo, banco) for _ in range(args.repeticoes)]
+    linhas = min(medicoes, key=lambda ls: ls[-1][1])
+    total_ms = linhas[-1][1] / 1000
+
+    print(f"Módulos mais lentos (tempo próprio) ao importar {args.modulo}:")
+    for proprio, acumulado, nome in sorted(linhas, reverse=True)[: args.top]:
+        print(f"  {proprio / 1000:8.1f} ms  (acumulado {acumulado / 1000:8.1f} ms)  {nome}")
+
+    falhou = False
+    if os.path.exists(banco):
+        print("❌ O import criou o banco: há DDL ou seed fora do lifespan")
+        falhou = True
+    situacao = "✅" if total_ms <= args.limite_ms else "❌"
+    print(f"{situacao} import {args.modulo}: {total_ms:.0f} ms (limite {args.limite_ms:.0f} ms)")
+    falhou = falhou or total_ms > args.limite_ms
+    sys.exit(1 if falhou else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Vazão da exportação e da importação em lote (NDJSON, CSV e Parquet).
+
+Uso (na raiz do projeto):
+    python -m benchmarks.transferencia --tamanho 100k
+    python -m benchmarks.transferencia --tamanho 1m --formatos csv parquet
+
+Gera um banco SQLite temporário (benchmarks/dados.py), exporta todas as
+tabelas (incluindo as associações Personagem_*) em cada formato e importa os
+arquivos em um banco novo, nos modos "manter" e "novos". Reporta linhas por
+segundo, tamanho dos arquivos e o pico de memória (RSS) do processo, que deve
+ficar estável mesmo com 1M de personagens.
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_pasta = tempfile.mkdtemp(prefix="rpg_transferencia_")
+os.environ["RPG_DATABASE_URL"] = f"sqlite:///{os.path.join(_pasta, 'origem.db')}"
+os.environ["RPG_INICIALIZAR_BANCO"] = "false"
+
+from app.database import criar_engine, engine  # noqa: E402
+from app.inicializacao import preparar_banco  # noqa: E402
+from app.transferencia import FORMATOS, MODOS, TABELAS, Importador, exportar  # noqa: E402
+from benchmarks.dados import gerar_dados, quantidade  # noqa: E402
+
+
+def _rss_pico_mb() -> float:
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def medir_exportacao(formato: str, pasta: Path) -> int:
+    linhas = 0
+    inicio = time.perf_counter()
+    for recurso in TABELAS:
+        with open(pasta / f"{recurso}.{formato}", "wb") as arquivo:
+            for pedaco in exportar(recurso, formato):
+                arquivo.write(pedaco)
+    duracao = time.perf_counter() - inicio
+    with engine.connect() as conexao:
+        for tabela in TABELAS.values():
+            linhas += conexao.exec_driver_sql(f'SELECT count(*) FROM "{tabela.name}"').scalar()
+    tamanho = sum(arquivo.stat().st_size for arquivo in pasta.iterdir()) / 1e6
+    print(f"  exportar {formato:8} {linhas:>10,} linhas {duracao:7.1f}s {linhas / duracao:>10,.0f} linhas/s "
+          f"{tamanho:8.1f} MB  RSS {_rss_pico_mb()} MB")
+    return linhas
+
+
+def medir_importacao(formato: str, modo: str, pasta: Path):
+    destino = criar_engine(f"sqlite:///{os.path.join(_pasta, f'destino_{formato}_{modo}.db')}")
+    preparar_banco(destino)
+    importador = Importador(destino, modo=modo)
+    linhas = erros = 0
+    inicio = time.perf_counter()
+    for recurso in TABELAS:
+        with open(pasta / f"{recurso}.{formato}", "rb") as arquivo:
+            resumo = importador.importar_arquivo(recurso, arquivo, formato)
+        linhas += resumo["gravadas"]
+        erros += resumo["total_erros"]
+    duracao = time.perf_counter() - inicio
+    destino.dispose()
+    print(f"  importar {formato:8} {linhas:>10,} linhas {duracao:7.1f}s {linhas / duracao:>10,.0f} linhas/s "
+          f"modo {modo:7} erros {erros}  RSS {_rss_pico_mb()} MB")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanho", default="100k", help="1k, 100k, 1m ou um número de personagens")
+    parser.add_argument("--formatos", nargs="+", choices=list(FORMATOS), default=list(FORMATOS))
+    parser.add_argument("--modos", nargs="+", choices=MODOS, default=list(MODOS))
+    args = parser.parse_args()
+
+    n = quantidade(args.tamanho)
+    print(f"Gerando {n} personagens em {_pasta}")
+    preparar_banco()
+    gerar_dados(engine, n)
+
+    for formato in args.formatos:
+        pasta = Path(_pasta) / formato
+        pasta.mkdir()
+        print(f"\n[{formato}]")
+        medir_exportacao(formato, pasta)
+        for modo in args.modos:
+            medir_importacao(formato, modo, pasta)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -31,10 +31,11 @@ export const CharacterEquipmentsManager = ({ characterId }: CharacterEquipmentsM
       console.log('🔍 Carregando equipamentos para personagem ID:', id);
       
       // Carregar equipamentos do personagem e todos os equipamentos disponíveis
-      const [equipments, allEquipmentsData] = await Promise.all([
-        api.characters.getEquipments(id),
+      const [bundle, allEquipmentsData] = await Promise.all([
+        api.characters.getBundle(id),
         api.equipments.getAll(),
       ]);
+      const equipments = bundle.equipamentos ?? [];
       
       console.log('📊 Equipamentos carregados:', {
         characterEquipments: equipments,
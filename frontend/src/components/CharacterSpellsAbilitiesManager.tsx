@@ -33,13 +33,14 @@ export const CharacterSpellsAbilitiesManager = ({ characterId }: CharacterSpells
       
       console.log('🔍 Carregando dados para personagem ID:', id);
       
-      // Carregar magias e habilidades do personagem
-      const [spells, abilities, allSpellsData, allAbilitiesData] = await Promise.all([
-        api.characters.getSpells(id),
-        api.characters.getAbilities(id),
+      // Carregar magias e habilidades do personagem (um bundle só)
+      const [bundle, allSpellsData, allAbilitiesData] = await Promise.all([
+        api.characters.getBundle(id),
         api.spells.getAll(),
         api.abilities.getAll(),
       ]);
+      const spells = bundle.magias ?? [];
+      const abilities = bundle.habilidades ?? [];
       
       console.log('📊 Dados carregados:', {
         characterSpells: spells,
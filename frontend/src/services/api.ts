@@ -37,6 +37,9 @@ async function fetchApi<T>(
   }
 }
 
+// Vários itens pelo Id numa requisição só (?ids=1,2,3), na ordem pedida
+const porIds = (ids: number[]) => `?ids=${ids.join(',')}`;
+
 // ============================================================
 // PERSONAGENS
 // ============================================================
@@ -66,12 +69,20 @@ export interface Character {
   Equipamento_id?: number;
   magias?: Spell[];
   habilidades?: Ability[];
+  equipamentos?: Equipment[];  // Só no bundle/sheet
 }
 
 export const charactersApi = {
   getAll: () => fetchApi<Character[]>('/personagens/'),
   
   getById: (id: number) => fetchApi<Character>(`/personagens/${id}`),
+
+  getByIds: (ids: number[]) => fetchApi<Character[]>(`/personagens/${porIds(ids)}`),
+
+  // Personagem com magias, habilidades e equipamentos em uma requisição
+  getBundle: (id: number) => fetchApi<Character>(`/personagens/${id}/bundle`),
+
+  getBundles: (ids: number[]) => fetchApi<Character[]>(`/personagens/bundle${porIds(ids)}`),
   
   search: (nome: string) => 
     fetchApi<Character[]>(`/personagens/search?nome=${encodeURIComponent(nome)}`),
@@ -152,6 +163,8 @@ export const spellsApi = {
   getAll: () => fetchApi<Spell[]>('/magias/'),
   
   getById: (id: number) => fetchApi<Spell>(`/magias/${id}`),
+
+  getByIds: (ids: number[]) => fetchApi<Spell[]>(`/magias/${porIds(ids)}`),
   
   search: (nome: string) => 
     fetchApi<Spell[]>(`/magias/search?nome=${encodeURIComponent(nome)}`),
@@ -194,6 +207,8 @@ export const equipmentsApi = {
   getAll: () => fetchApi<Equipment[]>('/equipamentos/'),
   
   getById: (id: number) => fetchApi<Equipment>(`/equipamentos/${id}`),
+
+  getByIds: (ids: number[]) => fetchApi<Equipment[]>(`/equipamentos/${porIds(ids)}`),
   
   search: (nome: string) => 
     fetchApi<Equipment[]>(`/equipamentos/search?nome=${encodeURIComponent(nome)}`),
@@ -230,6 +245,8 @@ export const racesApi = {
   getAll: () => fetchApi<Race[]>('/racas/'),
   
   getById: (id: number) => fetchApi<Race>(`/racas/${id}`),
+
+  getByIds: (ids: number[]) => fetchApi<Race[]>(`/racas/${porIds(ids)}`),
   
   search: (nome: string) => 
     fetchApi<Race[]>(`/racas/search?nome=${encodeURIComponent(nome)}`),
@@ -267,6 +284,8 @@ export const classesApi = {
   getAll: () => fetchApi<Class[]>('/classes/'),
   
   getById: (id: number) => fetchApi<Class>(`/classes/${id}`),
+
+  getByIds: (ids: number[]) => fetchApi<Class[]>(`/classes/${porIds(ids)}`),
   
   search: (nome: string) => 
     fetchApi<Class[]>(`/classes/search?nome=${encodeURIComponent(nome)}`),
@@ -307,6 +326,8 @@ export const abilitiesApi = {
   getAll: () => fetchApi<Ability[]>('/habilidades/'),
   
   getById: (id: number) => fetchApi<Ability>(`/habilidades/${id}`),
+
+  getByIds: (ids: number[]) => fetchApi<Ability[]>(`/habilidades/${porIds(ids)}`),
   
   search: (nome: string) => 
     fetchApi<Ability[]>(`/habilidades/search?nome=${encodeURIComponent(nome)}`),
@@ -0,0 +1,64 @@
+from logging.config import fileConfig
+from alembic import context
+from app.config import settings
+from app.database import Base, criar_engine
+import app.models  # noqa: F401  (registra as tabelas no metadata)
+import app.versoes  # noqa: F401
+
+config = context.config
+
+# Chamado pela aplicação (app.migracoes) a conexão já vem pronta e o
+# logging da aplicação não deve ser reconfigurado
+conexao_externa = config.attributes.get("connection")
+if config.config_file_name is not None and conexao_externa is None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def incluir_objeto(objeto, nome, tipo, refletido, comparado_com):
+    """Ignora tabelas fora dos models: FTS5 (app.busca), resumos de /stats (0003), Eventos (0005) e Fichas (0006)"""
+    if tipo == "table" and nome and (
+        "_fts" in nome or nome.startswith("Resumo_") or nome in ("Eventos", "Fichas", "sqlite_sequence")
+    ):
+        return False
+    if tipo == "index" and refletido and nome and nome.startswith("ix_Resumo_"):
+        return False
+    return True
+
+
+def _configurar(**opcoes):
+    context.configure(
+        target_metadata=target_metadata,
+        include_object=incluir_objeto,
+        # SQLite não tem ALTER completo: alterações de coluna recriam a tabela
+        render_as_batch=True,
+        **opcoes,
+    )
+
+
+def rodar_offline():
+    _configurar(url=settings.database_url, literal_binds=True, dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def rodar_online():
+    if conexao_externa is not None:
+        _configurar(connection=conexao_externa)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    engine = criar_engine(settings.database_url)
+    with engine.connect() as conexao:
+        _configurar(connection=conexao)
+        with context.begin_transaction():
+            context.run_migrations()
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    rodar_offline()
+else:
+    rodar_online()
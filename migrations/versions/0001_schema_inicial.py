@@ -0,0 +1,146 @@
+"""schema inicial
+
+Tabelas como eram criadas pelo Base.metadata.create_all. Bancos que já
+existiam antes das migrações (inclusive o sistema_rpg.db distribuído)
+já têm essas tabelas: cada uma só é criada se ainda não existir.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _criar_tabela(nome, *colunas, indice_id=True):
+    if not sa.inspect(op.get_bind()).has_table(nome):
+        op.create_table(nome, *colunas)
+    if indice_id:
+        # Algumas tabelas antigas foram criadas à mão, sem o índice do model
+        op.create_index(f"ix_{nome}_Id", nome, ["Id"], if_not_exists=True)
+
+
+def upgrade():
+    _criar_tabela(
+        "Racas",
+        sa.Column("Id", sa.Integer(), primary_key=True),
+        sa.Column("Nome", sa.String(), nullable=False),
+        sa.Column("Passiva", sa.Text()),
+        sa.Column("Caracteristica", sa.Text()),
+    )
+    _criar_tabela(
+        "Magias",
+        sa.Column("Id", sa.Integer(), primary_key=True),
+        sa.Column("Nome", sa.String(), nullable=False),
+        sa.Column("Descricao", sa.Text()),
+        sa.Column("Categoria", sa.String()),
+        sa.Column("Nivel", sa.Integer()),
+        sa.Column("Icone", sa.String()),
+        sa.Column("CustoMana", sa.Integer()),
+        sa.Column("Cooldown", sa.Integer()),
+        sa.Column("Efeito", sa.Text()),
+    )
+    _criar_tabela(
+        "Habilidades",
+        sa.Column("Id", sa.Integer(), primary_key=True),
+        sa.Column("Nome", sa.String(), nullable=False),
+        sa.Column("Descricao", sa.Text()),
+        sa.Column("Tipo", sa.String()),
+        sa.Column("Cooldown", sa.Integer()),
+        sa.Column("Icone", sa.String()),
+        sa.Column("Efeito", sa.Text()),
+        sa.Column("Dano", sa.Integer()),
+    )
+    _criar_tabela(
+        "Equipamentos",
+        sa.Column("Id", sa.Integer(), primary_key=True),
+        sa.Column("Nome", sa.String(), nullable=False),
+        sa.Column("Descricao", sa.Text()),
+        sa.Column("Tipo", sa.String()),
+        sa.Column("Raridade", sa.String()),
+        sa.Column("Icone", sa.String()),
+        sa.Column("Ataque", sa.Integer()),
+        sa.Column("Defesa", sa.Integer()),
+        sa.Column("Bonus", sa.Integer()),
+        sa.Column("Peso", sa.Integer()),
+    )
+    _criar_tabela(
+        "Classe",
+        sa.Column("Id", sa.Integer(), primary_key=True),
+        sa.Column("Nome", sa.String(), nullable=False),
+        sa.Column("Descricao", sa.Text()),
+        sa.Column("Habilidades_id", sa.Integer(), sa.ForeignKey("Habilidades.Id")),
+        sa.Column("Magias_id", sa.Integer(), sa.ForeignKey("Magias.Id")),
+    )
+    _criar_tabela(
+        "Personagens",
+        sa.Column("Id", sa.Integer(), primary_key=True),
+        sa.Column("Nome", sa.String(), nullable=False),
+        sa.Column("Historia", sa.Text()),
+        sa.Column("Tendencia", sa.String()),
+        sa.Column("Level", sa.Integer()),
+        sa.Column("Vida", sa.Integer()),
+        sa.Column("Forca", sa.Integer()),
+        sa.Column("Destreza", sa.Integer()),
+        sa.Column("Constituicao", sa.Integer()),
+        sa.Column("Inteligencia", sa.Integer()),
+        sa.Column("Sabedoria", sa.Integer()),
+        sa.Column("Mana", sa.Integer()),
+        sa.Column("Carisma", sa.Integer()),
+        sa.Column("Sorte", sa.Integer()),
+        sa.Column("Reputacao", sa.Integer()),
+        sa.Column("CA", sa.Integer()),
+        sa.Column("Deslocamento", sa.Integer()),
+        sa.Column("Classe_Nome", sa.String()),
+        sa.Column("Raca_Nome", sa.String()),
+        sa.Column("Raca_id", sa.Integer(), sa.ForeignKey("Racas.Id")),
+        sa.Column("Classe_id", sa.Integer(), sa.ForeignKey("Classe.Id")),
+        sa.Column("Equipamento_id", sa.Integer(), sa.ForeignKey("Equipamentos.Id")),
+    )
+    _criar_tabela(
+        "Atributos",
+        sa.Column("Id", sa.Integer(), primary_key=True),
+        sa.Column("Personagem_id", sa.Integer(), sa.ForeignKey("Personagens.Id"), nullable=False),
+        sa.Column("Nome", sa.String(), nullable=False),
+        sa.Column("Descricao", sa.Text()),
+        sa.Column("Quantidade", sa.Integer()),
+    )
+    for tabela, coluna, alvo in (
+        ("Personagem_Magias", "Magia_id", "Magias"),
+        ("Personagem_Habilidades", "Habilidade_id", "Habilidades"),
+        ("Personagem_Equipamentos", "Equipamento_id", "Equipamentos"),
+    ):
+        _criar_tabela(
+            tabela,
+            sa.Column("Personagem_id", sa.Integer(), sa.ForeignKey("Personagens.Id"), primary_key=True),
+            sa.Column(coluna, sa.Integer(), sa.ForeignKey(f"{alvo}.Id"), primary_key=True),
+            indice_id=False,
+        )
+    _criar_tabela(
+        "Versoes_Tabelas",
+        sa.Column("Tabela", sa.String(100), primary_key=True),
+        sa.Column("Versao", sa.Integer(), nullable=False),
+        indice_id=False,
+    )
+
+
+def downgrade():
+    for tabela in (
+        "Versoes_Tabelas",
+        "Personagem_Equipamentos",
+        "Personagem_Habilidades",
+        "Personagem_Magias",
+        "Atributos",
+        "Personagens",
+        "Classe",
+        "Equipamentos",
+        "Habilidades",
+        "Magias",
+        "Racas",
+    ):
+        op.drop_table(tabela)
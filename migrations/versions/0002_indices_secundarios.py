@@ -0,0 +1,48 @@
+"""índices secundários
+
+Chaves estrangeiras usadas em joins/cascatas, Nome (busca e ordenação),
+o sentido inverso das tabelas de associação ("quem tem esta magia") e
+um índice composto para os atributos de cada personagem.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDICES = [
+    ("ix_Racas_Nome", "Racas", ["Nome"]),
+    ("ix_Magias_Nome", "Magias", ["Nome"]),
+    ("ix_Habilidades_Nome", "Habilidades", ["Nome"]),
+    ("ix_Equipamentos_Nome", "Equipamentos", ["Nome"]),
+    ("ix_Classe_Nome", "Classe", ["Nome"]),
+    ("ix_Classe_Habilidades_id", "Classe", ["Habilidades_id"]),
+    ("ix_Classe_Magias_id", "Classe", ["Magias_id"]),
+    ("ix_Personagens_Nome", "Personagens", ["Nome"]),
+    ("ix_Personagens_Raca_id", "Personagens", ["Raca_id"]),
+    ("ix_Personagens_Classe_id", "Personagens", ["Classe_id"]),
+    ("ix_Personagens_Equipamento_id", "Personagens", ["Equipamento_id"]),
+    ("ix_Atributos_Nome", "Atributos", ["Nome"]),
+    ("ix_Atributos_Personagem_id_Nome", "Atributos", ["Personagem_id", "Nome"]),
+    ("ix_Personagem_Magias_Magia_id_Personagem_id", "Personagem_Magias", ["Magia_id", "Personagem_id"]),
+    ("ix_Personagem_Habilidades_Habilidade_id_Personagem_id", "Personagem_Habilidades", ["Habilidade_id", "Personagem_id"]),
+    ("ix_Personagem_Equipamentos_Equipamento_id_Personagem_id", "Personagem_Equipamentos", ["Equipamento_id", "Personagem_id"]),
+]
+
+
+def upgrade():
+    for nome, tabela, colunas in INDICES:
+        op.create_index(nome, tabela, colunas, if_not_exists=True)
+    # Atualiza as estatísticas usadas pelo planejador de consultas
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("ANALYZE")
+
+
+def downgrade():
+    for nome, tabela, _ in reversed(INDICES):
+        op.drop_index(nome, table_name=tabela, if_exists=True)
@@ -0,0 +1,174 @@
+"""tabelas de resumo das estatísticas
+
+Contagens e somas usadas por /stats, mantidas por triggers a cada escrita
+(só SQLite; nos outros bancos /stats calcula com GROUP BY direto):
+
+- Resumo_Personagens: quantidade e somas de Level/Forca/Mana por
+  Classe_Nome e por Raca_Nome
+- Resumo_Associacoes: quantos personagens têm cada magia/habilidade/equipamento
+- Resumo_Peso: peso total e quantidade de equipamentos de cada personagem
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+ASSOCIACOES = (
+    ("Personagem_Magias", "Magia_id"),
+    ("Personagem_Habilidades", "Habilidade_id"),
+    ("Personagem_Equipamentos", "Equipamento_id"),
+)
+
+# (dimensão, coluna de Personagens)
+DIMENSOES = (("classe", "Classe_Nome"), ("raca", "Raca_Nome"))
+
+
+def _linhas_personagem(alias: str, sinal: str) -> str:
+    """VALUES com a contribuição de uma linha de Personagens (new/old) para cada dimensão"""
+    return ", ".join(
+        f"('{dimensao}', IFNULL({alias}.\"{coluna}\", ''), {sinal}1, "
+        f"{sinal}IFNULL({alias}.\"Level\", 0), {sinal}IFNULL({alias}.\"Forca\", 0), {sinal}IFNULL({alias}.\"Mana\", 0))"
+        for dimensao, coluna in DIMENSOES
+    )
+
+
+UPSERT_PERSONAGENS = (
+    'INSERT INTO "Resumo_Personagens" ("Dimensao", "Valor", "Quantidade", "Soma_Level", "Soma_Forca", "Soma_Mana") '
+    "VALUES {valores} "
+    'ON CONFLICT ("Dimensao", "Valor") DO UPDATE SET '
+    '"Quantidade" = "Quantidade" + excluded."Quantidade", '
+    '"Soma_Level" = "Soma_Level" + excluded."Soma_Level", '
+    '"Soma_Forca" = "Soma_Forca" + excluded."Soma_Forca", '
+    '"Soma_Mana" = "Soma_Mana" + excluded."Soma_Mana";'
+)
+
+
+def _peso(alias: str) -> str:
+    return f'IFNULL((SELECT "Peso" FROM "Equipamentos" WHERE "Id" = {alias}."Equipamento_id"), 0)'
+
+
+def _triggers():
+    yield (
+        'CREATE TRIGGER IF NOT EXISTS "resumo_personagens_ai" AFTER INSERT ON "Personagens" BEGIN '
+        + UPSERT_PERSONAGENS.format(valores=_linhas_personagem("new", "")) + " END"
+    )
+    yield (
+        'CREATE TRIGGER IF NOT EXISTS "resumo_personagens_ad" AFTER DELETE ON "Personagens" BEGIN '
+        + UPSERT_PERSONAGENS.format(valores=_linhas_personagem("old", "-"))
+        + ' DELETE FROM "Resumo_Peso" WHERE "Personagem_id" = old."Id"; END'
+    )
+    yield (
+        'CREATE TRIGGER IF NOT EXISTS "resumo_personagens_au" AFTER UPDATE OF '
+        '"Classe_Nome", "Raca_Nome", "Level", "Forca", "Mana" ON "Personagens" BEGIN '
+        + UPSERT_PERSONAGENS.format(valores=_linhas_personagem("old", "-"))
+        + " "
+        + UPSERT_PERSONAGENS.format(valores=_linhas_personagem("new", ""))
+        + " END"
+    )
+    for tabela, coluna in ASSOCIACOES:
+        upsert = (
+            'INSERT INTO "Resumo_Associacoes" ("Tabela", "Item_id", "Quantidade") '
+            f"VALUES ('{tabela}', {{alias}}.\"{coluna}\", {{sinal}}1) "
+            'ON CONFLICT ("Tabela", "Item_id") DO UPDATE SET "Quantidade" = "Quantidade" + excluded."Quantidade";'
+        )
+        yield (
+            f'CREATE TRIGGER IF NOT EXISTS "resumo_{tabela}_ai" AFTER INSERT ON "{tabela}" BEGIN '
+            + upsert.format(alias="new", sinal="") + " END"
+        )
+        yield (
+            f'CREATE TRIGGER IF NOT EXISTS "resumo_{tabela}_ad" AFTER DELETE ON "{tabela}" BEGIN '
+            + upsert.format(alias="old", sinal="-") + " END"
+        )
+    # Peso carregado: entra/sai junto com a associação e acompanha mudanças no Peso do equipamento
+    yield (
+        'CREATE TRIGGER IF NOT EXISTS "resumo_peso_ai" AFTER INSERT ON "Personagem_Equipamentos" BEGIN '
+        'INSERT INTO "Resumo_Peso" ("Personagem_id", "Peso_Total", "Itens") '
+        f'VALUES (new."Personagem_id", {_peso("new")}, 1) '
+        'ON CONFLICT ("Personagem_id") DO UPDATE SET '
+        '"Peso_Total" = "Peso_Total" + excluded."Peso_Total", "Itens" = "Itens" + 1; END'
+    )
+    yield (
+        'CREATE TRIGGER IF NOT EXISTS "resumo_peso_ad" AFTER DELETE ON "Personagem_Equipamentos" BEGIN '
+        f'UPDATE "Resumo_Peso" SET "Peso_Total" = "Peso_Total" - {_peso("old")}, "Itens" = "Itens" - 1 '
+        'WHERE "Personagem_id" = old."Personagem_id"; END'
+    )
+    yield (
+        'CREATE TRIGGER IF NOT EXISTS "resumo_peso_equipamento_au" AFTER UPDATE OF "Peso" ON "Equipamentos" BEGIN '
+        'UPDATE "Resumo_Peso" SET "Peso_Total" = "Peso_Total" - IFNULL(old."Peso", 0) + IFNULL(new."Peso", 0) '
+        'WHERE "Personagem_id" IN (SELECT "Personagem_id" FROM "Personagem_Equipamentos" WHERE "Equipamento_id" = new."Id"); END'
+    )
+
+
+def _nomes_triggers():
+    nomes = ["resumo_personagens_ai", "resumo_personagens_ad", "resumo_personagens_au"]
+    for tabela, _ in ASSOCIACOES:
+        nomes += [f"resumo_{tabela}_ai", f"resumo_{tabela}_ad"]
+    return nomes + ["resumo_peso_ai", "resumo_peso_ad", "resumo_peso_equipamento_au"]
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    op.execute(
+        'CREATE TABLE IF NOT EXISTS "Resumo_Personagens" ('
+        '"Dimensao" VARCHAR(20) NOT NULL, "Valor" VARCHAR NOT NULL, '
+        '"Quantidade" INTEGER NOT NULL DEFAULT 0, "Soma_Level" INTEGER NOT NULL DEFAULT 0, '
+        '"Soma_Forca" INTEGER NOT NULL DEFAULT 0, "Soma_Mana" INTEGER NOT NULL DEFAULT 0, '
+        'PRIMARY KEY ("Dimensao", "Valor"))'
+    )
+    op.execute(
+        'CREATE TABLE IF NOT EXISTS "Resumo_Associacoes" ('
+        '"Tabela" VARCHAR(50) NOT NULL, "Item_id" INTEGER NOT NULL, '
+        '"Quantidade" INTEGER NOT NULL DEFAULT 0, PRIMARY KEY ("Tabela", "Item_id"))'
+    )
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS "ix_Resumo_Associacoes_Tabela_Quantidade" '
+        'ON "Resumo_Associacoes" ("Tabela", "Quantidade")'
+    )
+    op.execute(
+        'CREATE TABLE IF NOT EXISTS "Resumo_Peso" ('
+        '"Personagem_id" INTEGER NOT NULL PRIMARY KEY, '
+        '"Peso_Total" INTEGER NOT NULL DEFAULT 0, "Itens" INTEGER NOT NULL DEFAULT 0)'
+    )
+
+    # Carga inicial a partir dos dados existentes
+    op.execute('DELETE FROM "Resumo_Personagens"')
+    for dimensao, coluna in DIMENSOES:
+        op.execute(
+            'INSERT INTO "Resumo_Personagens" ("Dimensao", "Valor", "Quantidade", "Soma_Level", "Soma_Forca", "Soma_Mana") '
+            f"SELECT '{dimensao}', IFNULL(\"{coluna}\", ''), COUNT(*), "
+            'SUM(IFNULL("Level", 0)), SUM(IFNULL("Forca", 0)), SUM(IFNULL("Mana", 0)) '
+            f'FROM "Personagens" GROUP BY IFNULL("{coluna}", \'\')'
+        )
+    op.execute('DELETE FROM "Resumo_Associacoes"')
+    for tabela, coluna in ASSOCIACOES:
+        op.execute(
+            'INSERT INTO "Resumo_Associacoes" ("Tabela", "Item_id", "Quantidade") '
+            f"SELECT '{tabela}', \"{coluna}\", COUNT(*) FROM \"{tabela}\" GROUP BY \"{coluna}\""
+        )
+    op.execute('DELETE FROM "Resumo_Peso"')
+    op.execute(
+        'INSERT INTO "Resumo_Peso" ("Personagem_id", "Peso_Total", "Itens") '
+        'SELECT pe."Personagem_id", SUM(IFNULL(e."Peso", 0)), COUNT(*) '
+        'FROM "Personagem_Equipamentos" pe LEFT JOIN "Equipamentos" e ON e."Id" = pe."Equipamento_id" '
+        'GROUP BY pe."Personagem_id"'
+    )
+
+    for ddl in _triggers():
+        op.execute(ddl)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for nome in _nomes_triggers():
+        op.execute(f'DROP TRIGGER IF EXISTS "{nome}"')
+    for tabela in ("Resumo_Peso", "Resumo_Associacoes", "Resumo_Personagens"):
+        op.execute(f'DROP TABLE IF EXISTS "{tabela}"')
@@ -0,0 +1,35 @@
+"""coluna Versao para controle otimista de concorrência
+
+Cada tabela de entidade ganha Versao (começa em 1 e sobe a cada UPDATE),
+usada como version_id_col pelo ORM e pelo If-Match de PUT/PATCH.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+TABELAS = ["Racas", "Magias", "Habilidades", "Classe", "Personagens", "Atributos", "Equipamentos"]
+
+
+def upgrade():
+    # ADD COLUMN com DEFAULT constante: no SQLite não recria a tabela e as
+    # linhas existentes já ficam com Versao = 1
+    for tabela in TABELAS:
+        op.add_column(tabela, sa.Column("Versao", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade():
+    # SQLite 3.35+ remove a coluna no lugar; recriar a tabela (batch) quebraria
+    # os triggers de busca, versão e resumos que referenciam essas tabelas
+    for tabela in reversed(TABELAS):
+        if op.get_bind().dialect.name == "sqlite":
+            op.execute(f'ALTER TABLE "{tabela}" DROP COLUMN "Versao"')
+        else:
+            op.drop_column(tabela, "Versao")
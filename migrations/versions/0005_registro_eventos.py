@@ -0,0 +1,84 @@
+"""registro de eventos para o feed de alterações (/events)
+
+Triggers gravam em Eventos cada INSERT/UPDATE/DELETE das tabelas de
+entidades e das associações do personagem, na mesma transação da escrita
+(ORM, UPDATE ... RETURNING, lotes e escritas de outros workers). Seq é
+AUTOINCREMENT: nunca reaproveitado, serve para retomar o feed. Só SQLite;
+nos outros bancos o feed usa as tabelas alteradas em cada commit
+(app.alteracoes), sem Ids.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+ENTIDADES = ["Racas", "Magias", "Habilidades", "Classe", "Personagens", "Atributos", "Equipamentos"]
+
+# (tabela, coluna do item); a linha do evento é o Personagem_id
+ASSOCIACOES = (
+    ("Personagem_Magias", "Magia_id"),
+    ("Personagem_Habilidades", "Habilidade_id"),
+    ("Personagem_Equipamentos", "Equipamento_id"),
+)
+
+# A cada 1000 eventos, apaga os que passaram da retenção
+RETENCAO = 100_000
+
+
+def _inserir(tabela: str, operacao: str, linha: str, item: str = "NULL") -> str:
+    return (
+        'INSERT INTO "Eventos" ("Tabela", "Linha", "Item", "Operacao") '
+        f"VALUES ('{tabela}', {linha}, {item}, '{operacao}');"
+    )
+
+
+def _triggers():
+    for tabela in ENTIDADES:
+        for operacao, alias in (("insert", "new"), ("update", "new"), ("delete", "old")):
+            yield (
+                f'CREATE TRIGGER IF NOT EXISTS "{tabela}_evento_{operacao}" AFTER {operacao.upper()} ON "{tabela}" BEGIN '
+                + _inserir(tabela, operacao, f'{alias}."Id"') + " END"
+            )
+    for tabela, coluna in ASSOCIACOES:
+        for operacao, alias in (("insert", "new"), ("delete", "old")):
+            yield (
+                f'CREATE TRIGGER IF NOT EXISTS "{tabela}_evento_{operacao}" AFTER {operacao.upper()} ON "{tabela}" BEGIN '
+                + _inserir(tabela, operacao, f'{alias}."Personagem_id"', f'{alias}."{coluna}"') + " END"
+            )
+    yield (
+        'CREATE TRIGGER IF NOT EXISTS "eventos_retencao" AFTER INSERT ON "Eventos" '
+        f'WHEN new."Seq" % 1000 = 0 BEGIN DELETE FROM "Eventos" WHERE "Seq" <= new."Seq" - {RETENCAO}; END'
+    )
+
+
+def _nomes_triggers():
+    nomes = [f"{tabela}_evento_{operacao}" for tabela in ENTIDADES for operacao in ("insert", "update", "delete")]
+    nomes += [f"{tabela}_evento_{operacao}" for tabela, _ in ASSOCIACOES for operacao in ("insert", "delete")]
+    return nomes + ["eventos_retencao"]
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    op.execute(
+        'CREATE TABLE IF NOT EXISTS "Eventos" ('
+        '"Seq" INTEGER PRIMARY KEY AUTOINCREMENT, "Tabela" VARCHAR(50) NOT NULL, '
+        '"Linha" INTEGER, "Item" INTEGER, "Operacao" VARCHAR(10) NOT NULL)'
+    )
+    for ddl in _triggers():
+        op.execute(ddl)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for nome in _nomes_triggers():
+        op.execute(f'DROP TRIGGER IF EXISTS "{nome}"')
+    op.execute('DROP TABLE IF EXISTS "Eventos"')
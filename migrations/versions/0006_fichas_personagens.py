@@ -0,0 +1,134 @@
+"""fichas dos personagens (projeção desnormalizada de /personagens/{id}/sheet)
+
+Fichas guarda, por personagem, o JSON completo da ficha (personagem, raça,
+classe com habilidade/magia, equipamento, atributos e as três coleções).
+Triggers invalidam a ficha (Dados = NULL, Geracao + 1) na mesma transação
+de qualquer escrita que a afete: o próprio personagem, seus atributos e
+associações, ou um item de catálogo que ele referencia. A ficha é
+remontada na próxima leitura ou por `python -m app.cli fichas reconstruir`.
+Geracao evita gravar uma ficha montada antes de uma escrita concorrente.
+Só SQLite; nos outros bancos a ficha é montada a cada leitura.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+# (tabela, coluna do item) das associações
+ASSOCIACOES = (
+    ("Personagem_Magias", "Magia_id"),
+    ("Personagem_Habilidades", "Habilidade_id"),
+    ("Personagem_Equipamentos", "Equipamento_id"),
+)
+
+
+def _invalidar(personagens: str) -> str:
+    """UPDATE que invalida as fichas dos personagens da expressão (um Id ou um SELECT)"""
+    condicao = f"IN ({personagens})" if personagens.startswith("SELECT") else f"= {personagens}"
+    return (
+        'UPDATE "Fichas" SET "Geracao" = "Geracao" + 1, "Dados" = NULL '
+        f'WHERE "Personagem_id" {condicao};'
+    )
+
+
+def _afetados(tabela: str, alias: str) -> str:
+    """Personagens cuja ficha mostra a linha alias.Id da tabela de catálogo"""
+    chave = f'{alias}."Id"'
+    if tabela == "Racas":
+        return f'SELECT "Id" FROM "Personagens" WHERE "Raca_id" = {chave}'
+    if tabela == "Classe":
+        return f'SELECT "Id" FROM "Personagens" WHERE "Classe_id" = {chave}'
+    if tabela == "Equipamentos":
+        return (
+            f'SELECT "Id" FROM "Personagens" WHERE "Equipamento_id" = {chave} '
+            f'UNION SELECT "Personagem_id" FROM "Personagem_Equipamentos" WHERE "Equipamento_id" = {chave}'
+        )
+    associacao, coluna, coluna_classe = {
+        "Magias": ("Personagem_Magias", "Magia_id", "Magias_id"),
+        "Habilidades": ("Personagem_Habilidades", "Habilidade_id", "Habilidades_id"),
+    }[tabela]
+    return (
+        f'SELECT "Personagem_id" FROM "{associacao}" WHERE "{coluna}" = {chave} '
+        f'UNION SELECT "Id" FROM "Personagens" WHERE "Classe_id" IN '
+        f'(SELECT "Id" FROM "Classe" WHERE "{coluna_classe}" = {chave})'
+    )
+
+
+CATALOGOS = ("Racas", "Classe", "Equipamentos", "Magias", "Habilidades")
+
+
+def _triggers():
+    yield (
+        'CREATE TRIGGER IF NOT EXISTS "fichas_personagens_ai" AFTER INSERT ON "Personagens" BEGIN '
+        'INSERT OR IGNORE INTO "Fichas" ("Personagem_id") VALUES (new."Id"); END'
+    )
+    yield (
+        'CREATE TRIGGER IF NOT EXISTS "fichas_personagens_au" AFTER UPDATE ON "Personagens" BEGIN '
+        + _invalidar('new."Id"') + " END"
+    )
+    yield (
+        'CREATE TRIGGER IF NOT EXISTS "fichas_personagens_ad" AFTER DELETE ON "Personagens" BEGIN '
+        'DELETE FROM "Fichas" WHERE "Personagem_id" = old."Id"; END'
+    )
+    yield (
+        'CREATE TRIGGER IF NOT EXISTS "fichas_atributos_ai" AFTER INSERT ON "Atributos" BEGIN '
+        + _invalidar('new."Personagem_id"') + " END"
+    )
+    yield (
+        'CREATE TRIGGER IF NOT EXISTS "fichas_atributos_au" AFTER UPDATE ON "Atributos" BEGIN '
+        + _invalidar('new."Personagem_id"') + " "
+        + _invalidar('SELECT old."Personagem_id" WHERE old."Personagem_id" IS NOT new."Personagem_id"') + " END"
+    )
+    yield (
+        'CREATE TRIGGER IF NOT EXISTS "fichas_atributos_ad" AFTER DELETE ON "Atributos" BEGIN '
+        + _invalidar('old."Personagem_id"') + " END"
+    )
+    for tabela, _ in ASSOCIACOES:
+        for operacao, alias in (("ai", "new"), ("ad", "old")):
+            evento = "INSERT" if operacao == "ai" else "DELETE"
+            yield (
+                f'CREATE TRIGGER IF NOT EXISTS "fichas_{tabela}_{operacao}" AFTER {evento} ON "{tabela}" BEGIN '
+                + _invalidar(f'{alias}."Personagem_id"') + " END"
+            )
+    for tabela in CATALOGOS:
+        for operacao, alias in (("au", "new"), ("ad", "old")):
+            evento = "UPDATE" if operacao == "au" else "DELETE"
+            yield (
+                f'CREATE TRIGGER IF NOT EXISTS "fichas_{tabela}_{operacao}" AFTER {evento} ON "{tabela}" BEGIN '
+                + _invalidar(_afetados(tabela, alias)) + " END"
+            )
+
+
+def _nomes_triggers():
+    nomes = [f"fichas_personagens_{operacao}" for operacao in ("ai", "au", "ad")]
+    nomes += [f"fichas_atributos_{operacao}" for operacao in ("ai", "au", "ad")]
+    nomes += [f"fichas_{tabela}_{operacao}" for tabela, _ in ASSOCIACOES for operacao in ("ai", "ad")]
+    return nomes + [f"fichas_{tabela}_{operacao}" for tabela in CATALOGOS for operacao in ("au", "ad")]
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    op.execute(
+        'CREATE TABLE IF NOT EXISTS "Fichas" ('
+        '"Personagem_id" INTEGER PRIMARY KEY, "Geracao" INTEGER NOT NULL DEFAULT 0, "Dados" TEXT)'
+    )
+    for ddl in _triggers():
+        op.execute(ddl)
+    # Personagens existentes entram pendentes (Dados NULL): montados na primeira leitura
+    op.execute('INSERT OR IGNORE INTO "Fichas" ("Personagem_id") SELECT "Id" FROM "Personagens"')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for nome in _nomes_triggers():
+        op.execute(f'DROP TRIGGER IF EXISTS "{nome}"')
+    op.execute('DROP TABLE IF EXISTS "Fichas"')
@@ -0,0 +1,43 @@
+"""geração inicial aleatória das fichas (chave do memo de /personagens/derived)
+
+A Geracao de Fichas passa a identificar uma versão do personagem e serve de
+chave para os status derivados memoizados (app.combate). Sem AUTOINCREMENT,
+o SQLite reaproveita o Id de um personagem apagado por último; começando
+em 0, o novo personagem repetiria a geração do antigo e leria o resultado
+dele. O trigger de INSERT passa a começar de um número aleatório de 48
+bits (os incrementos seguintes continuam +1). Só SQLite.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+# 2**48 - 1: cabe com folga em INTEGER mesmo depois de muitos incrementos
+MASCARA = 281474976710655
+
+
+def _trigger_insert(geracao: str) -> str:
+    return (
+        'CREATE TRIGGER "fichas_personagens_ai" AFTER INSERT ON "Personagens" BEGIN '
+        f'INSERT OR IGNORE INTO "Fichas" ("Personagem_id", "Geracao") VALUES (new."Id", {geracao}); END'
+    )
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute('DROP TRIGGER IF EXISTS "fichas_personagens_ai"')
+    op.execute(_trigger_insert(f"random() & {MASCARA}"))
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute('DROP TRIGGER IF EXISTS "fichas_personagens_ai"')
+    op.execute(_trigger_insert("0"))
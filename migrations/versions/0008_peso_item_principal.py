@@ -0,0 +1,119 @@
+"""item principal no Resumo_Peso
+
+Resumo_Peso (0003) somava só a coleção Personagem_Equipamentos, enquanto a
+carga de /personagens/derived (app.combate) conta também o item principal
+(Personagens.Equipamento_id), sem repetir o item que está nas duas. Os
+triggers passam a recalcular a linha do personagem afetado a partir da
+mesma união: o item principal pode entrar, sair ou já estar na coleção, e
+uma soma incremental teria de tratar cada caso. O custo fica proporcional
+aos itens de um personagem, não ao total de personagens. Só SQLite.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+TRIGGERS_0003 = ("resumo_peso_ai", "resumo_peso_ad", "resumo_peso_equipamento_au")
+TRIGGERS = TRIGGERS_0003 + ("resumo_peso_personagens_ai", "resumo_peso_personagens_au")
+
+
+def _recalcular(personagens: str):
+    """DELETE + INSERT que refazem as linhas de Resumo_Peso dos personagens do subselect `personagens`"""
+    return (
+        f'DELETE FROM "Resumo_Peso" WHERE "Personagem_id" IN ({personagens})',
+        'INSERT INTO "Resumo_Peso" ("Personagem_id", "Peso_Total", "Itens") '
+        'SELECT itens."Personagem_id", SUM(IFNULL(e."Peso", 0)), COUNT(*) FROM ('
+        f'SELECT "Personagem_id", "Equipamento_id" FROM "Personagem_Equipamentos" WHERE "Personagem_id" IN ({personagens}) '
+        # UNION (sem ALL) não conta duas vezes o item principal que também está na coleção
+        f'UNION SELECT "Id", "Equipamento_id" FROM "Personagens" WHERE "Id" IN ({personagens}) AND "Equipamento_id" IS NOT NULL'
+        ') itens LEFT JOIN "Equipamentos" e ON e."Id" = itens."Equipamento_id" '
+        'GROUP BY itens."Personagem_id"',
+    )
+
+
+def _corpo(personagens: str) -> str:
+    return "; ".join(_recalcular(personagens)) + "; END"
+
+
+def _triggers():
+    yield (
+        'CREATE TRIGGER "resumo_peso_ai" AFTER INSERT ON "Personagem_Equipamentos" BEGIN '
+        + _corpo('new."Personagem_id"')
+    )
+    yield (
+        'CREATE TRIGGER "resumo_peso_ad" AFTER DELETE ON "Personagem_Equipamentos" BEGIN '
+        + _corpo('old."Personagem_id"')
+    )
+    yield (
+        'CREATE TRIGGER "resumo_peso_personagens_ai" AFTER INSERT ON "Personagens" '
+        'WHEN new."Equipamento_id" IS NOT NULL BEGIN '
+        + _corpo('new."Id"')
+    )
+    yield (
+        'CREATE TRIGGER "resumo_peso_personagens_au" AFTER UPDATE OF "Equipamento_id" ON "Personagens" '
+        'WHEN old."Equipamento_id" IS NOT new."Equipamento_id" BEGIN '
+        + _corpo('new."Id"')
+    )
+    yield (
+        'CREATE TRIGGER "resumo_peso_equipamento_au" AFTER UPDATE OF "Peso" ON "Equipamentos" BEGIN '
+        + _corpo(
+            'SELECT "Personagem_id" FROM "Personagem_Equipamentos" WHERE "Equipamento_id" = new."Id" '
+            'UNION SELECT "Id" FROM "Personagens" WHERE "Equipamento_id" = new."Id"'
+        )
+    )
+
+
+def _triggers_0003():
+    """Versão incremental da 0003 (só a coleção), para o downgrade"""
+    peso = 'IFNULL((SELECT "Peso" FROM "Equipamentos" WHERE "Id" = {alias}."Equipamento_id"), 0)'
+    yield (
+        'CREATE TRIGGER "resumo_peso_ai" AFTER INSERT ON "Personagem_Equipamentos" BEGIN '
+        'INSERT INTO "Resumo_Peso" ("Personagem_id", "Peso_Total", "Itens") '
+        f'VALUES (new."Personagem_id", {peso.format(alias="new")}, 1) '
+        'ON CONFLICT ("Personagem_id") DO UPDATE SET '
+        '"Peso_Total" = "Peso_Total" + excluded."Peso_Total", "Itens" = "Itens" + 1; END'
+    )
+    yield (
+        'CREATE TRIGGER "resumo_peso_ad" AFTER DELETE ON "Personagem_Equipamentos" BEGIN '
+        f'UPDATE "Resumo_Peso" SET "Peso_Total" = "Peso_Total" - {peso.format(alias="old")}, "Itens" = "Itens" - 1 '
+        'WHERE "Personagem_id" = old."Personagem_id"; END'
+    )
+    yield (
+        'CREATE TRIGGER "resumo_peso_equipamento_au" AFTER UPDATE OF "Peso" ON "Equipamentos" BEGIN '
+        'UPDATE "Resumo_Peso" SET "Peso_Total" = "Peso_Total" - IFNULL(old."Peso", 0) + IFNULL(new."Peso", 0) '
+        'WHERE "Personagem_id" IN (SELECT "Personagem_id" FROM "Personagem_Equipamentos" WHERE "Equipamento_id" = new."Id"); END'
+    )
+
+
+def _trocar_triggers(novos):
+    for nome in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS "{nome}"')
+    for ddl in novos:
+        op.execute(ddl)
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    _trocar_triggers(_triggers())
+    for sql in _recalcular('SELECT "Id" FROM "Personagens"'):
+        op.execute(sql)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    _trocar_triggers(_triggers_0003())
+    op.execute('DELETE FROM "Resumo_Peso"')
+    op.execute(
+        'INSERT INTO "Resumo_Peso" ("Personagem_id", "Peso_Total", "Itens") '
+        'SELECT pe."Personagem_id", SUM(IFNULL(e."Peso", 0)), COUNT(*) '
+        'FROM "Personagem_Equipamentos" pe LEFT JOIN "Equipamentos" e ON e."Id" = pe."Equipamento_id" '
+        'GROUP BY pe."Personagem_id"'
+    )
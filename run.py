@@ -1,13 +1,75 @@
 """
-Script para iniciar o servidor de desenvolvimento
+Script para iniciar o servidor
+
+    python run.py                          # desenvolvimento: um processo com reload
+    python run.py --producao               # vários workers (padrão: núcleos da CPU)
+    python run.py --producao --workers 4 --porta 8080
 """
+import argparse
+import importlib.util
+import os
 import uvicorn
+from app.config import settings
 
-if __name__ == "__main__":
+
+def _disponivel(modulo: str) -> bool:
+    return importlib.util.find_spec(modulo) is not None
+
+
+def desenvolvimento(args):
     uvicorn.run(
         "app.main:app",
-        host="127.0.0.1",
-        port=8000,
+        host=args.host,
+        port=args.porta,
         reload=True,
         log_level="info"
     )
+
+
+def producao(args):
+    # Pré-fork: migrações e seed uma única vez, no processo principal. Os
+    # workers herdam RPG_INICIALIZAR_BANCO=false e só leem o que foi criado.
+    if settings.inicializar_banco:
+        from app.inicializacao import inicializar
+        from app.database import engine
+
+        inicializar(seed=True)
+        engine.dispose()
+    os.environ["RPG_INICIALIZAR_BANCO"] = "false"
+
+    workers = args.workers or settings.servidor_workers or os.cpu_count() or 1
+    loop = "uvloop" if _disponivel("uvloop") else "asyncio"
+    http = "httptools" if _disponivel("httptools") else "h11"
+    print(f"🚀 Produção: {workers} workers, loop={loop}, http={http}, {args.host}:{args.porta}")
+
+    # SIGTERM/SIGINT: o supervisor repassa o sinal aos workers, que param de
+    # aceitar conexões e esperam as requisições em andamento terminarem
+    # (até servidor_timeout_desligamento segundos) antes de sair.
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.porta,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=settings.servidor_backlog,
+        timeout_keep_alive=settings.servidor_keep_alive,
+        timeout_graceful_shutdown=settings.servidor_timeout_desligamento,
+        proxy_headers=True,
+        access_log=settings.servidor_access_log,
+        log_level="info",
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inicia a RPG API")
+    parser.add_argument("--producao", action="store_true", help="Vários workers, sem reload")
+    parser.add_argument("--workers", type=int, default=0, help="Quantidade de workers (padrão: RPG_SERVIDOR_WORKERS ou núcleos da CPU)")
+    parser.add_argument("--host", default=settings.servidor_host)
+    parser.add_argument("--porta", type=int, default=settings.servidor_porta)
+    args = parser.parse_args()
+
+    if args.producao:
+        producao(args)
+    else:
+        desenvolvimento(args)
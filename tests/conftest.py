@@ -0,0 +1,38 @@
+"""Testes da API contra um banco SQLite temporário, migrado e com os dados iniciais.
+
+Uso (na raiz do projeto):
+    python -m pytest
+    RPG_MODO_ASYNC=true python -m pytest   # as mesmas rotas com AsyncSession
+"""
+import os
+import re
+import tempfile
+import pytest
+
+# Antes de qualquer import de app: a engine é criada a partir das configurações
+_pasta = tempfile.mkdtemp(prefix="rpg_testes_")
+os.environ["RPG_DATABASE_URL"] = f"sqlite:///{os.path.join(_pasta, 'testes.db')}"
+os.environ["RPG_INICIALIZAR_BANCO"] = "true"
+
+
+@pytest.fixture(scope="session")
+def cliente():
+    """TestClient com o lifespan rodando (migrações + seed) uma vez para a sessão toda"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as cliente:
+        yield cliente
+
+
+_CONSULTAS = re.compile(r'desc="(\d+) consultas"')
+
+
+@pytest.fixture
+def consultas(cliente):
+    """GET que devolve (resposta, consultas SQL da requisição), pelo Server-Timing de app.metricas"""
+    def get(url: str, **cabecalhos):
+        resposta = cliente.get(url, headers={**cabecalhos, "X-Server-Timing": "1"})
+        return resposta, int(_CONSULTAS.search(resposta.headers["server-timing"]).group(1))
+
+    return get
@@ -0,0 +1,43 @@
+import pytest
+
+# Descrição longa: a listagem passa de RPG_COMPRESSAO_MINIMO e sai comprimida
+TEXTO = "Uma descrição comprida o bastante para a resposta ser comprimida. " * 4
+
+
+@pytest.fixture(scope="module", autouse=True)
+def dados(cliente):
+    for recurso in ("magias", "personagens"):
+        campo = "Historia" if recurso == "personagens" else "Descricao"
+        resposta = cliente.post(f"/{recurso}/bulk", json=[{"Nome": f"Compressão {i}", campo: TEXTO} for i in range(20)])
+        assert resposta.status_code == 200
+
+
+# magias passa pelo cache de respostas (já comprimida lá); personagens, pelo middleware
+@pytest.mark.parametrize("url", ["/magias/", "/personagens/?limit=50"])
+def test_etag_diferente_por_codificacao(cliente, url):
+    identidade = cliente.get(url, headers={"Accept-Encoding": "identity"})
+    comprimida = cliente.get(url, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in identidade.headers
+    assert comprimida.headers["content-encoding"] == "gzip"
+    assert comprimida.headers["etag"] == identidade.headers["etag"][:-1] + '-gzip"'
+    assert comprimida.json() == identidade.json()
+
+
+@pytest.mark.parametrize("url", ["/magias/", "/personagens/?limit=50"])
+def test_304_aceita_as_duas_formas_e_traz_vary(cliente, url):
+    etag = cliente.get(url, headers={"Accept-Encoding": "identity"}).headers["etag"]
+    etag_gzip = cliente.get(url, headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    for tag, codificacao in ((etag, "gzip"), (etag_gzip, "gzip"), (etag_gzip, "identity"), (f"W/{etag}", "gzip")):
+        resposta = cliente.get(url, headers={"Accept-Encoding": codificacao, "If-None-Match": tag})
+        assert resposta.status_code == 304
+        assert resposta.headers["etag"] == tag
+        assert "accept-encoding" in resposta.headers["vary"].lower()
+
+
+def test_if_match_com_etag_comprimido(cliente):
+    personagem = cliente.post("/personagens/", json={"Id": 0, "Nome": "Gzip", "Historia": TEXTO * 4}).json()
+    url = f"/personagens/{personagem['Id']}"
+    etag = cliente.get(url, headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    assert etag.endswith('-gzip"')
+    assert cliente.patch(url, json={"Level": 2}, headers={"If-Match": etag}).status_code == 200
+    assert cliente.patch(url, json={"Level": 3}, headers={"If-Match": etag}).status_code == 412
@@ -0,0 +1,43 @@
+import pytest
+
+
+@pytest.mark.parametrize("recurso", ["personagens", "magias"])
+def test_detalhe_304_sem_carregar_o_registro(cliente, consultas, recurso):
+    resposta, _ = consultas(f"/{recurso}/1")
+    etag = resposta.headers["etag"]
+    resposta, total = consultas(f"/{recurso}/1", **{"If-None-Match": etag})
+    assert resposta.status_code == 304
+    # Versoes_Tabelas + SELECT Versao, nenhum SELECT das relações
+    assert total == 2
+
+
+def test_detalhe_inexistente_com_if_none_match_responde_404(cliente):
+    assert cliente.get("/personagens/999999", headers={"If-None-Match": '"1-0"'}).status_code == 404
+
+
+def test_etag_do_detalhe_muda_com_as_relacoes(cliente):
+    personagem = cliente.post("/personagens/", json={"Id": 0, "Nome": "Etag"}).json()
+    url = f"/personagens/{personagem['Id']}"
+    etag = cliente.get(url).headers["etag"]
+    cliente.put(f"{url}/magias", json=[1])
+    resposta = cliente.get(url, headers={"If-None-Match": etag})
+    assert resposta.status_code == 200
+    assert [magia["Id"] for magia in resposta.json()["magias"]] == [1]
+    assert resposta.headers["etag"] != etag
+
+
+def test_if_match_com_etag_do_detalhe_ignora_escritas_em_outras_linhas(cliente):
+    a = cliente.post("/personagens/", json={"Id": 0, "Nome": "A"}).json()
+    b = cliente.post("/personagens/", json={"Id": 0, "Nome": "B"}).json()
+    etag = cliente.get(f"/personagens/{a['Id']}").headers["etag"]
+    cliente.patch(f"/personagens/{b['Id']}", json={"Level": 2})
+    resposta = cliente.patch(f"/personagens/{a['Id']}", json={"Level": 3}, headers={"If-Match": etag})
+    assert resposta.status_code == 200
+    assert cliente.patch(f"/personagens/{a['Id']}", json={"Level": 4}, headers={"If-Match": etag}).status_code == 412
+
+
+@pytest.mark.parametrize("recurso", ["personagens", "magias"])
+def test_etag_da_escrita_vale_para_o_get_seguinte(cliente, recurso):
+    item = cliente.post(f"/{recurso}/", json={"Id": 0, "Nome": "Escrita"}).json()
+    resposta = cliente.patch(f"/{recurso}/{item['Id']}", json={"Nome": "Escrita 2"})
+    assert cliente.get(f"/{recurso}/{item['Id']}", headers={"If-None-Match": resposta.headers["etag"]}).status_code == 304
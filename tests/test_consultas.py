@@ -0,0 +1,64 @@
+"""Número fixo de consultas SQL por rota (sem N+1), o mesmo que benchmarks/consultas.py confere em escala"""
+import pytest
+from app.cache import cache_respostas
+
+QUANTIDADE = 30
+
+# Rota -> consultas por requisição (ver ESPERADO em benchmarks/consultas.py)
+ESPERADO = {
+    "GET /personagens/": 5,
+    "GET /personagens/{id}": 5,
+    "GET /personagens/{id}/magias": 3,
+    "GET /personagens/{id}/equipamentos": 3,
+    "GET /personagens/?ids=": 5,
+    "GET /personagens/bundle?ids=": 1,
+    "GET /personagens/derived?ids=": 6,
+    "GET /classes/": 2,
+    "GET /atributos/": 2,
+}
+
+
+def _criar(cliente, prefix: str, nome: str) -> list:
+    resposta = cliente.post(f"/{prefix}/bulk", json=[{"Nome": f"{nome} {i}"} for i in range(QUANTIDADE)])
+    assert resposta.status_code == 200, resposta.text
+    return [item["Id"] for item in resposta.json()["itens"]]
+
+
+@pytest.fixture(scope="module")
+def cenarios(cliente):
+    """Rota -> URLs da mesma rota com tamanhos diferentes (1 item e dezenas)"""
+    from app.fichas import reconstruir_fichas
+    from app.main import FichaSchema
+
+    personagens = _criar(cliente, "personagens", "Consultas")
+    vazio = cliente.post("/personagens/", json={"Id": 0, "Nome": "Sem itens"}).json()["Id"]
+    cheio = cliente.post("/personagens/", json={"Id": 0, "Nome": "Cheio de itens"}).json()["Id"]
+    for colecao in ("magias", "habilidades", "equipamentos"):
+        cliente.put(f"/personagens/{cheio}/{colecao}", json=_criar(cliente, colecao, colecao))
+    # Monta as fichas invalidadas acima antes de medir
+    reconstruir_fichas(FichaSchema, log=lambda *_: None)
+
+    um, todos = str(personagens[0]), ",".join(map(str, personagens))
+    return {
+        "GET /personagens/": ["/personagens/?limit=1", f"/personagens/?limit={QUANTIDADE}"],
+        "GET /personagens/{id}": [f"/personagens/{vazio}", f"/personagens/{cheio}"],
+        "GET /personagens/{id}/magias": [f"/personagens/{vazio}/magias", f"/personagens/{cheio}/magias"],
+        "GET /personagens/{id}/equipamentos": [f"/personagens/{vazio}/equipamentos", f"/personagens/{cheio}/equipamentos"],
+        "GET /personagens/?ids=": [f"/personagens/?ids={um}", f"/personagens/?ids={todos}"],
+        "GET /personagens/bundle?ids=": [f"/personagens/bundle?ids={um}", f"/personagens/bundle?ids={todos}"],
+        "GET /personagens/derived?ids=": [f"/personagens/derived?ids={um}", f"/personagens/derived?ids={todos}"],
+        "GET /classes/": ["/classes/?limit=1", "/classes/"],
+        "GET /atributos/": ["/atributos/?limit=1", "/atributos/?limit=200"],
+    }
+
+
+@pytest.mark.parametrize("rota", ESPERADO)
+def test_consultas_nao_crescem_com_o_tamanho(cenarios, consultas, rota):
+    contagens = []
+    for url in cenarios[rota]:
+        # Mede o caminho sem cache (o HIT não consulta o banco)
+        cache_respostas.limpar()
+        resposta, total = consultas(url)
+        assert resposta.status_code == 200, resposta.text
+        contagens.append(total)
+    assert contagens == [ESPERADO[rota]] * len(contagens)
@@ -0,0 +1,43 @@
+from app.database import SessionLocal
+from app.estatisticas import stmt_peso
+
+
+def _equipamento(cliente, nome: str, peso: int) -> int:
+    resposta = cliente.post("/equipamentos/", json={"Id": 0, "Nome": nome, "Peso": peso})
+    assert resposta.status_code == 200, resposta.text
+    return resposta.json()["Id"]
+
+
+def _pesos(cliente, personagem_id: int) -> tuple:
+    """(peso do resumo, peso do GROUP BY, carga de /derived) do mesmo personagem"""
+    (resumo,) = cliente.get(f"/stats/personagens/peso?limit=1&after={personagem_id - 1}").json()
+    assert resumo["Id"] == personagem_id
+    with SessionLocal() as db:
+        linha = db.execute(stmt_peso(1, personagem_id - 1, resumos=False)).first()
+    (derivado,) = cliente.get(f"/personagens/derived?ids={personagem_id}").json()
+    assert resumo["itens"] == linha.itens
+    return resumo["peso_total"], linha.peso_total, derivado["carga"]
+
+
+def test_peso_das_estatisticas_inclui_o_item_principal(cliente):
+    espada = _equipamento(cliente, "Espada", 3)
+    escudo = _equipamento(cliente, "Escudo", 5)
+    arco = _equipamento(cliente, "Arco", 7)
+    personagem = cliente.post("/personagens/", json={"Id": 0, "Nome": "Carregador"}).json()["Id"]
+    assert _pesos(cliente, personagem) == (0, 0, 0)
+
+    cliente.patch(f"/personagens/{personagem}", json={"Equipamento_id": espada})
+    assert _pesos(cliente, personagem) == (3, 3, 3)
+
+    # O item principal também na coleção conta uma vez só
+    cliente.put(f"/personagens/{personagem}/equipamentos", json=[espada, escudo])
+    assert _pesos(cliente, personagem) == (8, 8, 8)
+
+    cliente.patch(f"/personagens/{personagem}", json={"Equipamento_id": arco})
+    assert _pesos(cliente, personagem) == (15, 15, 15)
+
+    cliente.patch(f"/equipamentos/{arco}", json={"Peso": 10})
+    assert _pesos(cliente, personagem) == (18, 18, 18)
+
+    cliente.patch(f"/personagens/{personagem}", json={"Equipamento_id": None})
+    assert _pesos(cliente, personagem) == (8, 8, 8)
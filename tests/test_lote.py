@@ -0,0 +1,30 @@
+def _criar(cliente, *nomes) -> list:
+    resposta = cliente.post("/magias/bulk", json=[{"Nome": nome} for nome in nomes])
+    assert resposta.status_code == 200, resposta.text
+    return [item["Id"] for item in resposta.json()["itens"]]
+
+
+def test_patch_lote_com_id_repetido_responde_400(cliente):
+    a, b = _criar(cliente, "A", "B")
+    resposta = cliente.patch("/magias/bulk", json=[{"Id": a, "Nivel": 1}, {"Id": b, "Nivel": 1}, {"Id": a, "Nivel": 2}])
+    assert resposta.status_code == 400
+    assert str(a) in resposta.json()["detail"]
+    assert cliente.get(f"/magias/{a}").json()["Nivel"] is None
+
+
+def test_patch_lote_null_em_coluna_not_null_falha_so_o_item(cliente):
+    a, b = _criar(cliente, "A", "B")
+    resposta = cliente.patch("/magias/bulk", json=[{"Id": a, "Nome": None}, {"Id": b, "Nome": "B2"}])
+    assert resposta.status_code == 200
+    corpo = resposta.json()
+    assert [item["Nome"] for item in corpo["itens"]] == ["B2"]
+    assert [(erro["indice"], erro["Id"]) for erro in corpo["erros"]] == [(0, a)]
+    assert cliente.get(f"/magias/{a}").json()["Nome"] == "A"
+
+
+def test_delete_lote_com_id_repetido_conta_uma_vez(cliente):
+    (a,) = _criar(cliente, "A")
+    resposta = cliente.request("DELETE", "/magias/bulk", json=[a, a, 999999, 999999])
+    assert resposta.status_code == 200
+    assert resposta.json()["deletados"] == [a]
+    assert [(erro["indice"], erro["Id"]) for erro in resposta.json()["erros"]] == [(2, 999999)]
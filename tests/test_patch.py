@@ -0,0 +1,66 @@
+import pytest
+
+# Recurso -> corpo de criação mínimo (cada teste cria a própria linha).
+# Atributos não têm Personagem_id no schema: usam o atributo 1 do seed.
+RECURSOS = {
+    "personagens": {"Id": 0, "Nome": "Teste"},
+    "magias": {"Id": 0, "Nome": "Teste"},
+    "habilidades": {"Id": 0, "Nome": "Teste"},
+    "racas": {"Id": 0, "Nome": "Teste"},
+    "classes": {"Id": 0, "Nome": "Teste"},
+    "atributos": None,
+    "equipamentos": {"Id": 0, "Nome": "Teste"},
+}
+
+# Uma coluna que aceita null em cada recurso
+OPCIONAL = {"personagens": "Historia", "racas": "Passiva"}
+
+
+def _item(cliente, recurso: str) -> dict:
+    if RECURSOS[recurso] is None:
+        return cliente.get(f"/{recurso}/1").json()
+    resposta = cliente.post(f"/{recurso}/", json=RECURSOS[recurso])
+    assert resposta.status_code == 200, resposta.text
+    return resposta.json()
+
+
+@pytest.mark.parametrize("recurso", RECURSOS)
+def test_patch_null_em_coluna_not_null_responde_422(cliente, recurso):
+    item = _item(cliente, recurso)
+    resposta = cliente.patch(f"/{recurso}/{item['Id']}", json={"Nome": None})
+    assert resposta.status_code == 422
+    assert resposta.json()["detail"][0]["loc"] == ["body", "Nome"]
+    assert cliente.get(f"/{recurso}/{item['Id']}").json()["Nome"] == item["Nome"]
+
+
+@pytest.mark.parametrize("recurso", RECURSOS)
+def test_patch_null_em_coluna_opcional_grava_null(cliente, recurso):
+    item = _item(cliente, recurso)
+    coluna = OPCIONAL.get(recurso, "Descricao")
+    resposta = cliente.patch(f"/{recurso}/{item['Id']}", json={coluna: None})
+    assert resposta.status_code == 200, resposta.text
+    assert resposta.json()[coluna] is None
+    assert resposta.json()["Nome"] == item["Nome"]
+
+
+def test_patch_null_em_campo_obrigatorio_do_schema_responde_422(cliente):
+    # Atributos.Quantidade aceita NULL no banco, mas o schema exige um inteiro
+    resposta = cliente.patch("/atributos/1", json={"Quantidade": None})
+    assert resposta.status_code == 422
+
+
+def test_patch_vazio_nao_grava(cliente):
+    item = _item(cliente, "magias")
+    etag = cliente.get(f"/magias/{item['Id']}").headers["etag"]
+    resposta = cliente.patch(f"/magias/{item['Id']}", json={})
+    assert resposta.status_code == 200
+    assert resposta.json()["Versao"] == item["Versao"]
+    assert resposta.headers["etag"] == etag
+    assert cliente.get(f"/magias/{item['Id']}", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_patch_vazio_confere_if_match_e_existencia(cliente):
+    item = _item(cliente, "magias")
+    assert cliente.patch(f"/magias/{item['Id']}", json={}, headers={"If-Match": f'"{item["Versao"]}"'}).status_code == 200
+    assert cliente.patch(f"/magias/{item['Id']}", json={}, headers={"If-Match": f'"{item["Versao"] + 1}"'}).status_code == 412
+    assert cliente.patch("/magias/999999", json={}).status_code == 404
@@ -0,0 +1,40 @@
+from app.transferencia import Importador
+
+
+def _importar(cliente, recurso: str, linhas: str, **parametros) -> dict:
+    resposta = cliente.post(
+        f"/import/{recurso}", params=parametros, content=linhas.encode(), headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert resposta.status_code == 200, resposta.text
+    return resposta.json()
+
+
+def test_modo_novos_rejeita_fk_sem_mapa_entre_requisicoes(cliente):
+    # A raça foi importada numa requisição anterior: o Id 1 do arquivo não é o Id 1 do banco
+    _importar(cliente, "racas", '{"Id": 1, "Nome": "Anã"}\n', modo="novos")
+    resumo = _importar(cliente, "personagens", '{"Id": 1, "Nome": "Gimli", "Raca_id": 1}\n', modo="novos")
+    assert resumo["gravadas"] == 0
+    assert "Raca_id=1" in resumo["erros"][0]["detail"]
+
+
+def test_modo_novos_aceita_referencias_existentes_explicitas(cliente):
+    resumo = _importar(
+        cliente, "personagens", '{"Id": 1, "Nome": "Gimli", "Raca_id": 1}\n{"Id": 2, "Nome": "X", "Raca_id": 999999}\n',
+        modo="novos", referencias_existentes="racas",
+    )
+    assert resumo["gravadas"] == 1
+    assert [erro["linha"] for erro in resumo["erros"]] == [2]
+
+
+def test_modo_novos_recurso_desconhecido_em_referencias_existentes_responde_400(cliente):
+    resposta = cliente.post("/import/personagens", params={"modo": "novos", "referencias_existentes": "dragoes"}, content=b"")
+    assert resposta.status_code == 400
+
+
+def test_modo_novos_traduz_fk_importada_na_mesma_execucao(cliente):
+    importador = Importador(modo="novos")
+    importador.importar("racas", [{"Id": 1, "Nome": "Anã"}])
+    resumo = importador.importar("personagens", [{"Id": 1, "Nome": "Gimli", "Raca_id": 1}])
+    assert resumo["gravadas"] == 1
+    personagem = cliente.get(f"/personagens/{importador.mapas['Personagens'][1]}").json()
+    assert personagem["raca"]["Id"] == importador.mapas["Racas"][1]